@@ -0,0 +1,4 @@
+import sys
+from benchmarks.run import main
+
+sys.exit(main())
\ No newline at end of file
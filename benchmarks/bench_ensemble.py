@@ -0,0 +1,49 @@
+import os
+from models.runner import run_ensemble
+from models.ensemble import EnsembleSimulator
+from benchmarks.timing import best_time, result
+
+
+def bench_runner_scaling(n_runs, max_steps, repeat):
+    """
+    Réplicas por segundo de run_ensemble según el número de procesos
+    
+    Se prueba 1, 2, 4, ... hasta os.cpu_count(); el speedup se reporta
+    respecto a un solo proceso.
+    """
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cpus:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cpus:
+        workers.append(cpus)
+    
+    results = []
+    baseline = None
+    for n in workers:
+        elapsed = best_time(lambda: run_ensemble(40, 40, n_runs, max_steps, seed=0, workers=n), repeat)
+        baseline = baseline or elapsed
+        results.append(result('ensemble_runs', n_runs / elapsed, 'runs/s', workers=n))
+        results.append(result('ensemble_speedup', baseline / elapsed, 'x', workers=n))
+    return results
+
+
+def bench_vectorized_ensemble(n_walkers, n_steps, repeat):
+    """Pasos válidos por segundo (sumando caminantes) de EnsembleSimulator"""
+    def run():
+        ensemble = EnsembleSimulator(40, 40, n_walkers, seed=0)
+        ensemble.set_max_steps(n_steps)
+        ensemble.run()
+    elapsed = best_time(run, repeat)
+    return [result('ensemble_vectorized', n_walkers * n_steps / elapsed, 'steps/s',
+                   walkers=n_walkers)]
+
+
+def run_all(quick=False):
+    """Ejecuta todos los benchmarks de ensambles"""
+    scale = 10 if quick else 1
+    repeat = 2 if quick else 3
+    results = []
+    results += bench_runner_scaling(256 // scale, 20000, repeat)
+    results += bench_vectorized_ensemble(1000, 2000 // scale, repeat)
+    return results
\ No newline at end of file
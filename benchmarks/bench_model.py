@@ -0,0 +1,113 @@
+import tracemalloc
+from models.particle import Particle
+from models.simulator import Simulator
+from benchmarks.timing import best_time, result
+
+GRID_SIZES = (40, 1000)
+
+
+def bench_particle_move(n_moves, repeat):
+    """Movimientos por segundo de Particle.move (con historial)"""
+    results = []
+    for size in GRID_SIZES:
+        def run():
+            particle = Particle(size // 2, size // 2)
+            for _ in range(n_moves):
+                particle.move(size, size)
+        elapsed = best_time(run, repeat)
+        results.append(result('particle_move', n_moves / elapsed, 'moves/s', grid=size))
+    return results
+
+
+def bench_step(n_steps, repeat):
+    """Pasos válidos por segundo llamando Simulator.step() uno a uno"""
+    results = []
+    for size in GRID_SIZES:
+        def run():
+            simulator = Simulator(size, size, seed=0)
+            simulator.set_max_steps(n_steps)
+            while not simulator.is_finished:
+                simulator.step()
+        elapsed = best_time(run, repeat)
+        results.append(result('simulator_step', n_steps / elapsed, 'steps/s', grid=size))
+    return results
+
+
+def bench_run_batch(n_steps, repeat):
+    """Pasos válidos por segundo con Simulator.run_batch(), con y sin historial"""
+    results = []
+    for size in GRID_SIZES:
+        for history in (True, False):
+            def run():
+                simulator = Simulator(size, size, seed=0)
+                simulator.set_max_steps(n_steps)
+                simulator.particle.record_history = history
+                simulator.run_batch()
+            elapsed = best_time(run, repeat)
+            results.append(result('simulator_run_batch', n_steps / elapsed, 'steps/s',
+                                  grid=size, history=history))
+    return results
+
+
+def bench_sampler(n_steps, repeat):
+    """Pasos válidos por segundo de run_batch() con cada muestreo en grids con muchos rechazos"""
+    results = []
+    for size, step_size in ((4, 1), (9, 4), (40, 1)):
+        for sampler in ('exact', 'rejection_free'):
+            def run():
+                simulator = Simulator(size, size, step_size, seed=0, observables=(), sampler=sampler)
+                simulator.set_max_steps(n_steps)
+                simulator.run_batch()
+            elapsed = best_time(run, repeat)
+            results.append(result('simulator_sampler', n_steps / elapsed, 'steps/s',
+                                  grid=size, step_size=step_size, sampler=sampler))
+    return results
+
+
+def bench_get_stats(n_calls, path_length, repeat):
+    """Llamadas por segundo a Simulator.get_stats() con un camino largo"""
+    simulator = Simulator(40, 40, seed=0)
+    simulator.set_max_steps(path_length)
+    simulator.run_batch()
+    
+    def run():
+        for _ in range(n_calls):
+            simulator.get_stats()
+    elapsed = best_time(run, repeat)
+    return [result('simulator_get_stats', n_calls / elapsed, 'calls/s', path_length=path_length)]
+
+
+def bench_memory_per_step(n_steps):
+    """
+    Bytes asignados por paso válido registrado
+    
+    Se mide con tracemalloc (NumPy le reporta sus arreglos) la memoria que
+    queda viva después de la corrida, dividida por los pasos dados.
+    """
+    results = []
+    for history in (True, False):
+        tracemalloc.start()
+        simulator = Simulator(40, 40, seed=0)
+        simulator.set_max_steps(n_steps)
+        simulator.particle.record_history = history
+        before = tracemalloc.get_traced_memory()[0]
+        simulator.run_batch()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results.append(result('memory_per_step', (after - before) / n_steps, 'bytes/step',
+                              history=history))
+    return results
+
+
+def run_all(quick=False):
+    """Ejecuta todos los benchmarks del modelo"""
+    scale = 10 if quick else 1
+    repeat = 3 if quick else 5
+    results = []
+    results += bench_particle_move(100000 // scale, repeat)
+    results += bench_step(50000 // scale, repeat)
+    results += bench_run_batch(2000000 // scale, repeat)
+    results += bench_sampler(300000 // scale, repeat)
+    results += bench_get_stats(10000 // scale, 1000000 // scale, repeat)
+    results += bench_memory_per_step(1000000 // scale)
+    return results
\ No newline at end of file
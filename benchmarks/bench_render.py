@@ -0,0 +1,120 @@
+import os
+from benchmarks.timing import best_time, result
+
+PATH_LENGTHS = (100, 1000, 10000, 100000, 1000000)
+CANVAS_SIZE = (800, 800)
+
+
+def bench_paint(path_lengths, repeat):
+    """
+    Tiempo de paintEvent del canvas según el largo del camino
+    
+    Se dibuja en un QImage con la plataforma Qt 'offscreen', así que corre
+    sin pantalla. 'cold' reconstruye el back buffer completo (primer frame
+    tras reiniciar) y 'warm' es el frame normal después de un paso más.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage
+    from models.simulator import Simulator
+    from gui.canvas import SimulationCanvas
+    
+    app = QApplication.instance() or QApplication([])
+    width, height = CANVAS_SIZE
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    
+    results = []
+    for length in path_lengths:
+        simulator = Simulator(40, 40, seed=0)
+        simulator.set_max_steps(length + repeat + 1)
+        simulator.run_batch(length)
+        canvas = SimulationCanvas(simulator)
+        canvas.resize(width, height)
+        
+        def cold():
+            canvas.invalidate_buffer()
+            canvas.render(image)
+        
+        def warm():
+            simulator.step()
+            canvas.render(image)
+        
+        results.append(result('paint_cold', best_time(cold, repeat) * 1000, 'ms', path_length=length))
+        results.append(result('paint_warm', best_time(warm, repeat) * 1000, 'ms', path_length=length))
+        app.processEvents()
+    return results
+
+
+def bench_export(cell_sizes, repeat):
+    """
+    Velocidad de la exportación por teselas a PNG (megapíxeles por segundo)
+    
+    Exporta una caminata de 10^6 pasos en un grid de 1000 x 1000 (mapa de
+    densidad) con distintos píxeles por celda.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import tempfile
+    from PyQt5.QtWidgets import QApplication
+    from models.simulator import Simulator
+    from gui.export import TileRenderer, export_png
+    
+    app = QApplication.instance() or QApplication([])
+    simulator = Simulator(1000, 1000, seed=0, observables=())
+    simulator.set_max_steps(1000000)
+    simulator.run_batch()
+    
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.png')
+        for cell_size in cell_sizes:
+            renderer = TileRenderer(simulator, cell_size)
+            megapixels = renderer.image_width * renderer.image_height / 1e6
+            elapsed = best_time(lambda: export_png(simulator, path, cell_size), repeat)
+            results.append(result('export_png', megapixels / elapsed, 'Mpx/s', cell_size=cell_size))
+            app.processEvents()
+    return results
+
+
+def bench_ensemble_paint(configs, repeat):
+    """
+    Tiempo de un frame del canvas de ensamble según partículas y largo de estela
+    
+    Cada frame avanza un intento del ensamble y lo dibuja con las llamadas
+    agrupadas por color de EnsembleCanvas.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage
+    from models.ensemble import EnsembleSimulator
+    from gui.ensemble_canvas import EnsembleCanvas
+    
+    app = QApplication.instance() or QApplication([])
+    width, height = CANVAS_SIZE
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    
+    results = []
+    for n_walkers, trail_length in configs:
+        ensemble = EnsembleSimulator(200, 200, n_walkers, seed=0, trail_length=trail_length)
+        ensemble.set_max_steps(1000000)
+        ensemble.run_batch(2 * trail_length + 100)
+        canvas = EnsembleCanvas(ensemble)
+        canvas.resize(width, height)
+        
+        def frame():
+            ensemble.step()
+            canvas.render(image)
+        
+        results.append(result('paint_ensemble', best_time(frame, repeat) * 1000, 'ms',
+                              walkers=n_walkers, trail_length=trail_length))
+        app.processEvents()
+    return results
+
+
+def run_all(quick=False):
+    """Ejecuta todos los benchmarks de dibujo"""
+    lengths = PATH_LENGTHS[:-1] if quick else PATH_LENGTHS
+    results = bench_paint(lengths, 3 if quick else 5)
+    results += bench_export((1, 4) if quick else (1, 4, 8), 1 if quick else 3)
+    configs = ((1000, 0), (1000, 20), (5000, 20)) if quick else ((1000, 0), (1000, 20), (5000, 20), (20000, 50))
+    results += bench_ensemble_paint(configs, 3 if quick else 5)
+    return results
\ No newline at end of file
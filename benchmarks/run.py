@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from benchmarks import bench_model, bench_ensemble, bench_render
+
+SUITES = {
+    'model': bench_model.run_all,
+    'ensemble': bench_ensemble.run_all,
+    'render': bench_render.run_all,
+}
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def build_parser():
+    """Crea el parser de argumentos del runner de benchmarks"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks de la simulación SWR (modelo, ensambles y dibujo)'
+    )
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help='Suite a ejecutar (se puede repetir; todas si se omite)')
+    parser.add_argument('--quick', action='store_true', help='Tamaños reducidos para una pasada rápida')
+    parser.add_argument('--output', default=None,
+                        help='Archivo JSON de resultados (benchmarks/results/<fecha>.json si se omite)')
+    parser.add_argument('--compare', default=None, help='Resultados anteriores contra los que comparar')
+    return parser
+
+
+def environment():
+    """Describe la máquina y el código con que se midió"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(RESULTS_DIR)).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _key(entry):
+    return (entry['name'], json.dumps(entry['params'], sort_keys=True))
+
+
+def compare(previous, current, stream):
+    """Escribe la razón actual / anterior de cada resultado presente en ambos"""
+    before = {_key(entry): entry for entry in previous['results']}
+    for entry in current['results']:
+        old = before.get(_key(entry))
+        if old is None or not old['value']:
+            continue
+        params = ', '.join(f'{k}={v}' for k, v in entry['params'].items())
+        stream.write(f"{entry['name']:<22} {params:<30} {old['value']:>14.4g} -> "
+                     f"{entry['value']:>14.4g} {entry['unit']:<10} x{entry['value'] / old['value']:.2f}\n")
+
+
+def main(argv=None):
+    """Ejecuta las suites pedidas y guarda los resultados en JSON"""
+    args = build_parser().parse_args(argv)
+    suites = args.suite or list(SUITES)
+    
+    report = environment()
+    report['quick'] = args.quick
+    report['results'] = []
+    for name in suites:
+        sys.stderr.write(f'Ejecutando {name}...\n')
+        report['results'] += SUITES[name](quick=args.quick)
+    
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w') as stream:
+        json.dump(report, stream, indent=2)
+        stream.write('\n')
+    sys.stderr.write(f'Resultados en {output}\n')
+    
+    for entry in report['results']:
+        params = ', '.join(f'{k}={v}' for k, v in entry['params'].items())
+        sys.stdout.write(f"{entry['name']:<22} {params:<30} {entry['value']:>14.4g} {entry['unit']}\n")
+    
+    if args.compare:
+        with open(args.compare) as stream:
+            previous = json.load(stream)
+        sys.stdout.write(f'\nComparación con {args.compare}:\n')
+        compare(previous, report, sys.stdout)
+    return 0
\ No newline at end of file
@@ -0,0 +1,23 @@
+import time
+
+def best_time(fn, repeat=5):
+    """
+    Ejecuta fn varias veces y retorna el menor tiempo en segundos
+    
+    El mínimo es la medida menos afectada por otros procesos de la máquina.
+    
+    Args:
+        fn: Función sin argumentos a medir
+        repeat: Número de repeticiones
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def result(name, value, unit, **params):
+    """Arma un resultado con el formato que guarda el runner"""
+    return {'name': name, 'params': params, 'value': value, 'unit': unit}
\ No newline at end of file
@@ -1,52 +1,130 @@
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPainter, QPen, QBrush, QColor
+from PyQt5.QtCore import Qt, QTimer, QLineF
+from PyQt5.QtGui import QPainter, QPen, QColor, QImage
+from gui.worker import SimulationWorker
+from gui.scene import SceneDrawing
 
-class SimulationCanvas(QWidget):
+# Intervalo fijo de refresco de pantalla (ms), independiente del ritmo de simulación
+FRAME_INTERVAL = 33
+
+# Intervalo de refresco de las estadísticas (ms): 20 Hz, independiente del ritmo de simulación
+STATS_INTERVAL = 50
+
+# Eventos del simulador que dejan las estadísticas desactualizadas
+STATS_EVENTS = ('step', 'progress', 'reset')
+
+# Tamaño máximo de celda en píxeles al acercar
+MAX_CELL_SIZE = 64
+
+# Factor de zoom por cada paso de la rueda del mouse
+ZOOM_STEP = 1.25
+
+# Margen en píxeles alrededor del grid al ajustar la vista
+FIT_MARGIN = 10
+
+class SimulationCanvas(SceneDrawing, QWidget):
     """Widget personalizado para visualizar la simulación"""
     
     def __init__(self, simulator):
         super().__init__()
-        self.simulator = simulator
-        self.cell_size = 15  # Tamaño de cada celda en píxeles
+        self.init_scene(simulator)
         self.setMinimumSize(600, 600)
         
-        # Timer para animación
+        # Vista: tamaño de celda en píxeles (zoom) y punto del grid en el centro del widget
+        self.cell_size = 15.0
+        self.center_x = simulator.grid_width / 2
+        self.center_y = simulator.grid_height / 2
+        self._auto_fit = True      # Ajustar al widget hasta que el usuario mueva la vista
+        self._drag_origin = None   # Posición del mouse al arrastrar (pan)
+        
+        # La simulación avanza en un hilo propio; el timer solo refresca la pantalla
+        self.worker = SimulationWorker(simulator)
         self.timer = QTimer()
-        self.timer.timeout.connect(self.animate_step)
-        self.animation_speed = 100  # ms entre pasos
+        self.timer.timeout.connect(self.refresh_frame)
+        self.animation_speed = 100  # ms entre pasos (0 = máxima velocidad)
         
-        # Para mostrar el último intento inválido temporalmente
+        # Para mostrar el último intento inválido temporalmente: ((x, y) origen, (x, y) destino)
         self.last_invalid_attempt = None
+        self._seen_rejections = 0  # rejections.total ya vistos por refresh_frame
         self.show_invalid_timer = QTimer()
         self.show_invalid_timer.timeout.connect(self.clear_invalid_attempt)
         
+        # Back buffer: grid estático cacheado + camino dibujado de forma incremental
+        self._static_image = None
+        self._static_key = None
+        self._buffer = None
+        self._buffer_key = None
+        self._drawn_path = 0      # Posiciones del camino ya dibujadas en el buffer
+        self._buffer_lod = False  # Si el buffer se construyó en modo nivel de detalle
+        
+        # Paso mostrado por la línea de tiempo (None = estado actual)
+        self.view_step = None
+        self.view_state = None
+        
+        # Elementos dibujados en el último frame (para la instrumentación)
+        self.frame_objects = 0
+    
+    def set_simulator(self, simulator):
+        """
+        Reemplaza el simulador mostrado (p. ej. al cambiar el tamaño del grid)
+        
+        Detiene la animación, crea un worker nuevo con la misma configuración
+        de velocidad y ajusta la vista al grid nuevo.
+        """
+        self.stop_animation()
+        old_worker = self.worker
+        self.init_scene(simulator)
+        self.worker = SimulationWorker(simulator)
+        self.worker.step_delay = old_worker.step_delay
+        self.worker.time_budget = old_worker.time_budget
+        self.view_step = None
+        self.view_state = None
+        self.last_invalid_attempt = None
+        self._seen_rejections = 0
+        self.invalidate_buffer()
+        self.fit_view()
+    
     def set_animation_speed(self, speed):
-        """Establece la velocidad de animación en ms"""
+        """Establece la velocidad de animación en ms por paso (0 = máxima velocidad)"""
         self.animation_speed = speed
-        if self.timer.isActive():
-            self.timer.setInterval(speed)
+        self.worker.step_delay = speed / 1000
+    
+    def set_time_budget(self, budget):
+        """Establece el tiempo de cómputo (ms) por ciclo en máxima velocidad"""
+        self.worker.time_budget = budget / 1000
     
     def start_animation(self):
         """Inicia la animación automática"""
-        self.timer.start(self.animation_speed)
+        self.worker.step_delay = self.animation_speed / 1000
+        self.worker.start()
+        self.timer.start(FRAME_INTERVAL)
     
     def stop_animation(self):
         """Detiene la animación"""
+        self.worker.stop()
         self.timer.stop()
     
-    def animate_step(self):
-        """Ejecuta un paso y actualiza la visualización"""
-        result = self.simulator.step()
+    def is_animating(self):
+        """Retorna True si la simulación automática está en curso"""
+        return self.timer.isActive()
+    
+    def refresh_frame(self):
+        """Actualiza la visualización con el último estado del worker"""
+        with self.worker.lock:
+            rejections = self.simulator.particle.rejections
+            # Hubo intentos inválidos desde el frame anterior (con step() o run_batch())
+            latest = rejections.recent()[-1] if rejections.total > self._seen_rejections else None
+            self._seen_rejections = rejections.total
+            finished = self.simulator.is_finished
         
-        # Si fue un intento inválido, mostrarlo temporalmente
-        if not result['moved']:
-            self.last_invalid_attempt = result.get('attempted_position')
+        # Si hubo un intento inválido, mostrar el último temporalmente
+        if latest is not None:
+            self.last_invalid_attempt = (latest['from'], latest['to'])
             self.show_invalid_timer.start(200)  # Mostrar por 200ms
         
         self.update()
         
-        if result['finished']:
+        if finished:
             self.timer.stop()
     
     def clear_invalid_attempt(self):
@@ -55,33 +133,219 @@ class SimulationCanvas(QWidget):
         self.show_invalid_timer.stop()
         self.update()
     
+    def instrument(self, profiler):
+        """
+        Mide con profiler el dibujo de cada frame y de cada método draw_*
+        
+        Cuenta además los elementos dibujados por frame ('objects_drawn').
+        """
+        def count_objects(result):
+            profiler.add('objects_drawn', self.frame_objects)
+        
+        profiler.instrument(self, 'paintEvent', 'paint', after=count_objects)
+        for method in ('draw_grid', 'draw_path', 'draw_invalid_attempts', 'draw_density',
+                       'draw_particle', 'draw_last_invalid'):
+            profiler.instrument(self, method)
+    
+    def invalidate_buffer(self):
+        """Descarta el back buffer para redibujar todo en el siguiente frame"""
+        self._buffer_key = None
+        self._prefix_counts = None
+        self._density_key = None
+        self.path_index.reset()
+    
+    def set_view_step(self, step):
+        """
+        Muestra la caminata tal como estaba justo después del paso válido `step`
+        
+        La posición y los contadores se reconstruyen desde el checkpoint más
+        cercano (Simulator.state_at), así que el costo no depende del largo
+        de la corrida. None vuelve a mostrar el estado actual.
+        """
+        if step is None:
+            self.view_step = None
+            self.view_state = None
+        else:
+            with self.worker.lock:
+                self.view_state = self.simulator.state_at(step)
+            self.view_step = self.view_state['valid_steps']
+        self.update()
+    
+    def fit_cell_size(self):
+        """Retorna el tamaño de celda con que el grid completo entra en el widget"""
+        width = max(self.width() - 2 * FIT_MARGIN, 1)
+        height = max(self.height() - 2 * FIT_MARGIN, 1)
+        return min(width / self.simulator.grid_width,
+                   height / self.simulator.grid_height, MAX_CELL_SIZE)
+    
+    def fit_view(self):
+        """Centra el grid y ajusta el zoom para verlo completo"""
+        self.cell_size = self.fit_cell_size()
+        self.center_x = self.simulator.grid_width / 2
+        self.center_y = self.simulator.grid_height / 2
+        self._auto_fit = True
+        self.update()
+    
+    def zoom_at(self, factor, x, y):
+        """
+        Multiplica el zoom por factor manteniendo fijo el punto de pantalla (x, y)
+        
+        El zoom se limita entre la mitad del ajuste al widget y MAX_CELL_SIZE.
+        """
+        offset_x, offset_y = self.grid_offset()
+        grid_x = (x - offset_x) / self.cell_size
+        grid_y = (y - offset_y) / self.cell_size
+        
+        fit = self.fit_cell_size()
+        self.cell_size = min(max(self.cell_size * factor, fit / 2), max(MAX_CELL_SIZE, fit))
+        self.center_x = grid_x - (x - self.width() / 2) / self.cell_size
+        self.center_y = grid_y - (y - self.height() / 2) / self.cell_size
+        self._clamp_center()
+        self._auto_fit = False
+        self.update()
+    
+    def pan_by(self, dx, dy):
+        """Desplaza la vista dx, dy píxeles (el grid se mueve con el mouse)"""
+        self.center_x -= dx / self.cell_size
+        self.center_y -= dy / self.cell_size
+        self._clamp_center()
+        self._auto_fit = False
+        self.update()
+    
+    def _clamp_center(self):
+        """Evita que el centro de la vista salga del grid"""
+        self.center_x = min(max(self.center_x, 0), self.simulator.grid_width)
+        self.center_y = min(max(self.center_y, 0), self.simulator.grid_height)
+    
+    def grid_offset(self):
+        """Retorna la posición en pantalla (px) de la esquina superior izquierda del grid"""
+        return (self.width() / 2 - self.center_x * self.cell_size,
+                self.height() / 2 - self.center_y * self.cell_size)
+    
+    def _view_key(self):
+        """Identifica la geometría de la vista (cambia con el zoom, el pan o el tamaño)"""
+        return (self.width(), self.height(), self.simulator.grid_width,
+                self.simulator.grid_height, self.cell_size, self.center_x, self.center_y)
+    
+    def wheelEvent(self, event):
+        """Rueda del mouse: zoom alrededor del cursor"""
+        delta = event.angleDelta().y()
+        if delta:
+            self.zoom_at(ZOOM_STEP ** (delta / 120), event.pos().x(), event.pos().y())
+    
+    def mousePressEvent(self, event):
+        """Botón izquierdo: comienza a arrastrar la vista"""
+        if event.button() == Qt.LeftButton:
+            self._drag_origin = event.pos()
+            self.setCursor(Qt.ClosedHandCursor)
+    
+    def mouseMoveEvent(self, event):
+        """Arrastre: desplaza la vista"""
+        if self._drag_origin is not None:
+            pos = event.pos()
+            self.pan_by(pos.x() - self._drag_origin.x(), pos.y() - self._drag_origin.y())
+            self._drag_origin = pos
+    
+    def mouseReleaseEvent(self, event):
+        """Termina el arrastre"""
+        if event.button() == Qt.LeftButton:
+            self._drag_origin = None
+            self.unsetCursor()
+    
+    def mouseDoubleClickEvent(self, event):
+        """Doble clic: vuelve a ver el grid completo"""
+        self.fit_view()
+    
+    def resizeEvent(self, event):
+        """Mantiene el grid ajustado al widget mientras el usuario no mueva la vista"""
+        if self._auto_fit:
+            self.cell_size = self.fit_cell_size()
+        super().resizeEvent(event)
+    
+    def _rebuild_buffer(self, key, lod, offset_x, offset_y):
+        """Reinicia el buffer a partir del fondo y el grid estático"""
+        self._buffer = self._static_frame(key, offset_x, offset_y).copy()
+        self._buffer_key = key
+        self._buffer_lod = lod
+        self._drawn_path = 0
+    
+    def _static_frame(self, key, offset_x, offset_y):
+        """Retorna la imagen del fondo y el grid, dibujándola solo si cambió la vista"""
+        if key != self._static_key:
+            self._static_key = key
+            self._static_image = QImage(self.width(), self.height(), QImage.Format_ARGB32_Premultiplied)
+            painter = QPainter(self._static_image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.draw_background(painter, offset_x, offset_y)
+            painter.end()
+        
+        return self._static_image
+    
     def paintEvent(self, event):
         """Dibuja el grid y la simulación"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        # El worker se detiene solo mientras se copia lo que lee el frame
+        with self.worker.lock:
+            self.capture_frame()
+        self.paint_frame()
+    
+    def capture_frame(self):
+        """
+        Copia el estado del frame (ver SceneDrawing), decide el nivel de
+        detalle y pone al día el índice espacial del camino
         
-        # Fondo blanco para todo el widget
-        painter.fillRect(0, 0, self.width(), self.height(), QColor(255, 255, 255))
+        El índice se comparte con la exportación a imagen, que lo usa con
+        el lock tomado; solo el dibujo exacto del camino lo consulta.
+        Indexar lo nuevo en cada frame evita una pausa larga al acercar la vista.
+        """
+        frame = super().capture_frame()
+        if self.view_step is None:
+            frame['lod'] = self.use_level_of_detail()
+        else:
+            frame['lod'] = self.use_level_of_detail(self.view_step + 1)
+        if len(frame['path']) < self._drawn_path:
+            self.path_index.reset()
+        if frame['record_history'] and not frame['lod']:
+            self.path_index.update(frame['path'])
+        return frame
+    
+    def paint_frame(self):
+        """Dibuja el frame capturado con capture_frame() (sin el lock del worker)"""
+        offset_x, offset_y = self.grid_offset()
         
-        # Calcular dimensiones del grid
-        width = self.simulator.grid_width * self.cell_size
-        height = self.simulator.grid_height * self.cell_size
+        if self.view_step is not None:
+            self.paint_view_frame(offset_x, offset_y)
+            return
         
-        # Centrar el grid en el widget
-        offset_x = (self.width() - width) // 2
-        offset_y = (self.height() - height) // 2
+        # Reconstruir el buffer si cambió la vista o se reinició la simulación
+        path_length = len(self.frame['path'])
+        key = self._view_key()
+        lod = self.frame['lod']
+        if (key != self._buffer_key or lod != self._buffer_lod
+                or path_length < self._drawn_path):
+            self._rebuild_buffer(key, lod, offset_x, offset_y)
         
-        # Dibujar fondo del grid
-        painter.fillRect(offset_x, offset_y, width, height, QColor(250, 250, 250))
+        # Partícula, inicio y (si corresponde) densidad y último intento inválido
+        self.frame_objects = 2 + lod + bool(self.last_invalid_attempt)
         
-        # Dibujar grid
-        self.draw_grid(painter, offset_x, offset_y)
+        # Agregar al buffer solo el camino nuevo desde el frame anterior
+        # (en modo nivel de detalle se dibuja como densidad)
+        if path_length > self._drawn_path:
+            if not lod:
+                buffer_painter = QPainter(self._buffer)
+                buffer_painter.setRenderHint(QPainter.Antialiasing)
+                self.frame_objects += self.draw_path(buffer_painter, offset_x, offset_y,
+                                                     max(self._drawn_path - 1, 0))
+                buffer_painter.end()
+            self._drawn_path = path_length
         
-        # Dibujar intentos inválidos permanentes
-        self.draw_invalid_attempts(painter, offset_x, offset_y)
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self._buffer)
+        if lod:
+            self.draw_density(painter, offset_x, offset_y)
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        # Dibujar camino
-        self.draw_path(painter, offset_x, offset_y)
+        # Intentos inválidos agregados: un marcador por celda del borde y dirección
+        self.frame_objects += self.draw_invalid_attempts(painter, offset_x, offset_y)
         
         # Dibujar último intento inválido (temporal, más visible)
         if self.last_invalid_attempt:
@@ -90,111 +354,37 @@ class SimulationCanvas(QWidget):
         # Dibujar partícula actual
         self.draw_particle(painter, offset_x, offset_y)
     
-    def draw_grid(self, painter, offset_x, offset_y):
-        """Dibuja el grid de fondo"""
-        painter.setPen(QPen(QColor(200, 200, 200), 1))
-        
-        for i in range(self.simulator.grid_width + 1):
-            x = offset_x + i * self.cell_size
-            painter.drawLine(x, offset_y, x, offset_y + self.simulator.grid_height * self.cell_size)
-        
-        for i in range(self.simulator.grid_height + 1):
-            y = offset_y + i * self.cell_size
-            painter.drawLine(offset_x, y, offset_x + self.simulator.grid_width * self.cell_size, y)
-        
-        # Dibujar borde del grid más grueso
-        painter.setPen(QPen(QColor(100, 100, 100), 3))
-        painter.drawRect(offset_x, offset_y, 
-                        self.simulator.grid_width * self.cell_size,
-                        self.simulator.grid_height * self.cell_size)
-    
-    def draw_invalid_attempts(self, painter, offset_x, offset_y):
-        """Dibuja todos los intentos inválidos (fuera del grid)"""
-        invalid_attempts = self.simulator.particle.get_invalid_attempts()
-        
-        for attempt in invalid_attempts:
-            from_pos = attempt['from']
-            to_pos = attempt['to']
-            
-            # Calcular coordenadas
-            x1 = offset_x + from_pos[0] * self.cell_size + self.cell_size // 2
-            y1 = offset_y + from_pos[1] * self.cell_size + self.cell_size // 2
-            x2 = offset_x + to_pos[0] * self.cell_size + self.cell_size // 2
-            y2 = offset_y + to_pos[1] * self.cell_size + self.cell_size // 2
-            
-            # Dibujar línea roja punteada para intentos inválidos
-            painter.setPen(QPen(QColor(255, 100, 100, 150), 2, Qt.DashLine))
-            painter.drawLine(x1, y1, x2, y2)
-            
-            # Dibujar X en el punto de intento inválido
-            size = 6
-            painter.setPen(QPen(QColor(255, 0, 0, 150), 2))
-            painter.drawLine(x2 - size, y2 - size, x2 + size, y2 + size)
-            painter.drawLine(x2 - size, y2 + size, x2 + size, y2 - size)
+    def paint_view_frame(self, offset_x, offset_y):
+        """Dibuja la caminata en el paso elegido en la línea de tiempo"""
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self._static_frame(self._view_key(), offset_x, offset_y))
+        
+        step = self.view_step
+        if self.frame['lod']:
+            self.draw_density(painter, offset_x, offset_y, step)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.frame_objects = 3
+        else:
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.frame_objects = 2 + self.draw_path(painter, offset_x, offset_y, 0, step + 1)
+        
+        self.draw_particle(painter, offset_x, offset_y, self.view_state['position'])
     
     def draw_last_invalid(self, painter, offset_x, offset_y):
         """Dibuja el último intento inválido de forma más visible"""
-        pos = self.simulator.particle.get_position()
+        origin, target = self.last_invalid_attempt
         
-        x1 = offset_x + pos[0] * self.cell_size + self.cell_size // 2
-        y1 = offset_y + pos[1] * self.cell_size + self.cell_size // 2
-        x2 = offset_x + self.last_invalid_attempt[0] * self.cell_size + self.cell_size // 2
-        y2 = offset_y + self.last_invalid_attempt[1] * self.cell_size + self.cell_size // 2
+        x1 = offset_x + (origin[0] + 0.5) * self.cell_size
+        y1 = offset_y + (origin[1] + 0.5) * self.cell_size
+        x2 = offset_x + (target[0] + 0.5) * self.cell_size
+        y2 = offset_y + (target[1] + 0.5) * self.cell_size
         
         # Línea roja sólida
         painter.setPen(QPen(QColor(255, 0, 0), 3, Qt.SolidLine))
-        painter.drawLine(x1, y1, x2, y2)
+        painter.drawLine(QLineF(x1, y1, x2, y2))
         
         # X grande en el destino
         size = 8
         painter.setPen(QPen(QColor(255, 0, 0), 3))
-        painter.drawLine(x2 - size, y2 - size, x2 + size, y2 + size)
-        painter.drawLine(x2 - size, y2 + size, x2 + size, y2 - size)
-    
-    def draw_path(self, painter, offset_x, offset_y):
-        """Dibuja el camino recorrido por la partícula"""
-        path = self.simulator.get_path()
-        
-        if len(path) < 2:
-            return
-        
-        # Dibujar líneas conectando el camino
-        painter.setPen(QPen(QColor(100, 150, 255), 2, Qt.SolidLine))
-        
-        for i in range(len(path) - 1):
-            x1 = offset_x + path[i][0] * self.cell_size + self.cell_size // 2
-            y1 = offset_y + path[i][1] * self.cell_size + self.cell_size // 2
-            x2 = offset_x + path[i + 1][0] * self.cell_size + self.cell_size // 2
-            y2 = offset_y + path[i + 1][1] * self.cell_size + self.cell_size // 2
-            painter.drawLine(x1, y1, x2, y2)
-        
-        # Dibujar puntos visitados con transparencia para ver superposiciones (SWR)
-        painter.setBrush(QBrush(QColor(150, 200, 255, 150)))
-        painter.setPen(QPen(QColor(50, 100, 200), 1))
-        
-        for pos in path[:-1]:  # Todos excepto la posición actual
-            x = offset_x + pos[0] * self.cell_size + self.cell_size // 4
-            y = offset_y + pos[1] * self.cell_size + self.cell_size // 4
-            painter.drawEllipse(x, y, self.cell_size // 2, self.cell_size // 2)
-    
-    def draw_particle(self, painter, offset_x, offset_y):
-        """Dibuja la posición actual de la partícula"""
-        pos = self.simulator.particle.get_position()
-        
-        # Dibujar partícula
-        painter.setBrush(QBrush(QColor(255, 100, 100)))
-        painter.setPen(QPen(QColor(200, 0, 0), 2))
-        
-        x = offset_x + pos[0] * self.cell_size + self.cell_size // 4
-        y = offset_y + pos[1] * self.cell_size + self.cell_size // 4
-        painter.drawEllipse(x, y, self.cell_size // 2, self.cell_size // 2)
-        
-        # Dibujar punto de inicio
-        if len(self.simulator.get_path()) > 0:
-            start = self.simulator.get_path()[0]
-            painter.setBrush(QBrush(QColor(100, 255, 100)))
-            painter.setPen(QPen(QColor(0, 200, 0), 2))
-            
-            sx = offset_x + start[0] * self.cell_size + self.cell_size // 4
-            sy = offset_y + start[1] * self.cell_size + self.cell_size // 4
-            painter.drawEllipse(sx, sy, self.cell_size // 2, self.cell_size // 2)
\ No newline at end of file
+        painter.drawLine(QLineF(x2 - size, y2 - size, x2 + size, y2 + size))
+        painter.drawLine(QLineF(x2 - size, y2 + size, x2 + size, y2 - size))
@@ -0,0 +1,223 @@
+import struct
+from PyQt5.QtCore import Qt, QRectF, QByteArray, QDataStream
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QPolygonF, QPainterPath
+import numpy as np
+from gui.canvas import SimulationCanvas
+
+# Colores de las partículas: la partícula i usa WALKER_COLORS[i % len(WALKER_COLORS)]
+WALKER_COLORS = ((31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40),
+                 (148, 103, 189), (140, 86, 75), (227, 119, 194), (23, 190, 207))
+
+# Opacidad (0-255) de las estelas
+TRAIL_ALPHA = 110
+
+# Diámetro mínimo en píxeles de una partícula (con poco zoom siguen visibles)
+MIN_WALKER_SIZE = 3
+
+# Segmentos de estela por frame como máximo (se descartan primero los más viejos)
+MAX_TRAIL_SEGMENTS = 40000
+
+# Largo total en píxeles de las estelas por frame como máximo: con zoom los
+# segmentos son más largos y se dibujan menos
+MAX_TRAIL_PIXELS = 200000
+
+# Elemento de un QPainterPath tal como lo lee QDataStream: tipo, x, y
+PATH_ELEMENT = np.dtype([('type', '<i4'), ('x', '<f8'), ('y', '<f8')])
+
+def points_polygon(points):
+    """
+    Convierte un arreglo (n, 2) de coordenadas de pantalla en un QPolygonF
+    
+    Los valores se copian directo a la memoria del polígono (QPointF son
+    dos double), sin crear un objeto de Python por punto.
+    """
+    polygon = QPolygonF(len(points))
+    buffer = polygon.data()
+    buffer.setsize(len(points) * 16)
+    np.frombuffer(buffer, dtype=np.float64).reshape(len(points), 2)[:] = points
+    return polygon
+
+def polyline_path(points, starts):
+    """
+    Arma un QPainterPath de polilíneas con los puntos dados en orden
+    
+    El camino se arma serializado (un moveTo al comienzo de cada polilínea
+    y lineTo en el resto de los puntos) con NumPy y se lee de una vez con
+    QDataStream, en lugar de llamar moveTo y lineTo desde Python por cada
+    punto.
+    
+    Args:
+        points: Arreglo (n, 2) de coordenadas de pantalla
+        starts: Arreglo bool (n,) que marca los puntos que empiezan una polilínea
+    """
+    elements = np.empty(len(points), dtype=PATH_ELEMENT)
+    # QPainterPath.MoveToElement (0) o QPainterPath.LineToElement (1)
+    elements['type'] = ~starts
+    elements['x'] = points[:, 0]
+    elements['y'] = points[:, 1]
+    # Cantidad de elementos, elementos, inicio de la última curva y regla de relleno
+    data = struct.pack('<i', len(elements)) + elements.tobytes() + struct.pack('<ii', 0, 0)
+    stream = QDataStream(QByteArray(data))
+    stream.setByteOrder(QDataStream.LittleEndian)
+    path = QPainterPath()
+    stream >> path
+    return path
+
+class EnsembleCanvas(SimulationCanvas):
+    """
+    Canvas que muestra en vivo todas las partículas de un EnsembleSimulator
+    
+    Mantiene el zoom, el desplazamiento y el worker de SimulationCanvas,
+    pero cada frame se dibuja con unas pocas llamadas agrupadas: una lista
+    QPainterPath por color para las estelas y un arreglo de puntos por
+    color para las partículas, sin importar cuántas sean.
+    """
+    
+    def __init__(self, ensemble):
+        super().__init__(ensemble)
+        self.draw_calls = 0  # Llamadas de dibujo de partículas y estelas en el último frame
+    
+    def refresh_frame(self):
+        """Actualiza la visualización con el estado actual del ensamble"""
+        self.update()
+        with self.worker.lock:
+            finished = self.simulator.is_finished
+        if finished:
+            self.timer.stop()
+    
+    def instrument(self, profiler):
+        """Mide con profiler el dibujo de cada frame, de las estelas y de las partículas"""
+        def count_objects(result):
+            profiler.add('objects_drawn', self.frame_objects)
+        
+        profiler.instrument(self, 'paintEvent', 'paint', after=count_objects)
+        for method in ('draw_trails', 'draw_walkers'):
+            profiler.instrument(self, method)
+    
+    def capture_frame(self):
+        """
+        Copia las posiciones y las estelas que lee el frame
+        
+        Se llama con el lock del worker tomado; el ensamble sigue avanzando
+        mientras se dibuja la copia.
+        """
+        xs, ys = self.simulator.get_positions()
+        self.frame = {'positions': (xs.copy(), ys.copy()), 'trails': None}
+        if self.simulator.trail_length:
+            # get_trails() ya arma arreglos nuevos salvo los largos de las estelas
+            trail_x, trail_y, counts = self.simulator.get_trails()
+            self.frame['trails'] = (trail_x, trail_y, counts.copy())
+        return self.frame
+    
+    def paint_frame(self):
+        """Dibuja el frame capturado con capture_frame() (sin el lock del worker)"""
+        offset_x, offset_y = self.grid_offset()
+        self.draw_calls = 0
+        
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self._static_frame(self._view_key(), offset_x, offset_y))
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.frame_objects = self.draw_trails(painter, offset_x, offset_y)
+        self.frame_objects += self.draw_walkers(painter, offset_x, offset_y)
+    
+    def screen_points(self, xs, ys, offset_x, offset_y):
+        """Retorna el centro en pantalla de las celdas (xs, ys) como arreglo (n, 2)"""
+        points = np.empty((len(xs), 2), dtype=np.float64)
+        points[:, 0] = xs
+        points[:, 1] = ys
+        points += 0.5
+        points *= self.cell_size
+        points[:, 0] += offset_x
+        points[:, 1] += offset_y
+        return points
+    
+    def draw_trails(self, painter, offset_x, offset_y):
+        """
+        Dibuja la estela de cada partícula con un QPainterPath por color
+        
+        Cada estela entra al camino como una polilínea (un elemento por
+        posición, no dos por segmento); los tramos no visibles la cortan.
+        Se dibujan solo los segmentos con algún extremo visible, y a lo sumo
+        MAX_TRAIL_SEGMENTS que sumen MAX_TRAIL_PIXELS de largo (los más
+        recientes de cada partícula: con muchas partículas a la vista las
+        estelas se acortan). El trazo
+        es de un píxel: con trazos más anchos Qt arma el contorno de todo el
+        camino y el costo crece mucho más que el número de segmentos.
+        
+        Returns:
+            Número de segmentos dibujados
+        """
+        if self.frame['trails'] is None:
+            return 0
+        xs, ys, counts = self.frame['trails']
+        x0, y0, x1, y1 = self.visible_cells(self.simulator.step_size)
+        visible = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        
+        # Segmento entre las posiciones de hace k y k + 1 movimientos
+        ages = np.arange(len(xs) - 1)[:, None]
+        used = (ages + 1 < counts) & (visible[:-1] | visible[1:])
+        
+        # Con demasiados segmentos se acortan todas las estelas por igual
+        segment_pixels = max(int(self.cell_size * self.simulator.step_size), 1)
+        budget = min(MAX_TRAIL_SEGMENTS, MAX_TRAIL_PIXELS // segment_pixels)
+        kept = np.searchsorted(np.cumsum(np.count_nonzero(used, axis=1)), budget, side='right')
+        used[kept:] = False
+        total = int(np.count_nonzero(used))
+        if total == 0:
+            return 0
+        
+        painter.setBrush(Qt.NoBrush)
+        groups = len(WALKER_COLORS)
+        for g, color in enumerate(WALKER_COLORS):
+            # Partículas g, g + groups, ... (columnas del mismo color), una fila por partícula
+            segments = used[:, g::groups].T
+            if not segments.any():
+                continue
+            # Puntos a los que llega un segmento desde el anterior, y puntos de algún segmento
+            follows = np.zeros((len(segments), len(xs)), dtype=bool)
+            follows[:, 1:] = segments
+            needed = follows.copy()
+            needed[:, :-1] |= segments
+            points = self.screen_points(xs[:, g::groups].T[needed], ys[:, g::groups].T[needed],
+                                        offset_x, offset_y)
+            painter.setPen(QPen(QColor(*color, TRAIL_ALPHA), 1))
+            painter.drawPath(polyline_path(points, ~follows[needed]))
+            self.draw_calls += 1
+        return total
+    
+    def draw_walkers(self, painter, offset_x, offset_y):
+        """
+        Dibuja las partículas visibles con una llamada drawPoints por color
+        
+        Cada partícula es un punto con extremo redondeado del diámetro de
+        media celda (MIN_WALKER_SIZE como mínimo), así que se ve como un círculo.
+        
+        Returns:
+            Número de partículas dibujadas (más el punto de inicio)
+        """
+        xs, ys = self.frame['positions']
+        x0, y0, x1, y1 = self.visible_cells()
+        visible = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        size = max(self.cell_size / 2, MIN_WALKER_SIZE)
+        
+        # Punto de inicio común a todas las partículas
+        radius = size / 2 + 1
+        sx = offset_x + (self.simulator.start_x + 0.5) * self.cell_size
+        sy = offset_y + (self.simulator.start_y + 0.5) * self.cell_size
+        painter.setBrush(QBrush(QColor(100, 255, 100)))
+        painter.setPen(QPen(QColor(0, 200, 0), 2))
+        painter.drawEllipse(QRectF(sx - radius, sy - radius, 2 * radius, 2 * radius))
+        
+        drawn = 1
+        groups = len(WALKER_COLORS)
+        for g, color in enumerate(WALKER_COLORS):
+            mask = visible[g::groups]
+            n = int(np.count_nonzero(mask))
+            if n == 0:
+                continue
+            points = self.screen_points(xs[g::groups][mask], ys[g::groups][mask], offset_x, offset_y)
+            painter.setPen(QPen(QColor(*color), size, Qt.SolidLine, Qt.RoundCap))
+            painter.drawPoints(points_polygon(points))
+            self.draw_calls += 1
+            drawn += n
+        return drawn
\ No newline at end of file
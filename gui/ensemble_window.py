@@ -0,0 +1,275 @@
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QPushButton, QLabel, QSpinBox, QSlider, QGroupBox, QFrame)
+from PyQt5.QtCore import Qt, QTimer
+from models.ensemble import EnsembleSimulator
+from gui.canvas import STATS_INTERVAL, STATS_EVENTS
+from gui.ensemble_canvas import EnsembleCanvas
+
+# Partículas y largo de estela iniciales de la vista de ensamble
+DEFAULT_WALKERS = 500
+DEFAULT_TRAIL_LENGTH = 20
+
+class EnsembleWindow(QMainWindow):
+    """Ventana que muestra en vivo la dispersión de un ensamble de partículas"""
+    
+    def __init__(self, grid_width=40, grid_height=40, step_size=1, max_steps=500):
+        """
+        Crea la ventana con un ensamble nuevo
+        
+        Args:
+            grid_width: Ancho inicial del grid
+            grid_height: Alto inicial del grid
+            step_size: Tamaño del paso inicial
+            max_steps: Pasos válidos objetivo por partícula
+        """
+        super().__init__()
+        self.setWindowTitle("Simulación SWR - Ensamble en vivo")
+        self.setGeometry(80, 80, 1100, 800)
+        
+        self.ensemble = EnsembleSimulator(grid_width, grid_height, DEFAULT_WALKERS, step_size=step_size,
+                                          trail_length=DEFAULT_TRAIL_LENGTH)
+        self.ensemble.set_max_steps(max_steps)
+        
+        self.init_ui(max_steps)
+        
+        # Mismo esquema que la ventana principal: los eventos marcan las
+        # estadísticas como pendientes y el timer las refresca a 20 Hz
+        self._stats_dirty = True
+        self.subscribe_ensemble()
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.flush_stats)
+        self.stats_timer.start(STATS_INTERVAL)
+    
+    def init_ui(self, max_steps):
+        """Inicializa la interfaz de usuario"""
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QHBoxLayout()
+        central_widget.setLayout(main_layout)
+        
+        panel = QFrame()
+        panel.setFrameShape(QFrame.StyledPanel)
+        panel.setMaximumWidth(320)
+        panel.setMinimumWidth(280)
+        layout = QVBoxLayout()
+        panel.setLayout(layout)
+        layout.addWidget(self.create_control_panel(max_steps))
+        layout.addWidget(self.create_stats_panel())
+        layout.addStretch()
+        main_layout.addWidget(panel)
+        
+        self.canvas = EnsembleCanvas(self.ensemble)
+        self.canvas.set_animation_speed(self.speed_slider.value())
+        main_layout.addWidget(self.canvas, stretch=1)
+    
+    def create_control_panel(self, max_steps):
+        """Crea el panel de controles"""
+        group = QGroupBox("Controles")
+        layout = QVBoxLayout()
+        
+        # Parámetros del ensamble (cambiarlos crea un ensamble nuevo)
+        self.grid_width_spinbox = QSpinBox()
+        self.grid_height_spinbox = QSpinBox()
+        self.walkers_spinbox = QSpinBox()
+        self.trail_spinbox = QSpinBox()
+        self.step_size_spinbox = QSpinBox()
+        for spinbox, minimum, maximum, value in (
+                (self.grid_width_spinbox, 2, 10000, self.ensemble.grid_width),
+                (self.grid_height_spinbox, 2, 10000, self.ensemble.grid_height),
+                (self.walkers_spinbox, 1, 100000, self.ensemble.n_walkers),
+                (self.trail_spinbox, 0, 1000, self.ensemble.trail_length),
+                (self.step_size_spinbox, 1, 5, self.ensemble.step_size)):
+            spinbox.setMinimum(minimum)
+            spinbox.setMaximum(maximum)
+            spinbox.setValue(value)
+            spinbox.setKeyboardTracking(False)  # Recrear solo al confirmar el valor
+            spinbox.valueChanged.connect(self.on_ensemble_changed)
+        
+        grid_layout = QHBoxLayout()
+        grid_layout.addWidget(QLabel("Tamaño del grid:"))
+        grid_layout.addWidget(self.grid_width_spinbox)
+        grid_layout.addWidget(QLabel("×"))
+        grid_layout.addWidget(self.grid_height_spinbox)
+        layout.addLayout(grid_layout)
+        
+        for text, spinbox in (("Partículas:", self.walkers_spinbox),
+                              ("Estela (movimientos, 0 = sin estela):", self.trail_spinbox),
+                              ("Tamaño del paso:", self.step_size_spinbox)):
+            row = QHBoxLayout()
+            row.addWidget(QLabel(text))
+            row.addWidget(spinbox)
+            layout.addLayout(row)
+        
+        # Pasos válidos objetivo por partícula
+        steps_layout = QHBoxLayout()
+        self.steps_spinbox = QSpinBox()
+        self.steps_spinbox.setMinimum(1)
+        self.steps_spinbox.setMaximum(10000000)
+        self.steps_spinbox.setValue(max_steps)
+        self.steps_spinbox.valueChanged.connect(self.on_steps_changed)
+        steps_layout.addWidget(QLabel("Pasos válidos objetivo:"))
+        steps_layout.addWidget(self.steps_spinbox)
+        layout.addLayout(steps_layout)
+        
+        # Velocidad de animación (ms por intento del ensamble)
+        self.speed_label = QLabel("Velocidad de animación: 50 ms/paso")
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setMinimum(0)
+        self.speed_slider.setMaximum(500)
+        self.speed_slider.setValue(50)
+        self.speed_slider.setInvertedAppearance(True)
+        self.speed_slider.valueChanged.connect(self.on_speed_changed)
+        layout.addWidget(self.speed_label)
+        layout.addWidget(self.speed_slider)
+        
+        layout.addSpacing(10)
+        
+        buttons_layout = QHBoxLayout()
+        self.btn_start = QPushButton("▶ Iniciar")
+        self.btn_start.clicked.connect(self.start_simulation)
+        self.btn_pause = QPushButton("⏸ Pausar")
+        self.btn_pause.clicked.connect(self.pause_simulation)
+        self.btn_pause.setEnabled(False)
+        self.btn_reset = QPushButton("🔄 Reiniciar")
+        self.btn_reset.clicked.connect(self.reset_simulation)
+        for button in (self.btn_start, self.btn_pause, self.btn_reset):
+            button.setMinimumHeight(40)
+            buttons_layout.addWidget(button)
+        layout.addLayout(buttons_layout)
+        
+        group.setLayout(layout)
+        return group
+    
+    def create_stats_panel(self):
+        """Crea el panel de estadísticas del ensamble"""
+        group = QGroupBox("Estadísticas del Ensamble")
+        layout = QVBoxLayout()
+        
+        self.label_finished = QLabel("Partículas terminadas: 0")
+        self.label_mean_steps = QLabel("Pasos válidos medios: 0")
+        self.label_efficiency = QLabel("Eficiencia: 0%")
+        self.label_msd = QLabel("Desplazamiento cuadrático medio: 0")
+        self.label_objects = QLabel("Dibujo: -")
+        self.label_status = QLabel("Estado: Listo")
+        
+        for label in (self.label_finished, self.label_mean_steps, self.label_efficiency, self.label_msd):
+            label.setStyleSheet("font-size: 13px; padding: 5px;")
+            layout.addWidget(label)
+        self.label_objects.setStyleSheet("font-size: 11px; padding: 2px;")
+        layout.addWidget(self.label_objects)
+        layout.addSpacing(10)
+        self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #f0f0f0; border-radius: 5px;")
+        layout.addWidget(self.label_status)
+        
+        group.setLayout(layout)
+        return group
+    
+    def set_editable(self, editable):
+        """Habilita o deshabilita los parámetros que recrean el ensamble"""
+        for spinbox in (self.grid_width_spinbox, self.grid_height_spinbox, self.walkers_spinbox,
+                        self.trail_spinbox, self.step_size_spinbox):
+            spinbox.setEnabled(editable)
+    
+    def on_ensemble_changed(self, value):
+        """Callback cuando cambia un parámetro del ensamble: lo reemplaza por uno nuevo"""
+        if self.canvas.is_animating():
+            return
+        self.ensemble = EnsembleSimulator(self.grid_width_spinbox.value(), self.grid_height_spinbox.value(),
+                                          self.walkers_spinbox.value(),
+                                          step_size=self.step_size_spinbox.value(),
+                                          trail_length=self.trail_spinbox.value())
+        self.canvas.set_simulator(self.ensemble)
+        self.subscribe_ensemble()
+        self.reset_simulation()
+    
+    def on_steps_changed(self, value):
+        """Callback cuando cambia el número de pasos"""
+        self.ensemble.set_max_steps(value)
+        self._stats_dirty = True
+    
+    def on_speed_changed(self, value):
+        """Callback cuando cambia la velocidad"""
+        if value == 0:
+            self.speed_label.setText("Velocidad de animación: máxima")
+        else:
+            self.speed_label.setText(f"Velocidad de animación: {value} ms/paso")
+        self.canvas.set_animation_speed(value)
+    
+    def start_simulation(self):
+        """Inicia la simulación automática"""
+        self.ensemble.set_max_steps(self.steps_spinbox.value())
+        self.canvas.start_animation()
+        self.btn_start.setEnabled(False)
+        self.btn_pause.setEnabled(True)
+        self.set_editable(False)
+        self.label_status.setText("Estado: Simulando...")
+        self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #d4edda; color: #155724; border-radius: 5px;")
+    
+    def pause_simulation(self):
+        """Pausa la simulación"""
+        self.canvas.stop_animation()
+        self.btn_start.setEnabled(True)
+        self.btn_pause.setEnabled(False)
+        self.set_editable(True)
+        self.label_status.setText("Estado: Pausado")
+        self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #fff3cd; color: #856404; border-radius: 5px;")
+    
+    def reset_simulation(self):
+        """Reinicia todas las partículas al centro"""
+        self.canvas.stop_animation()
+        self.ensemble.reset()
+        self.ensemble.set_max_steps(self.steps_spinbox.value())
+        self.canvas.update()
+        self.update_stats()
+        
+        self.btn_start.setEnabled(True)
+        self.btn_pause.setEnabled(False)
+        self.set_editable(True)
+        self.label_status.setText("Estado: Listo")
+        self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #f0f0f0; border-radius: 5px;")
+    
+    def subscribe_ensemble(self):
+        """Suscribe la ventana a los eventos del ensamble actual"""
+        for event in STATS_EVENTS:
+            self.ensemble.events.subscribe(event, self.on_ensemble_event)
+    
+    def on_ensemble_event(self, payload):
+        """Marca las estadísticas como pendientes (se llama desde el hilo de simulación)"""
+        self._stats_dirty = True
+    
+    def flush_stats(self):
+        """Actualiza las estadísticas si hubo eventos desde el último refresco"""
+        if self._stats_dirty:
+            self.update_stats()
+    
+    def update_stats(self):
+        """Actualiza las estadísticas en la interfaz"""
+        self._stats_dirty = False
+        with self.canvas.worker.lock:
+            stats = self.ensemble.get_stats()
+        
+        self.label_finished.setText(f"Partículas terminadas: {stats['finished_walkers']} de {stats['n_walkers']}")
+        self.label_mean_steps.setText(
+            f"Pasos válidos medios: {stats['mean_valid_steps']:.1f} de {stats['max_steps']}")
+        self.label_efficiency.setText(f"Eficiencia: {stats['efficiency'] * 100:.1f}%")
+        self.label_msd.setText(f"Desplazamiento cuadrático medio: {stats['mean_squared_displacement']:.1f}")
+        self.label_objects.setText(
+            f"Dibujo: {self.canvas.frame_objects:,} elementos en {self.canvas.draw_calls} llamadas")
+        
+        if stats['is_finished']:
+            self.on_simulation_finished()
+    
+    def on_simulation_finished(self):
+        """Callback cuando todas las partículas alcanzan el objetivo"""
+        self.canvas.stop_animation()
+        self.btn_start.setEnabled(False)
+        self.btn_pause.setEnabled(False)
+        self.set_editable(True)
+        self.label_status.setText("Estado: ¡Todas las partículas terminaron!")
+        self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #cce5ff; color: #004085; border-radius: 5px;")
+    
+    def closeEvent(self, event):
+        """Detiene el hilo de simulación al cerrar la ventana"""
+        self.canvas.stop_animation()
+        self.stats_timer.stop()
+        super().closeEvent(event)
\ No newline at end of file
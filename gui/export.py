@@ -0,0 +1,321 @@
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import numpy as np
+from PyQt5.QtGui import QImage, QPainter
+from gui.scene import SceneDrawing, LOD_POINTS_PER_CELL
+from gui.png import PngWriter
+from models.occupancy import OccupancyGrid
+from models.rejections import RejectionLog
+from models.stream import TrajectoryReader
+
+# Lado en píxeles de cada tesela que se dibuja por separado
+EXPORT_TILE_SIZE = 512
+
+# Margen en píxeles alrededor del grid (y de los marcadores) en la imagen exportada
+EXPORT_MARGIN = 10
+
+# Lado mayor del grid por defecto (px) en la imagen exportada
+DEFAULT_EXPORT_SIZE = 4096
+
+# Posiciones que se leen de una vez al armar el conteo de una trayectoria en disco
+READ_CHUNK = 1 << 20
+
+class TileRenderer(SceneDrawing):
+    """Dibuja la caminata por teselas en imágenes fuera de pantalla"""
+    
+    def __init__(self, simulator, cell_size, tile_size=EXPORT_TILE_SIZE, path_index=None):
+        """
+        Prepara el dibujo de la imagen completa del grid
+        
+        Usa las mismas reglas que SimulationCanvas (SceneDrawing) con dos
+        diferencias para que las teselas empalmen: el camino se dibuja como
+        densidad o como segmentos según la imagen completa (no según cada
+        tesela), y la escala de la densidad es el máximo del grid.
+        
+        Args:
+            simulator: Simulator o TrajectoryScene a dibujar
+            cell_size: Píxeles por celda
+            tile_size: Lado de cada tesela en píxeles
+            path_index: PathTileIndex a reutilizar (p. ej. el del canvas)
+        """
+        self.init_scene(simulator, path_index)
+        self.cell_size = cell_size
+        self.tile_size = tile_size
+        # El margen incluye los marcadores de intentos inválidos, que apuntan un paso fuera del grid
+        self.margin = EXPORT_MARGIN + int(np.ceil(simulator.particle.step_size * cell_size))
+        self.image_width = int(np.ceil(simulator.grid_width * cell_size)) + 2 * self.margin
+        self.image_height = int(np.ceil(simulator.grid_height * cell_size)) + 2 * self.margin
+        self._tile = (0, 0, tile_size, tile_size)  # x, y, ancho, alto de la tesela actual
+        self._tops = {}  # nivel de la pirámide -> log1p del máximo de visitas
+        self.lod = self.use_level_of_detail()
+    
+    def width(self):
+        return self._tile[2]
+    
+    def height(self):
+        return self._tile[3]
+    
+    def grid_offset(self):
+        """Posición de la esquina del grid relativa a la tesela actual"""
+        return self.margin - self._tile[0], self.margin - self._tile[1]
+    
+    def use_level_of_detail(self, path_length=None):
+        """
+        Indica si el camino se dibuja como densidad en toda la imagen
+        
+        Mismo criterio de legibilidad que el canvas (LOD_POINTS_PER_CELL
+        posiciones por celda) evaluado en el grid completo; no aplica el
+        límite de segmentos por frame, que solo existe para la interacción.
+        """
+        particle = self.simulator.particle
+        if not particle.record_history:
+            return True
+        visits = len(self.simulator.get_path())
+        if path_length is not None:
+            visits = min(visits, path_length)
+        return visits > LOD_POINTS_PER_CELL * self.simulator.grid_width * self.simulator.grid_height
+    
+    def density_top(self, level, intensity):
+        """Escala común a todas las teselas: el máximo de visitas del nivel en el grid"""
+        if level not in self._tops:
+            self._tops[level] = float(np.log1p(self.simulator.occupancy.levels[level].max()))
+        return self._tops[level]
+    
+    def tiles(self):
+        """Retorna las teselas (x, y, ancho, alto) por filas, de arriba hacia abajo"""
+        return [(x, y, min(self.tile_size, self.image_width - x), min(self.tile_size, self.image_height - y))
+                for y in range(0, self.image_height, self.tile_size)
+                for x in range(0, self.image_width, self.tile_size)]
+    
+    def render_tile(self, x, y, width, height):
+        """
+        Dibuja una tesela
+        
+        Returns:
+            QImage (Format_RGB32) de width x height píxeles
+        """
+        self._tile = (x, y, width, height)
+        self.capture_frame()
+        image = QImage(width, height, QImage.Format_RGB32)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        offset_x, offset_y = self.grid_offset()
+        self.draw_background(painter, offset_x, offset_y)
+        if self.lod:
+            self.draw_density(painter, offset_x, offset_y)
+        else:
+            self.draw_path(painter, offset_x, offset_y)
+        self.draw_invalid_attempts(painter, offset_x, offset_y)
+        self.draw_particle(painter, offset_x, offset_y)
+        painter.end()
+        return image
+
+
+def image_to_rgb(image):
+    """Convierte una QImage Format_RGB32 en un arreglo uint8 (alto, ancho, 3)"""
+    width, height = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(image.bytesPerLine() * height)
+    pixels = np.frombuffer(bits, dtype=np.uint32).reshape(height, -1)[:, :width]
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    rgb[..., 0] = pixels >> 16
+    rgb[..., 1] = pixels >> 8
+    rgb[..., 2] = pixels
+    return rgb
+
+
+def export_png(simulator, path, cell_size, tile_size=EXPORT_TILE_SIZE, lock=None,
+               path_index=None, progress=None, cancel=None):
+    """
+    Exporta la caminata completa a un PNG, tesela por tesela
+    
+    Cada fila de teselas se dibuja, se convierte a RGB y se comprime antes
+    de pasar a la siguiente, así que la memoria es la de una franja de
+    tile_size filas del ancho de la imagen, sin importar su alto.
+    
+    Args:
+        simulator: Simulator o TrajectoryScene a dibujar
+        path: Archivo PNG de salida
+        cell_size: Píxeles por celda
+        tile_size: Lado de cada tesela en píxeles
+        lock: Lock que se toma mientras se dibuja cada tesela (p. ej. el
+              del worker, para no leer el simulador mientras avanza)
+        path_index: PathTileIndex a reutilizar
+        progress: Función opcional progress(teselas hechas, total)
+        cancel: threading.Event opcional; si se activa, se borra el archivo
+    
+    Returns:
+        True si la imagen se escribió completa, False si se canceló
+    """
+    if lock is None:
+        lock = contextlib.nullcontext()
+    with lock:
+        renderer = TileRenderer(simulator, cell_size, tile_size, path_index)
+    tiles = renderer.tiles()
+    
+    with PngWriter(path, renderer.image_width, renderer.image_height) as png:
+        strip = None
+        for done, (x, y, width, height) in enumerate(tiles, 1):
+            if cancel is not None and cancel.is_set():
+                png.abort()
+                return False
+            if x == 0:
+                strip = np.empty((height, renderer.image_width, 3), dtype=np.uint8)
+            with lock:
+                image = renderer.render_tile(x, y, width, height)
+            strip[:, x:x + width] = image_to_rgb(image)
+            if x + width == renderer.image_width:
+                png.write_rows(strip)
+            if progress is not None:
+                progress(done, len(tiles))
+    return True
+
+
+class TrajectoryScene:
+    """Trayectoria en disco con la interfaz de lectura de Simulator que usa el dibujo"""
+    
+    def __init__(self, reader):
+        """
+        Prepara una trayectoria escrita con Simulator.stream_to para dibujarla
+        
+        El camino se lee por memory-mapping; solo el conteo de visitas por
+        celda y los intentos inválidos agregados por celda del borde se
+        arman en memoria, recorriendo el archivo por bloques.
+        
+        Args:
+            reader: TrajectoryReader
+        """
+        self.reader = reader
+        self.grid_width = reader.grid_width
+        self.grid_height = reader.grid_height
+        self.occupancy = OccupancyGrid(reader.grid_width, reader.grid_height)
+        positions = reader.positions
+        for start in range(0, len(positions), READ_CHUNK):
+            chunk = np.asarray(positions[start:start + READ_CHUNK])
+            self.occupancy.record_batch(chunk[:, 0], chunk[:, 1], start)
+        self.particle = _TrajectoryParticle(reader)
+    
+    def get_path(self):
+        """Retorna el camino (arreglo mapeado del archivo)"""
+        return self.reader.positions
+
+
+class _TrajectoryParticle:
+    """Estado final de la partícula de una trayectoria en disco"""
+    
+    record_history = True
+    
+    def __init__(self, reader):
+        self.step_size = reader.step_size
+        self.valid_steps = reader.valid_steps
+        last = reader.positions[-1] if len(reader) else reader.start
+        self._position = (int(last[0]), int(last[1]))
+        
+        # Intentos inválidos agregados por celda y dirección, por bloques
+        self.rejections = RejectionLog()
+        for start in range(0, len(reader.invalid), READ_CHUNK):
+            records = np.asarray(reader.invalid[start:start + READ_CHUNK])
+            origin = np.asarray(reader.positions[records['step']], dtype=np.int64)
+            keys = np.stack([origin[:, 0], origin[:, 1], records['direction'].astype(np.int64)], axis=1)
+            unique, counts = np.unique(keys, axis=0, return_counts=True)
+            for (x, y, direction), count in zip(unique.tolist(), counts.tolist()):
+                self.rejections.record(x, y, direction, self.step_size, int(records['step'][-1]), count)
+    
+    def get_position(self):
+        return self._position
+
+
+class ImageExport:
+    """Exportación a PNG en un hilo propio, para no bloquear la interfaz"""
+    
+    def __init__(self, simulator, path, cell_size, lock=None, path_index=None):
+        """
+        Prepara la exportación (se inicia con start())
+        
+        Args:
+            simulator: Simulator a dibujar
+            path: Archivo PNG de salida
+            cell_size: Píxeles por celda
+            lock: Lock del worker de simulación (ver export_png)
+            path_index: PathTileIndex a reutilizar
+        """
+        self.simulator = simulator
+        self.path = path
+        self.cell_size = cell_size
+        self.lock = lock
+        self.path_index = path_index
+        self.done = 0        # Teselas dibujadas
+        self.total = 0       # Teselas de la imagen
+        self.error = None    # Excepción si la exportación falló
+        self.completed = False
+        self._cancel = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Inicia el hilo de exportación"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def cancel(self):
+        """Pide detener la exportación y espera a que termine"""
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def is_running(self):
+        """Retorna True si el hilo está activo"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _progress(self, done, total):
+        self.done, self.total = done, total
+    
+    def _run(self):
+        """Cuerpo del hilo"""
+        try:
+            self.completed = export_png(self.simulator, self.path, self.cell_size, lock=self.lock,
+                                        path_index=self.path_index, progress=self._progress,
+                                        cancel=self._cancel)
+        except Exception as error:
+            self.error = error
+
+
+def main(argv=None):
+    """Exporta a PNG una trayectoria escrita con --trajectory, sin interfaz gráfica"""
+    parser = argparse.ArgumentParser(
+        prog='python -m gui.export',
+        description='Exporta una trayectoria SWR en disco a un PNG de alta resolución'
+    )
+    parser.add_argument('trajectory', help='Ruta base de la trayectoria (sin .pos / .inv)')
+    parser.add_argument('output', help='Archivo PNG de salida')
+    parser.add_argument('--cell-size', type=float, default=None,
+                        help=f'Píxeles por celda (por defecto el lado mayor del grid mide {DEFAULT_EXPORT_SIZE} px)')
+    parser.add_argument('--tile-size', type=int, default=EXPORT_TILE_SIZE,
+                        help=f'Lado de cada tesela en píxeles ({EXPORT_TILE_SIZE})')
+    args = parser.parse_args(argv)
+    
+    # QPainter necesita una aplicación de Qt; sin pantalla se usa la plataforma offscreen
+    from PyQt5.QtGui import QGuiApplication
+    if QGuiApplication.instance() is None:
+        if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+            os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        app = QGuiApplication(sys.argv[:1])  # Debe existir mientras se dibuja
+    
+    scene = TrajectoryScene(TrajectoryReader(args.trajectory))
+    cell_size = args.cell_size
+    if cell_size is None:
+        cell_size = DEFAULT_EXPORT_SIZE / max(scene.grid_width, scene.grid_height)
+    
+    def progress(done, total):
+        sys.stderr.write(f"\rTeselas: {done}/{total}")
+        if done == total:
+            sys.stderr.write('\n')
+    
+    export_png(scene, args.output, cell_size, args.tile_size, progress=progress)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
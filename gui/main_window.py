@@ -1,8 +1,12 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QSpinBox, QSlider, QGroupBox, QFrame)
-from PyQt5.QtCore import Qt
+                             QPushButton, QLabel, QSpinBox, QSlider, QGroupBox, QFrame,
+                             QCheckBox, QComboBox, QFileDialog, QInputDialog)
+from PyQt5.QtCore import Qt, QTimer
 from models.simulator import Simulator
-from gui.canvas import SimulationCanvas
+from models.profiler import Profiler
+from gui.canvas import SimulationCanvas, MAX_CELL_SIZE, STATS_INTERVAL, STATS_EVENTS
+from gui.export import ImageExport, DEFAULT_EXPORT_SIZE
+from gui.ensemble_window import EnsembleWindow
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación"""
@@ -15,9 +19,30 @@ class MainWindow(QMainWindow):
         # Crear simulador
         self.simulator = Simulator(grid_width=40, grid_height=40, step_size=1)
         
+        # Instrumentación opcional (sin costo mientras está desactivada)
+        self.profiler = Profiler()
+        self.performance_timer = QTimer()
+        self.performance_timer.timeout.connect(self.update_performance)
+        
         # Crear interfaz
         self.init_ui()
         
+        # Los eventos del simulador solo marcan las estadísticas como
+        # pendientes; el timer las dibuja a lo sumo una vez por intervalo
+        self._stats_dirty = True
+        self.subscribe_simulator()
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.flush_stats)
+        self.stats_timer.start(STATS_INTERVAL)
+        
+        # Exportación a PNG en segundo plano (el timer consulta su progreso)
+        self.image_export = None
+        self.export_timer = QTimer()
+        self.export_timer.timeout.connect(self.update_export)
+        
+        # Ventana del ensamble en vivo (se crea al abrirla por primera vez)
+        self.ensemble_window = None
+        
     def init_ui(self):
         """Inicializa la interfaz de usuario"""
         # Widget central
@@ -58,10 +83,18 @@ class MainWindow(QMainWindow):
         control_panel = self.create_control_panel()
         layout.addWidget(control_panel)
         
+        # Línea de tiempo
+        timeline_panel = self.create_timeline_panel()
+        layout.addWidget(timeline_panel)
+        
         # Panel de estadísticas
         stats_panel = self.create_stats_panel()
         layout.addWidget(stats_panel)
         
+        # Panel de rendimiento
+        performance_panel = self.create_performance_panel()
+        layout.addWidget(performance_panel)
+        
         # Leyenda
         legend_panel = self.create_legend_panel()
         layout.addWidget(legend_panel)
@@ -75,12 +108,31 @@ class MainWindow(QMainWindow):
         group = QGroupBox("Controles")
         layout = QVBoxLayout()
         
+        # Tamaño del grid (cambiarlo crea una simulación nueva)
+        grid_layout = QHBoxLayout()
+        grid_label = QLabel("Tamaño del grid:")
+        self.grid_width_spinbox = QSpinBox()
+        self.grid_height_spinbox = QSpinBox()
+        for spinbox, value in ((self.grid_width_spinbox, self.simulator.grid_width),
+                               (self.grid_height_spinbox, self.simulator.grid_height)):
+            spinbox.setMinimum(2)
+            spinbox.setMaximum(10000)
+            spinbox.setValue(value)
+            spinbox.setKeyboardTracking(False)  # Recrear solo al confirmar el valor
+            spinbox.valueChanged.connect(self.on_grid_size_changed)
+        
+        grid_layout.addWidget(grid_label)
+        grid_layout.addWidget(self.grid_width_spinbox)
+        grid_layout.addWidget(QLabel("×"))
+        grid_layout.addWidget(self.grid_height_spinbox)
+        layout.addLayout(grid_layout)
+        
         # Número de pasos máximo
         steps_layout = QHBoxLayout()
         steps_label = QLabel("Pasos válidos objetivo:")
         self.steps_spinbox = QSpinBox()
         self.steps_spinbox.setMinimum(1)
-        self.steps_spinbox.setMaximum(1000)
+        self.steps_spinbox.setMaximum(10000000)
         self.steps_spinbox.setValue(500)
         self.steps_spinbox.valueChanged.connect(self.on_steps_changed)
         
@@ -101,20 +153,46 @@ class MainWindow(QMainWindow):
         step_size_layout.addWidget(self.step_size_spinbox)
         layout.addLayout(step_size_layout)
         
+        # Condición de término (además de los pasos objetivo)
+        until_layout = QHBoxLayout()
+        until_label = QLabel("Terminar en:")
+        self.until_combo = QComboBox()
+        self.until_combo.addItem("Pasos objetivo", None)
+        self.until_combo.addItem("Cobertura total", 'cover')
+        self.until_combo.addItem("Primer paso al borde", 'boundary')
+        self.until_combo.currentIndexChanged.connect(self.on_until_changed)
+        
+        until_layout.addWidget(until_label)
+        until_layout.addWidget(self.until_combo)
+        layout.addLayout(until_layout)
+        
         # Velocidad de animación
         speed_layout = QVBoxLayout()
-        speed_label = QLabel("Velocidad de animación:")
+        self.speed_label = QLabel("Velocidad de animación: 100 ms/paso")
         self.speed_slider = QSlider(Qt.Horizontal)
-        self.speed_slider.setMinimum(10)
+        self.speed_slider.setMinimum(0)
         self.speed_slider.setMaximum(500)
         self.speed_slider.setValue(100)
         self.speed_slider.setInvertedAppearance(True)
         self.speed_slider.valueChanged.connect(self.on_speed_changed)
         
-        speed_layout.addWidget(speed_label)
+        speed_layout.addWidget(self.speed_label)
         speed_layout.addWidget(self.speed_slider)
         layout.addLayout(speed_layout)
         
+        # Presupuesto de cómputo por ciclo en máxima velocidad
+        budget_layout = QHBoxLayout()
+        budget_label = QLabel("Presupuesto por ciclo (ms):")
+        self.budget_spinbox = QSpinBox()
+        self.budget_spinbox.setMinimum(1)
+        self.budget_spinbox.setMaximum(100)
+        self.budget_spinbox.setValue(10)
+        self.budget_spinbox.valueChanged.connect(self.on_budget_changed)
+        
+        budget_layout.addWidget(budget_label)
+        budget_layout.addWidget(self.budget_spinbox)
+        layout.addLayout(budget_layout)
+        
         # Separador
         layout.addSpacing(10)
         
@@ -148,13 +226,43 @@ class MainWindow(QMainWindow):
         row2.addWidget(self.btn_step)
         row2.addWidget(self.btn_reset)
         
+        # Tercera fila
+        self.btn_export = QPushButton("🖼 Exportar PNG...")
+        self.btn_export.clicked.connect(self.export_image)
+        self.btn_export.setMinimumHeight(40)
+        
+        # Cuarta fila: vista en vivo de muchas partículas (ventana aparte)
+        self.btn_ensemble = QPushButton("👥 Ensamble en vivo...")
+        self.btn_ensemble.clicked.connect(self.open_ensemble)
+        self.btn_ensemble.setMinimumHeight(40)
+        
         buttons_layout.addLayout(row1)
         buttons_layout.addLayout(row2)
+        buttons_layout.addWidget(self.btn_export)
+        buttons_layout.addWidget(self.btn_ensemble)
         layout.addLayout(buttons_layout)
         
         group.setLayout(layout)
         return group
     
+    def create_timeline_panel(self):
+        """Crea el panel de la línea de tiempo para revisar pasos anteriores"""
+        group = QGroupBox("Línea de tiempo")
+        layout = QVBoxLayout()
+        
+        self.timeline_label = QLabel("Paso 0 de 0")
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setMinimum(0)
+        self.timeline_slider.setMaximum(0)
+        self.timeline_slider.setEnabled(False)
+        self.timeline_slider.valueChanged.connect(self.on_timeline_changed)
+        
+        layout.addWidget(self.timeline_label)
+        layout.addWidget(self.timeline_slider)
+        
+        group.setLayout(layout)
+        return group
+    
     def create_stats_panel(self):
         """Crea el panel de estadísticas"""
         group = QGroupBox("Estadísticas en Tiempo Real")
@@ -165,6 +273,10 @@ class MainWindow(QMainWindow):
         self.label_total_attempts = QLabel("Total intentos: 0")
         self.label_efficiency = QLabel("Eficiencia: 0%")
         self.label_max_steps = QLabel("Objetivo: 500")
+        self.label_msd = QLabel("Desplazamiento cuadrático (promedio temporal): 0")
+        self.label_gyration = QLabel("Radio de giro: 0")
+        self.label_excursion = QLabel("Excursión máxima: 0")
+        self.label_coverage = QLabel("Cobertura: 0%")
         self.label_status = QLabel("Estado: Listo")
         
         self.label_valid_steps.setStyleSheet("font-size: 13px; padding: 5px; color: green; font-weight: bold;")
@@ -172,6 +284,8 @@ class MainWindow(QMainWindow):
         self.label_total_attempts.setStyleSheet("font-size: 13px; padding: 5px;")
         self.label_efficiency.setStyleSheet("font-size: 13px; padding: 5px; color: blue;")
         self.label_max_steps.setStyleSheet("font-size: 13px; padding: 5px;")
+        for label in (self.label_msd, self.label_gyration, self.label_excursion, self.label_coverage):
+            label.setStyleSheet("font-size: 12px; padding: 3px;")
         self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #f0f0f0; border-radius: 5px;")
         
         layout.addWidget(self.label_valid_steps)
@@ -179,12 +293,40 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.label_total_attempts)
         layout.addWidget(self.label_efficiency)
         layout.addWidget(self.label_max_steps)
+        layout.addWidget(self.label_msd)
+        layout.addWidget(self.label_gyration)
+        layout.addWidget(self.label_excursion)
+        layout.addWidget(self.label_coverage)
         layout.addSpacing(10)
         layout.addWidget(self.label_status)
         
         group.setLayout(layout)
         return group
     
+    def create_performance_panel(self):
+        """Crea el panel de rendimiento (tiempos por fase y memoria)"""
+        group = QGroupBox("Rendimiento")
+        layout = QVBoxLayout()
+        
+        self.profile_checkbox = QCheckBox("Medir rendimiento")
+        self.profile_checkbox.toggled.connect(self.on_profiling_toggled)
+        layout.addWidget(self.profile_checkbox)
+        
+        self.label_steps_per_second = QLabel("Pasos/s: -")
+        self.label_simulation_time = QLabel("Simulación: -")
+        self.label_paint_time = QLabel("Dibujo: -")
+        self.label_stats_time = QLabel("Estadísticas: -")
+        self.label_objects = QLabel("Elementos por frame: -")
+        self.label_memory = QLabel("Memoria: -")
+        
+        for label in (self.label_steps_per_second, self.label_simulation_time, self.label_paint_time,
+                      self.label_stats_time, self.label_objects, self.label_memory):
+            label.setStyleSheet("font-size: 11px; padding: 2px;")
+            layout.addWidget(label)
+        
+        group.setLayout(layout)
+        return group
+    
     def create_legend_panel(self):
         """Crea el panel de leyenda"""
         group = QGroupBox("Leyenda")
@@ -213,15 +355,107 @@ class MainWindow(QMainWindow):
     def on_step_size_changed(self, value):
         """Callback cuando cambia el tamaño del paso"""
         # Solo permitir cambiar si la simulación no está corriendo
-        if not self.canvas.timer.isActive():
-            self.simulator.step_size = value
-            self.simulator.particle.step_size = value
+        if not self.canvas.is_animating():
+            self.simulator.set_step_size(value)
             self.canvas.update()
     
+    def on_grid_size_changed(self, value):
+        """Callback cuando cambia el tamaño del grid: reemplaza el simulador"""
+        if self.canvas.is_animating():
+            return
+        self.simulator = Simulator(grid_width=self.grid_width_spinbox.value(),
+                                   grid_height=self.grid_height_spinbox.value(),
+                                   step_size=self.step_size_spinbox.value())
+        self.canvas.set_simulator(self.simulator)
+        self.subscribe_simulator()
+        self.on_until_changed(self.until_combo.currentIndex())
+        if self.profile_checkbox.isChecked():
+            self.on_profiling_toggled(True)
+        self.reset_simulation()
+    
+    def on_until_changed(self, index):
+        """Callback cuando cambia la condición de término"""
+        self.simulator.clear_stop_conditions()
+        condition = self.until_combo.itemData(index)
+        if condition is not None:
+            self.simulator.add_stop_condition(condition)
+        if self.simulator.is_finished:
+            self.on_simulation_finished()
+    
     def on_speed_changed(self, value):
         """Callback cuando cambia la velocidad"""
+        if value == 0:
+            self.speed_label.setText("Velocidad de animación: máxima")
+        else:
+            self.speed_label.setText(f"Velocidad de animación: {value} ms/paso")
         self.canvas.set_animation_speed(value)
     
+    def on_budget_changed(self, value):
+        """Callback cuando cambia el presupuesto de cómputo por ciclo"""
+        self.canvas.set_time_budget(value)
+    
+    def on_timeline_changed(self, value):
+        """Callback cuando se mueve la línea de tiempo"""
+        valid_steps = self.simulator.particle.valid_steps
+        if value >= valid_steps:
+            # Al final de la línea se vuelve a mostrar el estado actual
+            self.canvas.set_view_step(None)
+            self.timeline_label.setText(f"Paso {valid_steps} de {valid_steps}")
+            return
+        
+        self.canvas.set_view_step(value)
+        state = self.canvas.view_state
+        self.timeline_label.setText(
+            f"Paso {value} de {valid_steps} · inválidos: {state['invalid_steps']}")
+    
+    def update_timeline(self):
+        """Ajusta la línea de tiempo a los pasos dados (solo sin animación)"""
+        valid_steps = self.simulator.particle.valid_steps
+        animating = self.canvas.is_animating()
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setMaximum(valid_steps)
+        self.timeline_slider.setValue(valid_steps)
+        self.timeline_slider.blockSignals(False)
+        self.timeline_slider.setEnabled(not animating and valid_steps > 0)
+        self.timeline_label.setText(f"Paso {valid_steps} de {valid_steps}")
+        self.canvas.set_view_step(None)
+    
+    def on_profiling_toggled(self, enabled):
+        """Activa o desactiva la instrumentación del simulador, el canvas y las estadísticas"""
+        self.profiler.remove()
+        self.profiler.reset()
+        if enabled:
+            self.profiler.instrument_simulator(self.simulator)
+            self.canvas.instrument(self.profiler)
+            self.profiler.instrument(self, 'update_stats')
+            self.performance_timer.start(500)
+            self.update_performance()
+        else:
+            self.performance_timer.stop()
+    
+    def update_performance(self):
+        """Actualiza el panel de rendimiento (promedios desde que se activó la medición)"""
+        with self.canvas.worker.lock:
+            stats = self.profiler.get_stats()
+            memory = self.simulator.memory_usage()
+        
+        simulation_ms = stats.get('step_ms_total', 0.0) + stats.get('run_batch_ms_total', 0.0)
+        simulation_calls = stats.get('step_calls', 0) + stats.get('run_batch_calls', 0)
+        paint_calls = stats.get('paint_calls', 0)
+        
+        self.label_steps_per_second.setText(f"Pasos/s: {stats['steps_per_second']:,.0f}")
+        self.label_simulation_time.setText(
+            f"Simulación: {simulation_ms / max(simulation_calls, 1):.3f} ms/llamada")
+        self.label_paint_time.setText(
+            f"Dibujo: {stats.get('paint_ms_mean', 0.0):.2f} ms/frame "
+            f"(máx {stats.get('paint_ms_max', 0.0):.1f})")
+        self.label_stats_time.setText(f"Estadísticas: {stats.get('update_stats_ms_mean', 0.0):.3f} ms")
+        self.label_objects.setText(
+            f"Elementos por frame: {stats.get('objects_drawn', 0) / max(paint_calls, 1):.0f}")
+        self.label_memory.setText(
+            f"Memoria: camino {memory['path_bytes'] / 1024:,.0f} KiB · "
+            f"inválidos {memory['invalid_bytes'] / 1024:,.0f} KiB")
+    
     def start_simulation(self):
         """Inicia la simulación automática"""
         self.simulator.set_max_steps(self.steps_spinbox.value())
@@ -230,11 +464,12 @@ class MainWindow(QMainWindow):
         self.btn_pause.setEnabled(True)
         self.btn_step.setEnabled(False)
         self.step_size_spinbox.setEnabled(False)  # Deshabilitar durante simulación
+        self.grid_width_spinbox.setEnabled(False)
+        self.grid_height_spinbox.setEnabled(False)
+        self.until_combo.setEnabled(False)
+        self.update_timeline()
         self.label_status.setText("Estado: Simulando...")
         self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #d4edda; color: #155724; border-radius: 5px;")
-        
-        # Conectar actualización de estadísticas
-        self.canvas.timer.timeout.connect(self.update_stats)
     
     def pause_simulation(self):
         """Pausa la simulación"""
@@ -243,6 +478,10 @@ class MainWindow(QMainWindow):
         self.btn_pause.setEnabled(False)
         self.btn_step.setEnabled(True)
         self.step_size_spinbox.setEnabled(True)  # Habilitar cuando pausa
+        self.grid_width_spinbox.setEnabled(True)
+        self.grid_height_spinbox.setEnabled(True)
+        self.until_combo.setEnabled(True)
+        self.update_timeline()
         self.label_status.setText("Estado: Pausado")
         self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #fff3cd; color: #856404; border-radius: 5px;")
     
@@ -251,6 +490,7 @@ class MainWindow(QMainWindow):
         result = self.simulator.step()
         self.canvas.update()
         self.update_stats()
+        self.update_timeline()
         
         if result['finished']:
             self.on_simulation_finished()
@@ -260,19 +500,40 @@ class MainWindow(QMainWindow):
         self.canvas.stop_animation()
         self.simulator.reset()
         self.simulator.set_max_steps(self.steps_spinbox.value())
+        self.canvas.invalidate_buffer()
         self.canvas.update()
         self.update_stats()
+        self.update_timeline()
         
         self.btn_start.setEnabled(True)
         self.btn_pause.setEnabled(False)
         self.btn_step.setEnabled(True)
         self.step_size_spinbox.setEnabled(True)  # Habilitar cuando reinicia
+        self.grid_width_spinbox.setEnabled(True)
+        self.grid_height_spinbox.setEnabled(True)
+        self.until_combo.setEnabled(True)
         self.label_status.setText("Estado: Listo")
         self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #f0f0f0; border-radius: 5px;")
     
+    def subscribe_simulator(self):
+        """Suscribe la ventana a los eventos del simulador actual (una sola vez por evento)"""
+        for event in STATS_EVENTS:
+            self.simulator.events.subscribe(event, self.on_simulator_event)
+    
+    def on_simulator_event(self, payload):
+        """Marca las estadísticas como pendientes (se llama desde el hilo de simulación)"""
+        self._stats_dirty = True
+    
+    def flush_stats(self):
+        """Actualiza las estadísticas si hubo eventos desde el último refresco"""
+        if self._stats_dirty:
+            self.update_stats()
+    
     def update_stats(self):
         """Actualiza las estadísticas en la interfaz"""
-        stats = self.simulator.get_stats()
+        self._stats_dirty = False
+        with self.canvas.worker.lock:
+            stats = self.simulator.get_stats()
         
         self.label_valid_steps.setText(f"✓ Pasos válidos: {stats['valid_steps']}")
         self.label_invalid_steps.setText(f"✗ Pasos inválidos: {stats['invalid_steps']}")
@@ -286,9 +547,99 @@ class MainWindow(QMainWindow):
         else:
             self.label_efficiency.setText("Eficiencia: 0%")
         
+        # Observables calculados en línea (sin recorrer el camino)
+        if 'time_averaged_squared_displacement' in stats:
+            self.label_msd.setText("Desplazamiento cuadrático (promedio temporal): "
+                                   f"{stats['time_averaged_squared_displacement']:.1f}")
+        if 'radius_of_gyration' in stats:
+            self.label_gyration.setText(f"Radio de giro: {stats['radius_of_gyration']:.2f}")
+        if 'max_excursion' in stats:
+            self.label_excursion.setText(f"Excursión máxima: {stats['max_excursion']:.2f}")
+        if 'coverage' in stats:
+            self.label_coverage.setText(f"Cobertura: {stats['coverage'] * 100:.1f}%")
+        
         if stats['is_finished']:
             self.on_simulation_finished()
     
+    def export_image(self):
+        """Exporta la caminata completa a un PNG en segundo plano"""
+        if self.image_export is not None and self.image_export.is_running():
+            return
+        if self.canvas.is_animating():
+            self.pause_simulation()
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar imagen", "swr.png", "Imágenes PNG (*.png)")
+        if not path:
+            return
+        grid_side = max(self.simulator.grid_width, self.simulator.grid_height)
+        default = min(max(DEFAULT_EXPORT_SIZE / grid_side, 0.05), MAX_CELL_SIZE)
+        cell_size, ok = QInputDialog.getDouble(self, "Exportar imagen", "Píxeles por celda:",
+                                               default, 0.05, MAX_CELL_SIZE, 2)
+        if not ok:
+            return
+        
+        # La simulación no avanza mientras se exporta (la vista sí se puede mover)
+        self.btn_start.setEnabled(False)
+        self.btn_step.setEnabled(False)
+        self.btn_reset.setEnabled(False)
+        self.btn_export.setEnabled(False)
+        self.step_size_spinbox.setEnabled(False)
+        self.grid_width_spinbox.setEnabled(False)
+        self.grid_height_spinbox.setEnabled(False)
+        self.until_combo.setEnabled(False)
+        self.image_export = ImageExport(self.simulator, path, cell_size, lock=self.canvas.worker.lock,
+                                        path_index=self.canvas.path_index)
+        self.image_export.start()
+        self.export_timer.start(100)
+        self.update_export()
+    
+    def update_export(self):
+        """Muestra el progreso de la exportación y restaura los controles al terminar"""
+        export = self.image_export
+        if export.is_running():
+            percent = 100 * export.done / export.total if export.total else 0
+            self.label_status.setText(f"Estado: Exportando imagen... {percent:.0f}%")
+            return
+        
+        self.export_timer.stop()
+        finished = self.simulator.is_finished
+        self.btn_start.setEnabled(not finished)
+        self.btn_step.setEnabled(not finished)
+        self.btn_reset.setEnabled(True)
+        self.btn_export.setEnabled(True)
+        self.step_size_spinbox.setEnabled(True)
+        self.grid_width_spinbox.setEnabled(True)
+        self.grid_height_spinbox.setEnabled(True)
+        self.until_combo.setEnabled(True)
+        if export.error is not None:
+            self.label_status.setText(f"Estado: Error al exportar: {export.error}")
+        elif export.completed:
+            self.label_status.setText(f"Estado: Imagen exportada ({export.path})")
+        else:
+            self.label_status.setText("Estado: Exportación cancelada")
+    
+    def open_ensemble(self):
+        """Abre la vista en vivo de un ensamble con el grid, el paso y el objetivo actuales"""
+        if self.ensemble_window is None:
+            self.ensemble_window = EnsembleWindow(self.grid_width_spinbox.value(),
+                                                  self.grid_height_spinbox.value(),
+                                                  self.step_size_spinbox.value(),
+                                                  self.steps_spinbox.value())
+        self.ensemble_window.show()
+        self.ensemble_window.raise_()
+        self.ensemble_window.activateWindow()
+    
+    def closeEvent(self, event):
+        """Detiene los hilos de simulación y de exportación al cerrar la ventana"""
+        self.canvas.stop_animation()
+        if self.ensemble_window is not None:
+            self.ensemble_window.close()
+        if self.image_export is not None and self.image_export.is_running():
+            self.image_export.cancel()
+        self.export_timer.stop()
+        self.performance_timer.stop()
+        self.stats_timer.stop()
+        super().closeEvent(event)
+    
     def on_simulation_finished(self):
         """Callback cuando la simulación termina"""
         self.canvas.stop_animation()
@@ -296,6 +647,15 @@ class MainWindow(QMainWindow):
         self.btn_pause.setEnabled(False)
         self.btn_step.setEnabled(False)
         self.step_size_spinbox.setEnabled(True)  # Habilitar cuando termina
-        
-        self.label_status.setText("Estado: ¡Simulación completada!")
+        self.grid_width_spinbox.setEnabled(True)
+        self.grid_height_spinbox.setEnabled(True)
+        self.until_combo.setEnabled(True)
+        self.update_timeline()
+        
+        if self.simulator.stop_reason == 'cover':
+            self.label_status.setText(f"Estado: ¡Grid cubierto en {self.simulator.stop_step} pasos!")
+        elif self.simulator.stop_reason == 'boundary':
+            self.label_status.setText(f"Estado: ¡Borde alcanzado en {self.simulator.stop_step} pasos!")
+        else:
+            self.label_status.setText("Estado: ¡Simulación completada!")
         self.label_status.setStyleSheet("font-size: 14px; padding: 8px; font-weight: bold; background-color: #cce5ff; color: #004085; border-radius: 5px;")
\ No newline at end of file
@@ -0,0 +1,107 @@
+import os
+import struct
+import zlib
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes comprimidos que se acumulan antes de escribir un chunk IDAT
+IDAT_SIZE = 1 << 20
+
+class PngWriter:
+    """Escribe un PNG RGB de 8 bits por filas, sin tener la imagen completa en memoria"""
+    
+    def __init__(self, path, width, height, level=6):
+        """
+        Crea el archivo y escribe la cabecera
+        
+        Las filas se comprimen a medida que llegan (zlib en modo streaming),
+        así que la memoria depende del bloque de filas que se escribe y no
+        del tamaño de la imagen.
+        
+        Args:
+            path: Archivo de salida
+            width: Ancho en píxeles
+            height: Alto en píxeles
+            level: Nivel de compresión de zlib (0-9)
+        """
+        if width <= 0 or height <= 0 or width >= 2 ** 31 or height >= 2 ** 31:
+            raise ValueError(f"Tamaño de imagen no válido: {width} x {height}")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+        self._file = open(path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        # Profundidad 8, color RGB (2), compresión 0, filtro 0, sin entrelazado
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    
+    def _write_chunk(self, kind, data):
+        """Escribe un chunk (largo, tipo, datos, CRC)"""
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+    
+    def _queue(self, data):
+        """Acumula datos comprimidos y los escribe en chunks IDAT de ~IDAT_SIZE bytes"""
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= IDAT_SIZE:
+            self._write_chunk(b'IDAT', b''.join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+    
+    def write_rows(self, rows):
+        """
+        Agrega filas a la imagen
+        
+        Args:
+            rows: Arreglo uint8 (n, width, 3) con las filas siguientes, de arriba hacia abajo
+        """
+        rows = np.asarray(rows, dtype=np.uint8)
+        if rows.ndim != 3 or rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"Se esperaban filas de {self.width} x 3, no {rows.shape[1:]}")
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("Se escribieron más filas que el alto de la imagen")
+        # Cada fila empieza con el tipo de filtro (0 = ninguno)
+        data = np.zeros((len(rows), 1 + 3 * self.width), dtype=np.uint8)
+        data[:, 1:] = rows.reshape(len(rows), -1)
+        self._queue(self._compressor.compress(data.tobytes()))
+        self.rows_written += len(rows)
+    
+    def close(self):
+        """Termina el flujo comprimido y cierra el archivo"""
+        if self._file is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"Se escribieron {self.rows_written} de {self.height} filas")
+            self._pending.append(self._compressor.flush())
+            self._write_chunk(b'IDAT', b''.join(self._pending))
+            self._pending = []
+            self._write_chunk(b'IEND', b'')
+        finally:
+            self._file.close()
+            self._file = None
+    
+    def abort(self):
+        """Cierra y borra el archivo incompleto"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
\ No newline at end of file
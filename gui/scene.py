@@ -0,0 +1,398 @@
+import math
+from PyQt5.QtCore import Qt, QRectF, QLineF
+from PyQt5.QtGui import QPen, QBrush, QColor, QImage
+import numpy as np
+from models.spatial import PathTileIndex
+
+# Con más posiciones por celda visible que esto, el camino se dibuja como mapa de densidad
+LOD_POINTS_PER_CELL = 2
+
+# Con más segmentos visibles que esto, el camino también se dibuja como densidad
+MAX_PATH_SEGMENTS = 20000
+
+# Niveles de intensidad con que se agrupan los marcadores de intentos inválidos
+INVALID_MARKER_LEVELS = 4
+
+# Separación mínima en píxeles entre líneas del grid para dibujarlas
+MIN_GRID_SPACING = 6
+
+# Celdas extra alrededor de la vista al recortar el camino (cubre el tamaño de paso máximo)
+PATH_CULL_MARGIN = 5
+
+# Con más posiciones que esto, el recorte del camino usa el índice espacial
+PATH_INDEX_THRESHOLD = 4096
+
+# Tamaño máximo en pantalla (px) de un bloque del mapa de densidad
+DENSITY_BLOCK_PIXELS = 2
+
+class SceneDrawing:
+    """
+    Reglas de dibujo de la caminata, compartidas por el canvas y la exportación
+    
+    Quien la use define width(), height() (tamaño en píxeles de lo que se
+    dibuja), grid_offset() (posición en píxeles de la esquina del grid) y
+    cell_size, llama a init_scene() una vez y a capture_frame() antes de
+    cada frame.
+    """
+    
+    def init_scene(self, simulator, path_index=None):
+        """
+        Asocia el simulador a dibujar y crea las cachés de dibujo
+        
+        Args:
+            simulator: Simulator (o un objeto con la misma interfaz de lectura)
+            path_index: PathTileIndex a reutilizar (None = uno nuevo)
+        """
+        self.simulator = simulator
+        self.frame = None  # Estado del simulador que lee el frame actual (ver capture_frame)
+        
+        # Índice espacial del camino para recortar lo que queda fuera de la vista
+        if path_index is None:
+            path_index = PathTileIndex(simulator.grid_width, simulator.grid_height)
+        self.path_index = path_index
+        
+        # Mapa de densidad cacheado (nivel de detalle para caminos largos)
+        self._density_pixels = None
+        self._density_image = None
+        self._density_key = None
+        
+        # Visitas por bloque hasta _prefix_step (caché incremental de prefix_counts)
+        self._prefix_counts = None
+        self._prefix_key = None
+        self._prefix_step = -1
+    
+    def capture_frame(self):
+        """
+        Copia del simulador lo que leen los métodos draw_* en un frame
+        
+        Se llama con el simulador quieto (p. ej. con el lock del worker
+        tomado); el dibujo posterior no necesita detener la simulación. El
+        camino es una vista que no cambia aunque la corrida siga (ver
+        Trajectory.view) y los marcadores de intentos inválidos se copian.
+        Los conteos de visitas se leen al dibujar la densidad.
+        
+        Returns:
+            dict con 'path', 'position', 'valid_steps', 'step_size',
+            'record_history' y 'markers'
+        """
+        particle = self.simulator.particle
+        self.frame = {
+            'path': self.simulator.get_path(),
+            'position': particle.get_position(),
+            'valid_steps': particle.valid_steps,
+            'step_size': particle.step_size,
+            'record_history': particle.record_history,
+            'markers': particle.rejections.markers()
+        }
+        return self.frame
+    
+    def density_top(self, level, intensity):
+        """
+        Retorna la intensidad (log1p de visitas) que corresponde al azul más oscuro
+        
+        En pantalla es el máximo de la región dibujada; la exportación por
+        teselas usa el máximo del grid para que todas compartan la escala.
+        """
+        return intensity.max()
+    
+    def visible_cells(self, margin=0):
+        """
+        Retorna el rectángulo de celdas visibles (x0, y0, x1, y1), extremos x1, y1 excluidos
+        
+        Args:
+            margin: Celdas extra a incluir alrededor de la vista
+        """
+        offset_x, offset_y = self.grid_offset()
+        x0 = max(int(-offset_x // self.cell_size) - margin, 0)
+        y0 = max(int(-offset_y // self.cell_size) - margin, 0)
+        x1 = min(int(-(-(self.width() - offset_x) // self.cell_size)) + margin, self.simulator.grid_width)
+        y1 = min(int(-(-(self.height() - offset_y) // self.cell_size)) + margin, self.simulator.grid_height)
+        return x0, y0, max(x1, x0), max(y1, y0)
+    
+    def use_level_of_detail(self, path_length=None):
+        """
+        Indica si el camino debe dibujarse agregado por celda
+        
+        Cuando hay más posiciones visibles que celdas visibles (por
+        LOD_POINTS_PER_CELL) o más de MAX_PATH_SEGMENTS, casi todos los
+        segmentos se dibujarían sobre los mismos píxeles. Las visitas de la
+        vista se estiman con la pirámide de conteos, sin recorrer el camino.
+        
+        Args:
+            path_length: Posiciones a dibujar (None = todo el camino)
+        """
+        if not self.simulator.particle.record_history:
+            return True  # El camino no está en memoria: solo hay conteo de visitas
+        x0, y0, x1, y1 = self.visible_cells()
+        visits = self.simulator.occupancy.region_visits(x0, y0, x1, y1)
+        if path_length is not None:
+            visits = min(visits, path_length)
+        cells = (x1 - x0) * (y1 - y0)
+        return visits > min(LOD_POINTS_PER_CELL * cells, MAX_PATH_SEGMENTS)
+    
+    def draw_background(self, painter, offset_x, offset_y):
+        """Dibuja el fondo blanco, el fondo del grid y el grid"""
+        painter.fillRect(0, 0, self.width(), self.height(), QColor(255, 255, 255))
+        painter.fillRect(QRectF(offset_x, offset_y,
+                                self.simulator.grid_width * self.cell_size,
+                                self.simulator.grid_height * self.cell_size), QColor(250, 250, 250))
+        self.draw_grid(painter, offset_x, offset_y)
+    
+    def draw_grid(self, painter, offset_x, offset_y):
+        """Dibuja el grid de fondo (solo las líneas visibles y si hay zoom suficiente)"""
+        cell = self.cell_size
+        if cell >= MIN_GRID_SPACING:
+            x0, y0, x1, y1 = self.visible_cells()
+            top, bottom = offset_y + y0 * cell, offset_y + y1 * cell
+            left, right = offset_x + x0 * cell, offset_x + x1 * cell
+            # Redondeo hacia arriba en los empates (no al par, como round) para
+            # que las líneas no se muevan al desplazar la vista píxeles enteros
+            xs = [math.floor(offset_x + i * cell + 0.5) for i in range(x0, x1 + 1)]
+            ys = [math.floor(offset_y + i * cell + 0.5) for i in range(y0, y1 + 1)]
+            lines = [QLineF(x, top, x, bottom) for x in xs]
+            lines += [QLineF(left, y, right, y) for y in ys]
+            painter.setPen(QPen(QColor(200, 200, 200), 1))
+            painter.drawLines(lines)
+        
+        # Dibujar borde del grid más grueso
+        painter.setPen(QPen(QColor(100, 100, 100), 3))
+        painter.drawRect(QRectF(offset_x, offset_y,
+                                self.simulator.grid_width * cell,
+                                self.simulator.grid_height * cell))
+    
+    def draw_path(self, painter, offset_x, offset_y, first=0, last=None):
+        """
+        Dibuja el camino recorrido entre las posiciones first y last, recortado a la vista
+        
+        Solo se dibujan los segmentos con algún extremo visible. En tramos
+        largos las posiciones visibles se obtienen del índice espacial, así
+        que el costo depende de lo que se ve y no del largo del camino.
+        
+        Returns:
+            Número de segmentos dibujados
+        """
+        path = self.frame['path']
+        last = len(path) if last is None else min(last, len(path))
+        if last - first < 2:
+            return 0
+        
+        margin = max(PATH_CULL_MARGIN, self.frame['step_size'])
+        x0, y0, x1, y1 = self.visible_cells(margin)
+        if last - first > PATH_INDEX_THRESHOLD:
+            self.path_index.update(path)
+            steps = self.path_index.query(x0, y0, x1, y1)
+            steps = steps[(steps >= first) & (steps < last)]
+        else:
+            steps = np.arange(first, last)
+        xs, ys = path[steps, 0], path[steps, 1]
+        steps = steps[(xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)]
+        
+        # Segmento s -> s + 1 con algún extremo visible
+        starts = np.union1d(steps, steps - 1)
+        starts = starts[(starts >= first) & (starts < last - 1)]
+        if len(starts) == 0:
+            return 0
+        
+        # Coordenadas de pantalla calculadas de una vez, solo para los extremos usados
+        cell = self.cell_size
+        points = np.union1d(starts, starts + 1)
+        px = (offset_x + (path[points, 0].astype(np.float64) + 0.5) * cell).tolist()
+        py = (offset_y + (path[points, 1].astype(np.float64) + 0.5) * cell).tolist()
+        
+        # Dibujar líneas conectando el camino (starts + 1 sigue a starts en points)
+        painter.setPen(QPen(QColor(100, 150, 255), 2, Qt.SolidLine))
+        painter.drawLines([QLineF(px[i], py[i], px[i + 1], py[i + 1])
+                           for i in np.searchsorted(points, starts).tolist()])
+        
+        # Dibujar puntos visitados con transparencia para ver superposiciones (SWR)
+        radius = cell / 4
+        if radius >= 1:
+            painter.setBrush(QBrush(QColor(150, 200, 255, 150)))
+            painter.setPen(QPen(QColor(50, 100, 200), 1))
+            dots = steps[steps < last - 1]  # Todos excepto la posición actual
+            for i in np.searchsorted(points, dots).tolist():
+                painter.drawEllipse(QRectF(px[i] - radius, py[i] - radius, 2 * radius, 2 * radius))
+        
+        return len(starts)
+    
+    def draw_density(self, painter, offset_x, offset_y, step=None):
+        """
+        Dibuja el camino agregado por bloque a partir del conteo de visitas
+        
+        Se usa el nivel de la pirámide de conteos cuyos bloques ocupan a lo
+        sumo DENSITY_BLOCK_PIXELS en pantalla y solo la región visible, así
+        que el costo depende del tamaño de la vista, no del grid ni del
+        número de pasos.
+        
+        Args:
+            step: Dibujar las visitas hasta este paso válido (None = conteo actual)
+        """
+        occupancy = self.simulator.occupancy
+        x0, y0, x1, y1 = self.visible_cells()
+        if x1 <= x0 or y1 <= y0:
+            return
+        level = occupancy.level_for(DENSITY_BLOCK_PIXELS / self.cell_size)
+        bounds = occupancy.region_bounds(level, x0, y0, x1, y1)
+        if step is None:
+            cache_key = (self.frame['valid_steps'], level, bounds)
+        else:
+            cache_key = ('view', step, level, bounds)
+        
+        if self._density_key != cache_key or self._density_image is None:
+            if step is None:
+                counts = occupancy.region_counts(level, x0, y0, x1, y1)
+            else:
+                counts = self.prefix_counts(step, level, bounds)
+            counts = counts.T  # Filas = y, columnas = x
+            visited = counts > 0
+            intensity = np.log1p(counts.astype(np.float64))
+            top = self.density_top(level, intensity)
+            t = intensity / top if top > 0 else intensity
+            
+            # Celeste claro (pocas visitas) a azul oscuro (muchas visitas)
+            r = (150 - 100 * t).astype(np.uint32)
+            g = (200 - 100 * t).astype(np.uint32)
+            b = (255 - 55 * t).astype(np.uint32)
+            a = np.where(visited, 110 + 145 * t, 0).astype(np.uint32)
+            self._density_pixels = np.ascontiguousarray((a << 24) | (r << 16) | (g << 8) | b)
+            
+            h, w = self._density_pixels.shape
+            self._density_image = QImage(self._density_pixels.data, w, h, w * 4, QImage.Format_ARGB32)
+            self._density_key = cache_key
+        
+        # Los bloques del borde pueden exceder el grid: se recorta al grid
+        block = occupancy.factors[level] * self.cell_size
+        bx0, by0, bx1, by1 = bounds
+        target = QRectF(offset_x + bx0 * block, offset_y + by0 * block,
+                        (bx1 - bx0) * block, (by1 - by0) * block)
+        painter.save()
+        painter.setClipRect(QRectF(offset_x, offset_y,
+                                   self.simulator.grid_width * self.cell_size,
+                                   self.simulator.grid_height * self.cell_size))
+        painter.drawImage(target, self._density_image)
+        painter.restore()
+    
+    def prefix_counts(self, step, level=0, bounds=None):
+        """
+        Retorna las visitas por bloque (filas = x) acumuladas hasta el paso `step`
+        
+        Con el camino en memoria se actualiza de forma incremental desde el
+        último paso pedido, así que desplazar la línea de tiempo solo cuenta
+        las posiciones recorridas entre ambos pasos. Sin historial se usa el
+        paso de primera visita de una celda por bloque (visitada o no, sin conteo).
+        
+        Args:
+            step: Paso válido límite
+            level: Nivel de la pirámide de OccupancyGrid (bloques de factors[level] celdas)
+            bounds: Bloques (bx0, by0, bx1, by1) a contar; None = todo el grid
+        """
+        occupancy = self.simulator.occupancy
+        if bounds is None:
+            bounds = (0, 0) + occupancy.levels[level].shape
+        bx0, by0, bx1, by1 = bounds
+        factor = occupancy.factors[level]
+        if not self.frame['record_history']:
+            return occupancy.visited_by(step, (bx0 * factor, by0 * factor,
+                                               bx1 * factor, by1 * factor, factor))
+        
+        w, h = bx1 - bx0, by1 - by0
+        key = (level, bounds)
+        if self._prefix_counts is None or self._prefix_key != key:
+            self._prefix_counts = np.zeros(w * h, dtype=np.int64)
+            self._prefix_key = key
+            self._prefix_step = -1
+        
+        path = self.frame['path']
+        lo, hi = sorted((self._prefix_step + 1, step + 1))
+        if hi > lo:
+            bx = path[lo:hi, 0].astype(np.int64) // factor - bx0
+            by = path[lo:hi, 1].astype(np.int64) // factor - by0
+            inside = (bx >= 0) & (bx < w) & (by >= 0) & (by < h)
+            delta = np.bincount(bx[inside] * h + by[inside], minlength=w * h)
+            if step > self._prefix_step:
+                self._prefix_counts += delta
+            else:
+                self._prefix_counts -= delta
+        self._prefix_step = step
+        return self._prefix_counts.reshape(w, h)
+    
+    def draw_invalid_attempts(self, painter, offset_x, offset_y):
+        """
+        Dibuja los intentos inválidos visibles agregados por celda y dirección
+        
+        Cada marcador (línea punteada hacia fuera del grid y una X en el
+        destino) se dibuja más grueso y opaco cuantos más intentos tuvo. Los
+        marcadores se agrupan en INVALID_MARKER_LEVELS niveles de intensidad
+        para dibujar cada nivel con una sola llamada a drawLines.
+        
+        Returns:
+            Número de marcadores dibujados
+        """
+        markers = self.frame['markers']
+        if not markers:
+            return 0
+        
+        cell = self.cell_size
+        size = min(6, cell * 0.4)
+        x0, y0, x1, y1 = self.visible_cells(PATH_CULL_MARGIN)
+        top = np.log1p(max(count for _, _, count in markers))
+        paths = [[] for _ in range(INVALID_MARKER_LEVELS)]
+        crosses = [[] for _ in range(INVALID_MARKER_LEVELS)]
+        drawn = 0
+        
+        for from_pos, to_pos, count in markers:
+            if not (x0 <= from_pos[0] < x1 and y0 <= from_pos[1] < y1):
+                continue
+            weight = np.log1p(count) / top
+            level = min(int(weight * INVALID_MARKER_LEVELS), INVALID_MARKER_LEVELS - 1)
+            
+            # Calcular coordenadas
+            ax = offset_x + (from_pos[0] + 0.5) * cell
+            ay = offset_y + (from_pos[1] + 0.5) * cell
+            bx = offset_x + (to_pos[0] + 0.5) * cell
+            by = offset_y + (to_pos[1] + 0.5) * cell
+            
+            paths[level].append(QLineF(ax, ay, bx, by))
+            crosses[level].append(QLineF(bx - size, by - size, bx + size, by + size))
+            crosses[level].append(QLineF(bx - size, by + size, bx + size, by - size))
+            drawn += 1
+        
+        for level in range(INVALID_MARKER_LEVELS):
+            if not paths[level]:
+                continue
+            weight = (level + 1) / INVALID_MARKER_LEVELS
+            
+            # Línea roja punteada hacia el destino y X en el punto de intento inválido
+            painter.setPen(QPen(QColor(255, 100, 100, int(60 + 120 * weight)), 1 + 2 * weight, Qt.DashLine))
+            painter.drawLines(paths[level])
+            painter.setPen(QPen(QColor(255, 0, 0, int(60 + 150 * weight)), 1 + 2 * weight))
+            painter.drawLines(crosses[level])
+        
+        return drawn
+    
+    def draw_particle(self, painter, offset_x, offset_y, pos=None):
+        """Dibuja la partícula en pos (None = posición actual)"""
+        if pos is None:
+            pos = self.frame['position']
+        
+        # Con poco zoom la partícula conserva un tamaño mínimo para seguir visible
+        radius = max(self.cell_size / 4, 3)
+        
+        # Dibujar partícula
+        painter.setBrush(QBrush(QColor(255, 100, 100)))
+        painter.setPen(QPen(QColor(200, 0, 0), 2))
+        
+        x = offset_x + (pos[0] + 0.5) * self.cell_size
+        y = offset_y + (pos[1] + 0.5) * self.cell_size
+        painter.drawEllipse(QRectF(x - radius, y - radius, 2 * radius, 2 * radius))
+        
+        # Dibujar punto de inicio
+        path = self.frame['path']
+        if len(path) > 0:
+            start = (int(path[0][0]), int(path[0][1]))
+            painter.setBrush(QBrush(QColor(100, 255, 100)))
+            painter.setPen(QPen(QColor(0, 200, 0), 2))
+            
+            sx = offset_x + (start[0] + 0.5) * self.cell_size
+            sy = offset_y + (start[1] + 0.5) * self.cell_size
+            painter.drawEllipse(QRectF(sx - radius, sy - radius, 2 * radius, 2 * radius))
\ No newline at end of file
@@ -0,0 +1,74 @@
+import threading
+import time
+
+class SimulationWorker:
+    """Hilo que avanza la simulación fuera del hilo de la interfaz"""
+    
+    def __init__(self, simulator):
+        """
+        Inicializa el worker
+        
+        Todo acceso al simulador mientras el hilo corre debe hacerse con
+        self.lock tomado (el canvas lo toma al dibujar).
+        
+        Args:
+            simulator: Instancia de Simulator a avanzar
+        """
+        self.simulator = simulator
+        self.lock = threading.Lock()
+        self.step_delay = 0.1     # Segundos entre pasos (0 = máxima velocidad)
+        self.time_budget = 0.01   # Segundos de cómputo por ciclo en máxima velocidad
+        self.batch_size = 1000    # Pasos válidos por llamada a run_batch (se adapta)
+        
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def start(self):
+        """Inicia el hilo de simulación"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Detiene el hilo y espera a que termine el ciclo en curso"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+    
+    def is_running(self):
+        """Retorna True si el hilo está activo"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        """Ciclo principal del hilo"""
+        while not self._stop_event.is_set():
+            if self.step_delay > 0:
+                # Modo animado: un paso y una pausa
+                with self.lock:
+                    self.simulator.step()
+                    finished = self.simulator.is_finished
+                if finished:
+                    break
+                self._stop_event.wait(self.step_delay)
+            else:
+                # Máxima velocidad: tantos pasos como permita el presupuesto de tiempo
+                with self.lock:
+                    deadline = time.perf_counter() + self.time_budget
+                    while not self.simulator.is_finished:
+                        started = time.perf_counter()
+                        self.simulator.run_batch(self.batch_size)
+                        now = time.perf_counter()
+                        if now - started < self.time_budget / 4:
+                            self.batch_size *= 2
+                        elif now - started > self.time_budget and self.batch_size > 1:
+                            self.batch_size //= 2
+                        if now >= deadline:
+                            break
+                    finished = self.simulator.is_finished
+                if finished:
+                    break
+                # Ceder el lock al hilo de la interfaz
+                time.sleep(0.001)
\ No newline at end of file
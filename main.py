@@ -1,8 +1,15 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from gui.main_window import MainWindow
 
 def main():
+    # Modo sin interfaz gráfica: no se importa PyQt5
+    if '--headless' in sys.argv[1:]:
+        from models.cli import main as headless_main
+        argv = [arg for arg in sys.argv[1:] if arg != '--headless']
+        sys.exit(headless_main(argv))
+    
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import MainWindow
+    
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     window = MainWindow()
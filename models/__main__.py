@@ -0,0 +1,4 @@
+import sys
+from models.cli import main
+
+sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,46 @@
+import numpy as np
+from models.particle import MOVE_DIRECTIONS
+
+# Límites de la ventana adaptativa sobre la que se acumulan los movimientos
+MIN_WINDOW = 16
+MAX_WINDOW = 2048
+
+
+def direction_tables(step_size):
+    """Retorna los desplazamientos (dx, dy) de cada código de dirección como arreglos int64"""
+    dx_table = np.array([d[0] for d in MOVE_DIRECTIONS], dtype=np.int64) * step_size
+    dy_table = np.array([d[1] for d in MOVE_DIRECTIONS], dtype=np.int64) * step_size
+    return dx_table, dy_table
+
+
+def scan_segment(x, y, codes, dx_table, dy_table, grid_width, grid_height):
+    """
+    Acumula de forma vectorizada una racha de movimientos SWR válidos
+    
+    Las posiciones se obtienen con cumsum sobre los códigos y el primer
+    movimiento que sale del grid se encuentra con una máscara vectorizada.
+    
+    Args:
+        x: Posición inicial en x
+        y: Posición inicial en y
+        codes: Arreglo de códigos de dirección a aplicar en orden
+        dx_table: Desplazamiento en x de cada código (ver direction_tables)
+        dy_table: Desplazamiento en y de cada código
+        grid_width: Ancho del grid
+        grid_height: Alto del grid
+    
+    Returns:
+        Tupla (xs, ys, j):
+            xs, ys: arreglos int64 con las posiciones válidas codes[:j]
+            j: índice del primer intento inválido, o len(codes) si no hubo
+    """
+    xs = np.cumsum(dx_table[codes])
+    ys = np.cumsum(dy_table[codes])
+    xs += x
+    ys += y
+    
+    outside = (xs < 0) | (xs >= grid_width) | (ys < 0) | (ys >= grid_height)
+    j = int(outside.argmax())
+    if not outside[j]:
+        return xs, ys, len(codes)
+    return xs[:j], ys[:j], j
\ No newline at end of file
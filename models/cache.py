@@ -0,0 +1,159 @@
+import json
+import os
+import sqlite3
+
+# Ubicación por defecto de la caché de barridos
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'swr', 'results.sqlite')
+
+# Tamaño máximo por defecto de los resultados guardados (bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Claves por consulta en get_many() (límite de parámetros de SQLite)
+_QUERY_CHUNK = 500
+
+
+def make_key(params, seed, replica, engine_version):
+    """
+    Retorna la clave canónica de un resultado
+    
+    Args:
+        params: dict con los parámetros de la corrida (valores serializables a JSON)
+        seed: Entropía entera de la semilla maestra
+        replica: Índice de la réplica (hijo replica de SeedSequence(seed).spawn)
+        engine_version: Versión del motor que produjo el resultado
+    """
+    return json.dumps([params, seed, replica, engine_version], sort_keys=True, separators=(',', ':'))
+
+
+class ResultCache:
+    """Caché en disco de resultados por réplica con desalojo LRU acotado por tamaño"""
+    
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Abre (o crea) la caché
+        
+        Los resultados se guardan en una base SQLite como JSON, uno por
+        clave. Cada lectura o escritura marca la entrada con un contador
+        creciente de uso; cuando los resultados superan max_bytes se borran
+        las entradas usadas hace más tiempo.
+        
+        Args:
+            path: Archivo de la base de datos (se crean los directorios que falten)
+            max_bytes: Tamaño máximo de claves más resultados guardados
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self._db.commit()
+        self._clock, self._size = self._db.execute(
+            "SELECT COALESCE(MAX(used), 0), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+    
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    @property
+    def size(self):
+        """Bytes ocupados por claves y resultados"""
+        return self._size
+    
+    def get_many(self, keys):
+        """
+        Busca varias claves a la vez
+        
+        Returns:
+            dict clave -> resultado con las claves encontradas
+        """
+        found = {}
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            marks = ','.join('?' * len(chunk))
+            rows = self._db.execute(f"SELECT key, value FROM results WHERE key IN ({marks})", chunk)
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            # Las entradas leídas pasan a ser las más recientes
+            self._db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                 [(self._tick(), key) for key in found])
+            self._db.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+    
+    def get(self, key):
+        """Retorna el resultado guardado para key, o None"""
+        return self.get_many([key]).get(key)
+    
+    def put_many(self, items):
+        """
+        Guarda varios resultados y desaloja lo necesario para respetar max_bytes
+        
+        Args:
+            items: Iterable de (clave, resultado serializable a JSON)
+        """
+        rows = {}
+        for key, result in items:
+            value = json.dumps(result, separators=(',', ':'))
+            rows[key] = (key, value, len(key) + len(value), self._tick())
+        if not rows:
+            return
+        keys = list(rows)
+        rows = list(rows.values())
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            marks = ','.join('?' * len(chunk))
+            replaced = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM results WHERE key IN ({marks})",
+                                        chunk).fetchone()[0]
+            self._size -= replaced
+        self._db.executemany("INSERT OR REPLACE INTO results (key, value, size, used) VALUES (?, ?, ?, ?)",
+                             rows)
+        self._size += sum(row[2] for row in rows)
+        self._evict()
+        self._db.commit()
+    
+    def put(self, key, result):
+        """Guarda un resultado"""
+        self.put_many([(key, result)])
+    
+    def clear(self):
+        """Borra todos los resultados"""
+        self._db.execute("DELETE FROM results")
+        self._db.commit()
+        self._size = 0
+    
+    def close(self):
+        """Cierra la base de datos"""
+        self._db.close()
+    
+    def _tick(self):
+        """Avanza el contador de uso (orden LRU independiente del reloj)"""
+        self._clock += 1
+        return self._clock
+    
+    def _evict(self):
+        """Borra las entradas menos usadas hasta que el tamaño no supere max_bytes"""
+        if self._size <= self.max_bytes:
+            return
+        excess = self._size - self.max_bytes
+        # Primer uso en que el tamaño acumulado de las entradas más viejas cubre el exceso
+        cutoff = self._db.execute(
+            "SELECT used FROM (SELECT used, SUM(size) OVER (ORDER BY used) AS freed FROM results) "
+            "WHERE freed >= ? LIMIT 1", (excess,)
+        ).fetchone()
+        if cutoff is None:
+            cutoff = (self._clock,)
+        count, freed = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results WHERE used <= ?", cutoff
+        ).fetchone()
+        self._db.execute("DELETE FROM results WHERE used <= ?", cutoff)
+        self._size -= freed
+        self.evictions += count
\ No newline at end of file
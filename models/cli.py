@@ -0,0 +1,212 @@
+import argparse
+import csv
+import json
+import sys
+from models.simulator import Simulator
+from models.runner import run_ensemble
+from models.sweep import SWEEP_AXES, expand_grid, run_sweep
+from models.cache import ResultCache, DEFAULT_CACHE_PATH
+from models.profiler import Profiler
+from models.observables import OBSERVABLES, DEFAULT_OBSERVABLES
+from models.sampler import SAMPLERS
+
+
+def parse_observables(value):
+    """Convierte la lista separada por comas de --observables, validando los nombres"""
+    names = [name for name in value.split(',') if name]
+    unknown = [name for name in names if name not in OBSERVABLES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"observables desconocidos: {', '.join(unknown)}")
+    return names
+
+
+def parse_target(value):
+    """Convierte 'X,Y' de --target en una tupla de enteros"""
+    try:
+        x, y = (int(v) for v in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("se esperaba X,Y")
+    return x, y
+
+
+def parse_axis(value):
+    """Convierte 'EJE=V1,V2,...' de --sweep en (eje, [valores enteros])"""
+    try:
+        name, values = value.split('=', 1)
+        name = name.replace('-', '_')
+        values = [int(v) for v in values.split(',') if v]
+    except ValueError:
+        raise argparse.ArgumentTypeError("se esperaba EJE=V1,V2,...")
+    if name not in SWEEP_AXES:
+        raise argparse.ArgumentTypeError(f"eje desconocido: {name} ({', '.join(SWEEP_AXES)})")
+    if not values:
+        raise argparse.ArgumentTypeError(f"el eje {name} no tiene valores")
+    return name, values
+
+
+def stop_condition_from_args(args):
+    """Retorna la tupla (nombre, *args) de la condición de término pedida, o None"""
+    if args.until is None:
+        return None
+    if args.until == 'cover':
+        return ('cover', args.cover_fraction)
+    if args.until == 'target':
+        return ('target',) + args.target
+    return (args.until,)
+
+
+def build_parser():
+    """Crea el parser de argumentos del modo sin interfaz gráfica"""
+    parser = argparse.ArgumentParser(
+        prog='python -m models',
+        description='Simulación SWR (Step With Replacement) sin interfaz gráfica'
+    )
+    parser.add_argument('--grid-width', type=int, default=40, help='Ancho del grid (40)')
+    parser.add_argument('--grid-height', type=int, default=40, help='Alto del grid (40)')
+    parser.add_argument('--step-size', type=int, default=1, help='Tamaño del paso (1)')
+    parser.add_argument('--steps', type=int, default=500, help='Pasos válidos objetivo (500)')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla maestra (aleatoria si se omite)')
+    parser.add_argument('--replicas', type=int, default=1, help='Número de réplicas independientes (1)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Procesos para las réplicas (todos los núcleos si se omite)')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json', help='Formato de salida (json)')
+    parser.add_argument('--output', default=None, help='Archivo de salida (stdout si se omite)')
+    parser.add_argument('--trajectory', default=None,
+                        help='Ruta base para escribir la trayectoria en disco (.pos/.inv); solo con 1 réplica')
+    parser.add_argument('--until', choices=('cover', 'boundary', 'target'), default=None,
+                        help='Terminar en el evento (cobertura, primer paso al borde o a --target); '
+                             '--steps queda como límite')
+    parser.add_argument('--cover-fraction', type=float, default=1.0,
+                        help='Fracción del grid a cubrir con --until cover (1.0)')
+    parser.add_argument('--target', type=parse_target, default=None, help='Celda objetivo X,Y para --until target')
+    parser.add_argument('--observables', type=parse_observables, default=list(DEFAULT_OBSERVABLES),
+                        help='Observables a calcular, separados por comas '
+                             f'({",".join(OBSERVABLES)}; vacío = ninguno); solo con 1 réplica')
+    parser.add_argument('--sampler', choices=SAMPLERS, default='exact',
+                        help="Muestreo: 'exact' sortea cada intento, 'rejection_free' resuelve "
+                             "las rachas de intentos inválidos con un solo sorteo (exact)")
+    parser.add_argument('--sweep', type=parse_axis, action='append', default=None, metavar='EJE=V1,V2,...',
+                        help='Barre un parámetro (grid_width, grid_height, step_size o max_steps); '
+                             'repetible. Simula por punto las --replicas réplicas de la semilla maestra --seed (0)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH,
+                        help='Caché de resultados de los barridos (~/.cache/swr/results.sqlite)')
+    parser.add_argument('--no-cache', action='store_true', help='No leer ni guardar resultados en la caché')
+    parser.add_argument('--cache-size', type=float, default=64,
+                        help='Tamaño máximo de la caché en MB; se desalojan los resultados usados hace más tiempo (64)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Agrega tiempos, pasos/s y memoria a la salida; solo con 1 réplica')
+    parser.add_argument('--snapshot', default=None, metavar='RUTA',
+                        help='Guarda el estado de la corrida en RUTA cada --snapshot-every pasos '
+                             'y al terminar; solo con 1 réplica')
+    parser.add_argument('--snapshot-every', type=int, default=1000000,
+                        help='Pasos válidos entre snapshots (1000000)')
+    parser.add_argument('--resume', default=None, metavar='RUTA',
+                        help='Continúa la corrida guardada en el snapshot RUTA; el grid, la semilla, '
+                             'los pasos, los observables y la trayectoria en disco salen del snapshot')
+    return parser
+
+
+def run(args):
+    """
+    Ejecuta la simulación descrita por los argumentos
+    
+    Returns:
+        dict con las estadísticas de la corrida
+    """
+    stop_condition = stop_condition_from_args(args)
+    if args.sweep:
+        return run_sweep_from_args(args, stop_condition)
+    if args.replicas > 1:
+        return run_ensemble(args.grid_width, args.grid_height, args.replicas, args.steps,
+                            step_size=args.step_size, seed=args.seed, workers=args.workers,
+                            stop_condition=stop_condition, sampler=args.sampler)
+    
+    if args.resume:
+        simulator = Simulator.restore(args.resume)
+    else:
+        simulator = Simulator(args.grid_width, args.grid_height, args.step_size, seed=args.seed,
+                              observables=args.observables, sampler=args.sampler)
+        simulator.set_max_steps(args.steps)
+        if stop_condition is not None:
+            simulator.add_stop_condition(*stop_condition)
+        if args.trajectory:
+            simulator.stream_to(args.trajectory)
+    profiler = None
+    if args.profile:
+        profiler = Profiler()
+        profiler.instrument_simulator(simulator)
+    if args.snapshot:
+        # Por tramos: una corrida interrumpida se retoma con --resume desde el último snapshot
+        while not simulator.is_finished:
+            simulator.run_batch(args.snapshot_every)
+            simulator.snapshot(args.snapshot)
+    else:
+        simulator.run_batch()
+    stats = simulator.get_stats()
+    if profiler is not None:
+        stats.update(profiler.get_stats())
+        stats.update(simulator.memory_usage())
+    simulator.close_stream()
+    stats['seed'] = simulator.seed.entropy
+    return stats
+
+
+def run_sweep_from_args(args, stop_condition):
+    """
+    Ejecuta el barrido de --sweep con los demás parámetros fijos
+    
+    Returns:
+        Lista con las estadísticas de cada punto (ver run_sweep)
+    """
+    base = {
+        'grid_width': args.grid_width,
+        'grid_height': args.grid_height,
+        'step_size': args.step_size,
+        'max_steps': args.steps,
+        'sampler': args.sampler,
+        'stop_condition': stop_condition
+    }
+    points = expand_grid(base, dict(args.sweep))
+    seed = args.seed if args.seed is not None else 0
+    cache = None if args.no_cache else ResultCache(args.cache, int(args.cache_size * 1024 * 1024))
+    try:
+        return run_sweep(points, seed, args.replicas, cache=cache, workers=args.workers)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def write_stats(stats, fmt, stream):
+    """Escribe las estadísticas (un dict o una lista de dicts) en formato JSON o CSV"""
+    if fmt == 'csv':
+        rows = stats if isinstance(stats, list) else [stats]
+        writer = csv.DictWriter(stream, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(stats, stream, indent=2)
+        stream.write('\n')
+
+
+def main(argv=None):
+    """Punto de entrada del modo sin interfaz gráfica (no importa PyQt5)"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.until == 'target' and args.target is None:
+        parser.error("--until target requiere --target X,Y")
+    if args.sweep and (args.trajectory or args.profile):
+        parser.error("--trajectory y --profile no se pueden usar con --sweep")
+    if (args.snapshot or args.resume) and (args.sweep or args.replicas > 1):
+        parser.error("--snapshot y --resume son solo para una corrida (sin --sweep ni --replicas)")
+    if args.resume and (args.trajectory or args.until):
+        parser.error("--trajectory y --until no se pueden usar con --resume (salen del snapshot)")
+    if args.snapshot_every <= 0:
+        parser.error("--snapshot-every debe ser positivo")
+    stats = run(args)
+    
+    if args.output:
+        with open(args.output, 'w', newline='') as stream:
+            write_stats(stats, args.format, stream)
+    else:
+        write_stats(stats, args.format, sys.stdout)
+    return 0
\ No newline at end of file
@@ -0,0 +1,150 @@
+import numpy as np
+
+class StopCondition:
+    """
+    Evento que termina la simulación en el paso exacto en que ocurre
+    
+    scan() busca el evento en un bloque de posiciones sin modificar el
+    estado y commit() registra las posiciones que realmente se aceptaron;
+    así varias condiciones pueden evaluarse sobre el mismo tramo y la
+    corrida se corta en la primera que ocurra.
+    """
+    
+    name = ''
+    
+    def reset(self, simulator):
+        """Reinicia el estado; la posición actual del simulador es el paso 0"""
+    
+    def scan(self, xs, ys):
+        """
+        Busca el evento en un bloque de posiciones válidas consecutivas
+        
+        Returns:
+            Índice de la primera posición del bloque en que ocurre, o -1
+        """
+        raise NotImplementedError
+    
+    def commit(self, xs, ys):
+        """Registra posiciones aceptadas (todas anteriores o iguales al evento)"""
+    
+    def args(self):
+        """Retorna los argumentos del constructor (para recrear la condición desde un snapshot)"""
+        return []
+    
+    def get_state(self):
+        """Retorna el estado acumulado como dict (valores simples o arreglos de NumPy)"""
+        return {}
+    
+    def set_state(self, state):
+        """Restaura el estado de un get_state() (se llama después de reset())"""
+
+
+class CoverTime(StopCondition):
+    """Termina cuando la fracción pedida del grid fue visitada (tiempo de cobertura)"""
+    
+    name = 'cover'
+    
+    def __init__(self, fraction=1.0):
+        """
+        Args:
+            fraction: Fracción de celdas a visitar (1.0 = todas)
+        """
+        self.fraction = fraction
+    
+    def reset(self, simulator):
+        """
+        Crea el bitset de celdas visitadas (un bit por celda)
+        
+        Parte de las celdas que la corrida ya visitó (occupancy), así que
+        agregada a mitad de corrida da el mismo tiempo de cobertura que
+        desde el inicio.
+        """
+        self.grid_height = simulator.grid_height
+        n_cells = simulator.grid_width * simulator.grid_height
+        self.target = max(1, int(np.ceil(self.fraction * n_cells)))
+        visited = simulator.occupancy.visited_by(simulator.particle.valid_steps).reshape(-1)
+        # Bit (celda & 7) del byte celda >> 3, como en commit()
+        self.bits = np.packbits(visited, bitorder='little')
+        self.distinct = int(np.count_nonzero(visited))
+    
+    def _new_cells(self, xs, ys):
+        """Retorna (celdas, índice de primera aparición) de las celdas aún no visitadas del bloque"""
+        flat = np.asarray(xs, dtype=np.int64) * self.grid_height + ys
+        cells, first_index = np.unique(flat, return_index=True)
+        seen = (self.bits[cells >> 3] >> (cells & 7).astype(np.uint8)) & 1
+        new = seen == 0
+        return cells[new], first_index[new]
+    
+    def scan(self, xs, ys):
+        needed = self.target - self.distinct
+        if needed <= 0:
+            return 0
+        cells, first_index = self._new_cells(xs, ys)
+        if len(cells) < needed:
+            return -1
+        return int(np.sort(first_index)[needed - 1])
+    
+    def commit(self, xs, ys):
+        cells, _ = self._new_cells(xs, ys)
+        np.bitwise_or.at(self.bits, cells >> 3, (1 << (cells & 7)).astype(np.uint8))
+        self.distinct += len(cells)
+    
+    def args(self):
+        return [self.fraction]
+    
+    def get_state(self):
+        return {'bits': self.bits.copy(), 'distinct': self.distinct}
+    
+    def set_state(self, state):
+        bits = np.asarray(state['bits'], dtype=np.uint8)
+        if bits.shape != self.bits.shape:
+            raise ValueError("El bitset de cobertura no corresponde al grid")
+        self.bits = bits.copy()
+        self.distinct = state['distinct']
+
+
+class FirstPassageBoundary(StopCondition):
+    """Termina al llegar por primera vez a una celda del borde del grid"""
+    
+    name = 'boundary'
+    
+    def reset(self, simulator):
+        self.grid_width = simulator.grid_width
+        self.grid_height = simulator.grid_height
+    
+    def scan(self, xs, ys):
+        on_boundary = ((xs == 0) | (xs == self.grid_width - 1)
+                       | (ys == 0) | (ys == self.grid_height - 1))
+        index = int(on_boundary.argmax())
+        return index if on_boundary[index] else -1
+
+
+class FirstPassageTarget(StopCondition):
+    """Termina al llegar por primera vez a una celda objetivo"""
+    
+    name = 'target'
+    
+    def __init__(self, x, y):
+        """
+        Args:
+            x: Celda objetivo en x
+            y: Celda objetivo en y
+        """
+        self.x = x
+        self.y = y
+    
+    def args(self):
+        return [self.x, self.y]
+    
+    def scan(self, xs, ys):
+        hit = (xs == self.x) & (ys == self.y)
+        index = int(hit.argmax())
+        return index if hit[index] else -1
+
+
+# Condiciones disponibles por nombre (ver Simulator.add_stop_condition)
+STOP_CONDITIONS = {
+    CoverTime.name: CoverTime,
+    FirstPassageBoundary.name: FirstPassageBoundary,
+    FirstPassageTarget.name: FirstPassageTarget,
+}
\ No newline at end of file
@@ -0,0 +1,242 @@
+import numpy as np
+from models.particle import MOVE_DIRECTIONS
+from models.events import EventBus
+
+class EnsembleSimulator:
+    """Simulación de muchas caminatas SWR independientes sobre el mismo grid"""
+    
+    def __init__(self, grid_width, grid_height, n_walkers, step_size=1, seed=None, trail_length=0):
+        """
+        Inicializa el ensamble
+        
+        Las posiciones y contadores de todas las partículas se guardan en
+        arreglos contiguos (struct-of-arrays) en lugar de objetos Particle.
+        En lugar del camino completo, cada partícula puede guardar solo sus
+        últimas posiciones (la estela) en un buffer circular de tamaño fijo.
+        
+        Args:
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+            n_walkers: Número de partículas independientes
+            step_size: Tamaño del paso
+            seed: Semilla del generador (None usa entropía del sistema)
+            trail_length: Movimientos que se recuerdan por partícula (0 = sin estela)
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.n_walkers = n_walkers
+        self.trail_length = trail_length
+        self.set_step_size(step_size)
+        
+        self.start_x = grid_width // 2
+        self.start_y = grid_height // 2
+        self.x = np.full(n_walkers, self.start_x, dtype=np.int32)
+        self.y = np.full(n_walkers, self.start_y, dtype=np.int32)
+        self.valid_steps = np.zeros(n_walkers, dtype=np.int64)
+        self.invalid_steps = np.zeros(n_walkers, dtype=np.int64)
+        
+        self.max_steps = 0
+        self.is_running = False
+        self.is_finished = False
+        self.rng = np.random.default_rng(seed)
+        
+        # Estela: fila trail_head[i] de la columna i es la posición actual de
+        # la partícula i, la anterior es el movimiento previo, y así hacia atrás
+        self.trail_x = np.empty((trail_length + 1, n_walkers), dtype=np.int32)
+        self.trail_y = np.empty((trail_length + 1, n_walkers), dtype=np.int32)
+        self.trail_head = np.zeros(n_walkers, dtype=np.int64)
+        self.trail_count = np.zeros(n_walkers, dtype=np.int64)
+        self._reset_trails()
+        
+        # Notificaciones 'step', 'progress' y 'reset' (mismos eventos que Simulator)
+        self.events = EventBus()
+    
+    def set_max_steps(self, max_steps):
+        """Establece el número máximo de pasos VÁLIDOS por partícula"""
+        self.max_steps = max_steps
+    
+    def set_step_size(self, step_size):
+        """Cambia el tamaño del paso y recalcula los desplazamientos por código de dirección"""
+        self.step_size = step_size
+        self._dx = np.array([d[0] for d in MOVE_DIRECTIONS], dtype=np.int32) * step_size
+        self._dy = np.array([d[1] for d in MOVE_DIRECTIONS], dtype=np.int32) * step_size
+    
+    def reset(self):
+        """Reinicia todas las partículas al centro del grid"""
+        self.start_x = self.grid_width // 2
+        self.start_y = self.grid_height // 2
+        self.x.fill(self.start_x)
+        self.y.fill(self.start_y)
+        self.valid_steps.fill(0)
+        self.invalid_steps.fill(0)
+        self.is_running = False
+        self.is_finished = False
+        self._reset_trails()
+        self.events.publish('reset')
+    
+    def _reset_trails(self):
+        """Deja en cada estela solo la posición inicial"""
+        self.trail_x[0] = self.start_x
+        self.trail_y[0] = self.start_y
+        self.trail_head.fill(0)
+        self.trail_count.fill(1)
+    
+    def _record_trails(self, moved):
+        """Agrega la posición nueva de las partículas que se movieron a su estela"""
+        walkers = np.flatnonzero(moved)
+        if len(walkers) == 0:
+            return
+        size = self.trail_length + 1
+        head = (self.trail_head[walkers] + 1) % size
+        self.trail_x[head, walkers] = self.x[walkers]
+        self.trail_y[head, walkers] = self.y[walkers]
+        self.trail_head[walkers] = head
+        self.trail_count[walkers] = np.minimum(self.trail_count[walkers] + 1, size)
+    
+    def step(self):
+        """
+        Avanza un intento SWR en todas las partículas que no han terminado
+        
+        Cada partícula sortea una dirección; las que quedan dentro del grid se
+        mueven y suman un paso válido, las demás suman un paso inválido.
+        
+        Returns:
+            dict con información del paso:
+            {
+                'moved': int,           # Partículas que se movieron
+                'active_walkers': int,  # Partículas que intentaron moverse
+                'valid_steps': int,     # Pasos válidos totales del ensamble
+                'invalid_steps': int,   # Intentos inválidos totales
+                'finished': bool        # Si todas alcanzaron el objetivo
+            }
+        """
+        if self.is_finished:
+            return {
+                'moved': 0,
+                'active_walkers': 0,
+                'valid_steps': int(self.valid_steps.sum()),
+                'invalid_steps': int(self.invalid_steps.sum()),
+                'finished': True
+            }
+        
+        active, moved = self._advance()
+        result = {
+            'moved': int(moved.sum()),
+            'active_walkers': int(active.sum()),
+            'valid_steps': int(self.valid_steps.sum()),
+            'invalid_steps': int(self.invalid_steps.sum()),
+            'finished': self.is_finished
+        }
+        self.events.publish('step', result)
+        return result
+    
+    def _advance(self):
+        """
+        Avanza un intento en todas las partículas (sin armar el resultado)
+        
+        Returns:
+            (active, moved): máscaras de las partículas que intentaron moverse
+            y de las que se movieron
+        """
+        
+        active = self.valid_steps < self.max_steps
+        codes = self.rng.integers(0, len(MOVE_DIRECTIONS), size=self.n_walkers, dtype=np.int8)
+        new_x = self.x + self._dx[codes]
+        new_y = self.y + self._dy[codes]
+        
+        # Válido: dentro del grid y la partícula aún no ha terminado
+        moved = (new_x >= 0) & (new_x < self.grid_width) & (new_y >= 0) & (new_y < self.grid_height)
+        moved &= active
+        np.copyto(self.x, new_x, where=moved)
+        np.copyto(self.y, new_y, where=moved)
+        self.valid_steps += moved
+        self.invalid_steps += active & ~moved
+        if self.trail_length:
+            self._record_trails(moved)
+        
+        if not (self.valid_steps < self.max_steps).any():
+            self.is_finished = True
+        
+        return active, moved
+    
+    def run_batch(self, n_steps=None):
+        """
+        Avanza varios intentos del ensamble de una vez
+        
+        Args:
+            n_steps: Intentos a dar (None = hasta que todas terminen)
+        
+        Returns:
+            dict con el resultado del lote:
+            {
+                'moved': int,               # Movimientos del lote (sumando partículas)
+                'valid_steps': int,         # Pasos válidos totales del ensamble
+                'invalid_steps': int,       # Intentos inválidos totales
+                'batch_steps': int,         # Intentos del ensamble en este lote
+                'finished': bool            # Si todas alcanzaron el objetivo
+            }
+        """
+        moved = 0
+        steps = 0
+        while not self.is_finished and (n_steps is None or steps < n_steps):
+            moved += int(self._advance()[1].sum())
+            steps += 1
+        
+        result = {
+            'moved': moved,
+            'valid_steps': int(self.valid_steps.sum()),
+            'invalid_steps': int(self.invalid_steps.sum()),
+            'batch_steps': steps,
+            'finished': self.is_finished
+        }
+        self.events.publish('progress', result)
+        return result
+    
+    def run(self):
+        """Avanza el ensamble hasta que todas las partículas alcanzan max_steps"""
+        self.run_batch()
+        return self.get_stats()
+    
+    def get_positions(self):
+        """Retorna las posiciones actuales como arreglos (x, y)"""
+        return self.x, self.y
+    
+    def get_trails(self):
+        """
+        Retorna las estelas ordenadas de la posición actual hacia atrás
+        
+        Returns:
+            (xs, ys, counts): xs[k, i], ys[k, i] es la posición de la
+            partícula i hace k movimientos; solo las filas k < counts[i]
+            son válidas (al principio la estela es más corta que trail_length)
+        """
+        ages = np.arange(self.trail_length + 1)[:, None]
+        rows = (self.trail_head[None, :] - ages) % (self.trail_length + 1)
+        walkers = np.arange(self.n_walkers)[None, :]
+        return self.trail_x[rows, walkers], self.trail_y[rows, walkers], self.trail_count
+    
+    def get_stats(self):
+        """
+        Retorna estadísticas del ensamble
+        
+        Incluye las mismas claves que Simulator.get_stats() (sumadas sobre
+        todas las partículas) más las métricas propias del ensamble.
+        """
+        valid = int(self.valid_steps.sum())
+        invalid = int(self.invalid_steps.sum())
+        total = valid + invalid
+        dx = self.x.astype(np.int64) - self.start_x
+        dy = self.y.astype(np.int64) - self.start_y
+        return {
+            'valid_steps': valid,
+            'invalid_steps': invalid,
+            'total_attempts': total,
+            'max_steps': self.max_steps,
+            'is_finished': self.is_finished,
+            'n_walkers': self.n_walkers,
+            'finished_walkers': int((self.valid_steps >= self.max_steps).sum()),
+            'mean_valid_steps': valid / self.n_walkers,
+            'mean_invalid_steps': invalid / self.n_walkers,
+            'efficiency': valid / total if total > 0 else 0.0,
+            'mean_squared_displacement': float((dx * dx + dy * dy).mean())
+        }
\ No newline at end of file
@@ -0,0 +1,40 @@
+class EventBus:
+    """Bus mínimo de eventos: cada evento tiene una lista de suscriptores"""
+    
+    def __init__(self):
+        """
+        Inicializa el bus sin suscriptores
+        
+        publish() se llama desde el hilo que avanza la simulación, así que
+        los suscriptores deben ser baratos (p. ej. marcar que hay datos
+        nuevos) y dejar el trabajo pesado para su propio ritmo.
+        """
+        self._subscribers = {}  # evento -> lista de callbacks
+    
+    def subscribe(self, event, callback):
+        """
+        Suscribe callback(payload) a un evento
+        
+        Suscribir dos veces el mismo callback no tiene efecto, así que
+        puede llamarse en cada inicio sin que las notificaciones se repitan.
+        """
+        callbacks = self._subscribers.setdefault(event, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+    
+    def unsubscribe(self, event, callback):
+        """Quita callback de un evento (no hace nada si no estaba suscrito)"""
+        callbacks = self._subscribers.get(event)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+    
+    def subscribers(self, event):
+        """Retorna la cantidad de suscriptores de un evento"""
+        return len(self._subscribers.get(event, ()))
+    
+    def publish(self, event, payload=None):
+        """Notifica a los suscriptores del evento (sin costo si no hay ninguno)"""
+        callbacks = self._subscribers.get(event)
+        if callbacks:
+            for callback in tuple(callbacks):
+                callback(payload)
\ No newline at end of file
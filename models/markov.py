@@ -0,0 +1,107 @@
+import numpy as np
+from models.particle import MOVE_DIRECTIONS
+
+class MarkovSolver:
+    """Solución exacta de la caminata SWR como cadena de Markov sobre las celdas del grid"""
+    
+    def __init__(self, grid_width, grid_height, step_size=1):
+        """
+        Construye el operador de transición disperso
+        
+        En SWR los intentos que salen del grid se descartan y se vuelve a
+        sortear, así que desde una celda con k movimientos válidos el siguiente
+        paso VÁLIDO es uniforme entre esos k vecinos (probabilidad 1/k cada uno)
+        y el número de intentos inválidos previos es geométrico con media (4-k)/k.
+        
+        Args:
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+            step_size: Tamaño del paso
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.step_size = step_size
+        self.n_cells = grid_width * grid_height
+        
+        # Celdas indexadas como x * grid_height + y (igual que OccupancyGrid)
+        xs, ys = np.divmod(np.arange(self.n_cells, dtype=np.int64), grid_height)
+        sources, targets = [], []
+        for dx, dy in MOVE_DIRECTIONS:
+            nx = xs + dx * step_size
+            ny = ys + dy * step_size
+            valid = (nx >= 0) & (nx < grid_width) & (ny >= 0) & (ny < grid_height)
+            sources.append(np.flatnonzero(valid))
+            targets.append(nx[valid] * grid_height + ny[valid])
+        
+        # Operador en formato COO: P[source -> target] = 1 / k(source)
+        self.valid_moves = np.zeros(self.n_cells, dtype=np.int64)
+        for src in sources:
+            self.valid_moves[src] += 1
+        self.sources = np.concatenate(sources)
+        self.targets = np.concatenate(targets)
+        self.weights = 1.0 / self.valid_moves[self.sources]
+        
+        self.start_x = grid_width // 2
+        self.start_y = grid_height // 2
+        if self.valid_moves[self.start_x * grid_height + self.start_y] == 0:
+            raise ValueError("La celda inicial no tiene movimientos válidos con este tamaño de paso")
+        
+        # Intentos inválidos esperados antes del siguiente paso válido, por celda
+        # (las celdas aisladas nunca se alcanzan; se evita dividir por cero)
+        n_moves = len(MOVE_DIRECTIONS)
+        self.expected_rejections = (n_moves - self.valid_moves) / np.maximum(self.valid_moves, 1)
+        
+        dx = (xs - self.start_x).astype(np.float64)
+        dy = (ys - self.start_y).astype(np.float64)
+        self._squared_displacement = dx * dx + dy * dy
+    
+    def initial_distribution(self):
+        """Retorna la distribución inicial (toda la masa en el centro, como Simulator)"""
+        p = np.zeros(self.n_cells, dtype=np.float64)
+        p[self.start_x * self.grid_height + self.start_y] = 1.0
+        return p
+    
+    def apply(self, p):
+        """Aplica un paso válido del operador de transición a la distribución p"""
+        return np.bincount(self.targets, weights=p[self.sources] * self.weights,
+                           minlength=self.n_cells)
+    
+    def stationary_distribution(self):
+        """
+        Retorna la distribución estacionaria como arreglo (grid_width, grid_height)
+        
+        Es proporcional al número de movimientos válidos de cada celda
+        (caminata uniforme sobre un grafo no dirigido).
+        """
+        pi = self.valid_moves / self.valid_moves.sum()
+        return pi.reshape(self.grid_width, self.grid_height)
+    
+    def solve(self, n_steps):
+        """
+        Calcula exactamente el estado después de n_steps pasos válidos
+        
+        Args:
+            n_steps: Número de pasos válidos
+        
+        Returns:
+            dict con:
+            {
+                'distribution': arreglo (grid_width, grid_height) de probabilidades,
+                'mean_squared_displacement': float,
+                'expected_invalid_steps': float,
+                'expected_total_attempts': float
+            }
+        """
+        p = self.initial_distribution()
+        expected_invalid = 0.0
+        
+        for _ in range(n_steps):
+            expected_invalid += float(p @ self.expected_rejections)
+            p = self.apply(p)
+        
+        return {
+            'distribution': p.reshape(self.grid_width, self.grid_height),
+            'mean_squared_displacement': float(p @ self._squared_displacement),
+            'expected_invalid_steps': expected_invalid,
+            'expected_total_attempts': n_steps + expected_invalid
+        }
\ No newline at end of file
@@ -0,0 +1,173 @@
+import numpy as np
+
+# Direcciones unitarias en el orden que usan todos los motores (código 0..3)
+MOVE_DIRECTIONS = (
+    (1, 0),    # Derecha
+    (-1, 0),   # Izquierda
+    (0, 1),    # Abajo
+    (0, -1)    # Arriba
+)
+
+# Códigos de 2 bits que se obtienen de cada palabra de 64 bits del generador
+CODES_PER_WORD = 32
+
+# Máscara de una palabra de 64 bits (next_word)
+WORD_MASK = (1 << 64) - 1
+
+# Versión del formato de MoveSource.snapshot()
+SNAPSHOT_VERSION = 1
+
+class MoveSource:
+    """Flujo de códigos de movimiento (índices en MOVE_DIRECTIONS) sorteados en palabras de 64 bits"""
+    
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Inicializa el flujo
+        
+        step() y run_batch() consumen exactamente un código por intento del
+        mismo flujo, así que una corrida es idéntica sin importar cómo se
+        alternen ambos modos.
+        
+        Cada palabra de 64 bits de PCG64 se parte en CODES_PER_WORD códigos
+        de 2 bits, así que un bloque cuesta block_size / 32 sorteos. El
+        estado del flujo es un solo entero (códigos consumidos desde la
+        semilla): restaurarlo salta con PCG64.advance() en lugar de guardar
+        el estado interno del generador.
+        
+        Args:
+            seed: Semilla (int o np.random.SeedSequence); None usa entropía del sistema
+            block_size: Códigos sorteados en cada recarga (se redondea a
+                        múltiplo de CODES_PER_WORD)
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed = seed
+        self.block_size = max(block_size // CODES_PER_WORD, 1) * CODES_PER_WORD
+        self.bit_generator = np.random.PCG64(seed)
+        self._origin = self.bit_generator.state  # Estado inicial, base de los saltos
+        self._words = 0    # Palabras sorteadas antes del bloque actual
+        self._block = np.empty(0, dtype=np.int8)
+        self._codes = None  # El bloque como lista (acceso rápido desde next_code)
+        self._raw = np.empty(0, dtype=np.uint64)  # Palabras del bloque actual
+        self._raw_words = None  # Las palabras como lista de int (acceso rápido desde next_word)
+        self._pos = 0
+    
+    def _refill(self):
+        """Sortea un bloque nuevo de códigos a partir de palabras de 64 bits"""
+        self._words += len(self._block) // CODES_PER_WORD
+        words = self.bit_generator.random_raw(self.block_size // CODES_PER_WORD)
+        # Bytes en orden little-endian para que el flujo no dependa de la plataforma
+        data = words.astype('<u8', copy=False).view(np.uint8)
+        block = np.empty((len(data), 4), dtype=np.uint8)
+        np.bitwise_and(data, 3, out=block[:, 0])
+        for k in range(1, 4):
+            np.right_shift(data, 2 * k, out=block[:, k])
+            block[:, k] &= 3
+        self._block = block.reshape(-1).view(np.int8)
+        self._codes = None
+        self._raw = words
+        self._raw_words = None
+        self._pos = 0
+    
+    def next_code(self):
+        """Retorna el siguiente código de movimiento"""
+        if self._pos == len(self._block):
+            self._refill()
+        if self._codes is None:
+            self._codes = self._block.tolist()
+        code = self._codes[self._pos]
+        self._pos += 1
+        return code
+    
+    def next_word(self):
+        """
+        Retorna un entero de 64 bits armado con los próximos CODES_PER_WORD códigos
+        
+        El código i de los consumidos son los bits 2i y 2i + 1 del resultado,
+        así que con el flujo alineado a una palabra es la palabra sorteada
+        tal cual. Consume siempre CODES_PER_WORD códigos, así que quien lo
+        use avanza el flujo una cantidad fija y la corrida sigue siendo
+        reproducible y repetible desde un checkpoint.
+        """
+        if self._pos == len(self._block):
+            self._refill()
+        index, offset = divmod(self._pos, CODES_PER_WORD)
+        if offset and index + 1 == len(self._raw):
+            # Los códigos cruzan el final del bloque
+            value = 0
+            for i in range(CODES_PER_WORD):
+                value |= self.next_code() << (2 * i)
+            return value
+        if self._raw_words is None:
+            self._raw_words = self._raw.tolist()
+        value = self._raw_words[index] >> (2 * offset)
+        if offset:
+            value = (value | (self._raw_words[index + 1] << (64 - 2 * offset))) & WORD_MASK
+        self._pos += CODES_PER_WORD
+        return value
+    
+    def take_block(self):
+        """
+        Retorna (sin copia) todos los códigos restantes del bloque actual
+        
+        Los que no se usen deben devolverse con unread() antes de volver a
+        pedir códigos.
+        """
+        if self._pos == len(self._block):
+            self._refill()
+        codes = self._block[self._pos:]
+        self._pos = len(self._block)
+        return codes
+    
+    def unread(self, n):
+        """Devuelve al flujo los últimos n códigos entregados por take_block()"""
+        self._pos -= n
+    
+    def get_state(self):
+        """
+        Retorna el estado exacto del flujo: códigos consumidos desde la semilla
+        
+        Solo es válido para flujos con la misma semilla (ver snapshot() para
+        un estado autocontenido).
+        """
+        return self._words * CODES_PER_WORD + self._pos
+    
+    def set_state(self, state):
+        """Restaura un estado obtenido con get_state() saltando directamente a esa posición"""
+        words, pos = divmod(state, CODES_PER_WORD)
+        self.bit_generator.state = self._origin
+        self.bit_generator.advance(words)
+        self._block = np.empty(0, dtype=np.int8)
+        self._words = words
+        self._refill()
+        self._pos = pos
+    
+    def snapshot(self):
+        """
+        Retorna el estado completo del flujo como dict serializable (p. ej. a JSON)
+        
+        Incluye la semilla, así que basta para reanudar el flujo en otro
+        proceso con from_snapshot().
+        """
+        return {
+            'version': SNAPSHOT_VERSION,
+            'bit_generator': 'PCG64',
+            'entropy': self.seed.entropy,
+            'spawn_key': list(self.seed.spawn_key),
+            'consumed': self.get_state()
+        }
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, block_size=4096):
+        """
+        Crea un flujo que continúa exactamente desde un snapshot()
+        
+        Raises:
+            ValueError: Si el snapshot es de otra versión o de otro generador
+        """
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('bit_generator') != 'PCG64':
+            raise ValueError("Snapshot de flujo de movimientos no compatible")
+        seed = np.random.SeedSequence(snapshot['entropy'], spawn_key=tuple(snapshot['spawn_key']))
+        moves = cls(seed, block_size)
+        moves.set_state(snapshot['consumed'])
+        return moves
\ No newline at end of file
@@ -0,0 +1,236 @@
+import math
+import numpy as np
+
+class RunningMoments:
+    """Media y varianza acumuladas en línea (Welford; bloques combinados con Chan et al.)"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Vuelve al estado sin muestras"""
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Suma de cuadrados de las desviaciones a la media
+    
+    def push(self, value):
+        """Agrega una muestra en O(1)"""
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+    
+    def push_batch(self, values):
+        """Agrega un bloque de muestras combinando sus momentos con los acumulados"""
+        nb = len(values)
+        if nb == 0:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(np.square(values - mean_b).sum())
+        n = self.n + nb
+        delta = mean_b - self.mean
+        self.mean += delta * nb / n
+        self.m2 += m2_b + delta * delta * self.n * nb / n
+        self.n = n
+    
+    def variance(self):
+        """Varianza poblacional de las muestras (0 sin muestras)"""
+        return self.m2 / self.n if self.n else 0.0
+    
+    def get_state(self):
+        """Retorna [n, media, m2] (para snapshots)"""
+        return [self.n, self.mean, self.m2]
+    
+    def set_state(self, state):
+        """Restaura un estado de get_state()"""
+        self.n, self.mean, self.m2 = int(state[0]), float(state[1]), float(state[2])
+
+
+class Observable:
+    """
+    Cantidad física calculada en línea a medida que avanza la caminata
+    
+    Las subclases reciben cada posición válida (paso a paso con update() o
+    por bloques con update_batch()) en O(1) por paso, y value() se consulta
+    en O(1) sin necesitar el camino guardado.
+    """
+    
+    name = ''
+    
+    def reset(self, simulator):
+        """Reinicia el acumulador; la posición actual del simulador es el paso 0"""
+        raise NotImplementedError
+    
+    def update(self, x, y):
+        """Registra una nueva posición válida"""
+    
+    def update_batch(self, xs, ys):
+        """Registra un bloque de posiciones válidas consecutivas (arreglos int64)"""
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.update(x, y)
+    
+    def value(self):
+        """Retorna un dict con los valores actuales"""
+        raise NotImplementedError
+    
+    def get_state(self):
+        """Retorna lo acumulado como dict serializable (para snapshots)"""
+        return {}
+    
+    def set_state(self, state):
+        """Restaura lo acumulado de un get_state() (se llama después de reset())"""
+
+
+class SquaredDisplacement(Observable):
+    """
+    Desplazamiento cuadrático desde el inicio: valor actual y promedio temporal
+    
+    El promedio es sobre los pasos de una sola caminata
+    ('time_averaged_squared_displacement'); no es el desplazamiento
+    cuadrático medio del ensamble en el paso n ('mean_squared_displacement'
+    de run_ensemble, EnsembleSimulator y MarkovSolver).
+    """
+    
+    name = 'msd'
+    
+    def reset(self, simulator):
+        self.start_x, self.start_y = simulator.particle.get_position()
+        self.current = 0
+        self.moments = RunningMoments()
+        self.moments.push(0)
+    
+    def update(self, x, y):
+        dx = x - self.start_x
+        dy = y - self.start_y
+        self.current = dx * dx + dy * dy
+        self.moments.push(self.current)
+    
+    def update_batch(self, xs, ys):
+        dx = xs - self.start_x
+        dy = ys - self.start_y
+        squared = dx * dx + dy * dy
+        self.current = int(squared[-1])
+        self.moments.push_batch(squared)
+    
+    def get_state(self):
+        return {
+            'start': [int(self.start_x), int(self.start_y)],
+            'current': int(self.current),
+            'moments': self.moments.get_state()
+        }
+    
+    def set_state(self, state):
+        self.start_x, self.start_y = state['start']
+        self.current = state['current']
+        self.moments.set_state(state['moments'])
+    
+    def value(self):
+        return {
+            'squared_displacement': self.current,
+            'time_averaged_squared_displacement': self.moments.mean,
+            'squared_displacement_std': math.sqrt(self.moments.variance())
+        }
+
+
+class RadiusOfGyration(Observable):
+    """Radio de giro de todas las posiciones visitadas (con repetición)"""
+    
+    name = 'gyration'
+    
+    def reset(self, simulator):
+        x, y = simulator.particle.get_position()
+        self.moments_x = RunningMoments()
+        self.moments_y = RunningMoments()
+        self.update(x, y)
+    
+    def update(self, x, y):
+        self.moments_x.push(x)
+        self.moments_y.push(y)
+    
+    def update_batch(self, xs, ys):
+        self.moments_x.push_batch(xs)
+        self.moments_y.push_batch(ys)
+    
+    def get_state(self):
+        return {'x': self.moments_x.get_state(), 'y': self.moments_y.get_state()}
+    
+    def set_state(self, state):
+        self.moments_x.set_state(state['x'])
+        self.moments_y.set_state(state['y'])
+    
+    def value(self):
+        return {
+            'radius_of_gyration': math.sqrt(self.moments_x.variance() + self.moments_y.variance())
+        }
+
+
+class MaxExcursion(Observable):
+    """Máxima distancia al inicio alcanzada (euclídea y por eje)"""
+    
+    name = 'excursion'
+    
+    def reset(self, simulator):
+        self.start_x, self.start_y = simulator.particle.get_position()
+        self.max_squared = 0
+        self.max_x = 0
+        self.max_y = 0
+    
+    def update(self, x, y):
+        dx = abs(x - self.start_x)
+        dy = abs(y - self.start_y)
+        self.max_squared = max(self.max_squared, dx * dx + dy * dy)
+        self.max_x = max(self.max_x, dx)
+        self.max_y = max(self.max_y, dy)
+    
+    def update_batch(self, xs, ys):
+        dx = np.abs(xs - self.start_x)
+        dy = np.abs(ys - self.start_y)
+        self.max_squared = max(self.max_squared, int((dx * dx + dy * dy).max()))
+        self.max_x = max(self.max_x, int(dx.max()))
+        self.max_y = max(self.max_y, int(dy.max()))
+    
+    def get_state(self):
+        return {
+            'start': [int(self.start_x), int(self.start_y)],
+            'max': [int(self.max_squared), int(self.max_x), int(self.max_y)]
+        }
+    
+    def set_state(self, state):
+        self.start_x, self.start_y = state['start']
+        self.max_squared, self.max_x, self.max_y = state['max']
+    
+    def value(self):
+        return {
+            'max_excursion': math.sqrt(self.max_squared),
+            'max_excursion_x': self.max_x,
+            'max_excursion_y': self.max_y
+        }
+
+
+class Coverage(Observable):
+    """Fracción del grid visitada, leída del conteo de visitas que ya mantiene el simulador"""
+    
+    name = 'coverage'
+    
+    def reset(self, simulator):
+        self.occupancy = simulator.occupancy
+    
+    def update(self, x, y):
+        pass
+    
+    def update_batch(self, xs, ys):
+        pass
+    
+    def value(self):
+        return {'coverage': self.occupancy.coverage()}
+
+
+# Observables disponibles por nombre (ver Simulator.track)
+OBSERVABLES = {
+    SquaredDisplacement.name: SquaredDisplacement,
+    RadiusOfGyration.name: RadiusOfGyration,
+    MaxExcursion.name: MaxExcursion,
+    Coverage.name: Coverage,
+}
+
+DEFAULT_OBSERVABLES = tuple(OBSERVABLES)
\ No newline at end of file
@@ -0,0 +1,193 @@
+import numpy as np
+
+# Factor de reducción entre niveles consecutivos de la pirámide de conteos
+PYRAMID_FACTOR = 4
+# La pirámide deja de crecer cuando el nivel más grueso cabe en este lado
+PYRAMID_MIN_SIZE = 16
+
+class OccupancyGrid:
+    """Conteo de visitas por celda mantenido de forma incremental"""
+    
+    def __init__(self, grid_width, grid_height):
+        """
+        Inicializa el grid de ocupación
+        
+        Los arreglos se crean con np.zeros, de modo que en grids grandes el
+        sistema operativo solo reserva las páginas de las zonas visitadas.
+        
+        Args:
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.counts = np.zeros((grid_width, grid_height), dtype=np.int64)
+        # Paso de la primera visita + 1 (0 = nunca visitada)
+        self._first_visit = np.zeros((grid_width, grid_height), dtype=np.int64)
+        self.distinct_cells = 0
+        self._build_levels()
+    
+    def reset(self):
+        """Borra todas las visitas (arreglos nuevos para no tocar toda la memoria)"""
+        self.counts = np.zeros((self.grid_width, self.grid_height), dtype=np.int64)
+        self._first_visit = np.zeros((self.grid_width, self.grid_height), dtype=np.int64)
+        self.distinct_cells = 0
+        self._build_levels()
+    
+    def _build_levels(self):
+        """
+        Crea la pirámide de conteos: el nivel k agrupa bloques de
+        PYRAMID_FACTOR**k x PYRAMID_FACTOR**k celdas
+        
+        El nivel 0 es self.counts. Los niveles gruesos permiten dibujar la
+        densidad y estimar las visitas de una región sin recorrer cada celda.
+        """
+        self.levels = [self.counts]
+        self.factors = [1]
+        factor = 1
+        while max(self.grid_width, self.grid_height) > factor * PYRAMID_MIN_SIZE:
+            factor *= PYRAMID_FACTOR
+            shape = (-(-self.grid_width // factor), -(-self.grid_height // factor))
+            self.levels.append(np.zeros(shape, dtype=np.int64))
+            self.factors.append(factor)
+    
+    def record(self, x, y, step):
+        """
+        Registra una visita a la celda (x, y) en O(1)
+        
+        Args:
+            x: Posición en x
+            y: Posición en y
+            step: Número de paso válido en que ocurre la visita
+        """
+        self.counts[x, y] += 1
+        for level, factor in zip(self.levels[1:], self.factors[1:]):
+            level[x // factor, y // factor] += 1
+        if self._first_visit[x, y] == 0:
+            self._first_visit[x, y] = step + 1
+            self.distinct_cells += 1
+    
+    def record_batch(self, xs, ys, first_step):
+        """
+        Registra un bloque de visitas consecutivas
+        
+        Args:
+            xs: Arreglo de posiciones en x
+            ys: Arreglo de posiciones en y
+            first_step: Número de paso válido de la primera posición del bloque
+        """
+        if len(xs) == 0:
+            return
+        flat = np.asarray(xs, dtype=np.int64) * self.grid_height + ys
+        cells, first_index, visits = np.unique(flat, return_index=True, return_counts=True)
+        
+        counts = self.counts.reshape(-1)
+        first_visit = self._first_visit.reshape(-1)
+        counts[cells] += visits
+        if len(self.levels) > 1:
+            cell_x = cells // self.grid_height
+            cell_y = cells % self.grid_height
+            for level, factor in zip(self.levels[1:], self.factors[1:]):
+                np.add.at(level, (cell_x // factor, cell_y // factor), visits)
+        
+        new = first_visit[cells] == 0
+        first_visit[cells[new]] = first_step + first_index[new] + 1
+        self.distinct_cells += int(new.sum())
+    
+    def get_state(self):
+        """
+        Retorna las visitas como arreglos de las celdas visitadas (para snapshots)
+        
+        Returns:
+            dict con 'cells' (índice x * grid_height + y), 'visits' y
+            'first_visit' (paso de la primera visita + 1) de cada celda visitada
+        """
+        cells = np.flatnonzero(self._first_visit)
+        return {
+            'cells': cells,
+            'visits': self.counts.reshape(-1)[cells],
+            'first_visit': self._first_visit.reshape(-1)[cells]
+        }
+    
+    def set_state(self, state):
+        """Reemplaza las visitas por las de un get_state() y reconstruye la pirámide"""
+        self.reset()
+        cells = np.asarray(state['cells'], dtype=np.int64)
+        visits = np.asarray(state['visits'], dtype=np.int64)
+        self.counts.reshape(-1)[cells] = visits
+        self._first_visit.reshape(-1)[cells] = state['first_visit']
+        self.distinct_cells = len(cells)
+        if len(self.levels) > 1:
+            cell_x = cells // self.grid_height
+            cell_y = cells % self.grid_height
+            for level, factor in zip(self.levels[1:], self.factors[1:]):
+                np.add.at(level, (cell_x // factor, cell_y // factor), visits)
+    
+    def visit_count(self, x, y):
+        """Retorna cuántas veces se visitó la celda (x, y)"""
+        return int(self.counts[x, y])
+    
+    def first_visit_step(self, x, y):
+        """Retorna el paso válido de la primera visita a (x, y), o -1 si nunca se visitó"""
+        return int(self._first_visit[x, y]) - 1
+    
+    def visited_by(self, step, region=None):
+        """
+        Retorna una máscara de las celdas visitadas hasta el paso step
+        
+        Args:
+            step: Paso válido límite
+            region: (x0, y0, x1, y1, stride) para evaluar solo una submuestra
+                    de celdas; None evalúa todo el grid
+        """
+        first_visit = self._first_visit
+        if region is not None:
+            x0, y0, x1, y1, stride = region
+            first_visit = first_visit[x0:x1:stride, y0:y1:stride]
+        return (first_visit > 0) & (first_visit <= step + 1)
+    
+    def level_for(self, cells_per_pixel):
+        """Retorna el nivel más grueso de la pirámide cuyo bloque no supera cells_per_pixel celdas"""
+        level = 0
+        while level + 1 < len(self.factors) and self.factors[level + 1] <= cells_per_pixel:
+            level += 1
+        return level
+    
+    def region_bounds(self, level, x0, y0, x1, y1):
+        """
+        Retorna los bloques del nivel que cubren las celdas [x0, x1) x [y0, y1)
+        
+        Returns:
+            (bx0, by0, bx1, by1) en coordenadas del nivel
+        """
+        factor = self.factors[level]
+        shape = self.levels[level].shape
+        return (x0 // factor, y0 // factor,
+                min(-(-x1 // factor), shape[0]), min(-(-y1 // factor), shape[1]))
+    
+    def region_counts(self, level, x0, y0, x1, y1):
+        """Retorna la vista de conteos del nivel que cubre las celdas [x0, x1) x [y0, y1)"""
+        bx0, by0, bx1, by1 = self.region_bounds(level, x0, y0, x1, y1)
+        return self.levels[level][bx0:bx1, by0:by1]
+    
+    def region_visits(self, x0, y0, x1, y1, max_blocks=4096):
+        """
+        Estima (por exceso) las visitas dentro de [x0, x1) x [y0, y1)
+        
+        Usa el nivel más fino cuya región no supere max_blocks bloques, así
+        que el costo no depende del tamaño de la región.
+        """
+        for level in range(len(self.levels)):
+            bx0, by0, bx1, by1 = self.region_bounds(level, x0, y0, x1, y1)
+            if (bx1 - bx0) * (by1 - by0) <= max_blocks or level == len(self.levels) - 1:
+                return int(self.levels[level][bx0:bx1, by0:by1].sum())
+    
+    @property
+    def nbytes(self):
+        """Memoria de los arreglos de conteo en bytes"""
+        return (sum(level.nbytes for level in self.levels)
+                + self._first_visit.nbytes)
+    
+    def coverage(self):
+        """Retorna la fracción del grid visitada al menos una vez"""
+        return self.distinct_cells / (self.grid_width * self.grid_height)
\ No newline at end of file
@@ -1,9 +1,13 @@
-import random
+import numpy as np
+from models.trajectory import Trajectory
+from models.moves import MOVE_DIRECTIONS, MoveSource
+from models.rejections import RejectionLog
+from models.sampler import resolve_rejection
 
 class Particle:
     """Clase que representa una partícula en una caminata aleatoria con reemplazo (SWR)"""
     
-    def __init__(self, x, y, step_size=1):
+    def __init__(self, x, y, step_size=1, moves=None, path_dtype=np.int32):
         """
         Inicializa la partícula
         
@@ -11,14 +15,19 @@ class Particle:
             x: Posición inicial en x
             y: Posición inicial en y
             step_size: Tamaño del paso
+            moves: MoveSource del que se sortean los movimientos (None = uno nuevo)
+            path_dtype: Tipo entero con que se guarda el historial
         """
         self.x = x
         self.y = y
         self.step_size = step_size
-        self.path = [(x, y)]  # Historial de posiciones visitadas
+        self.moves = moves if moves is not None else MoveSource()
+        self.path = Trajectory(x, y, dtype=path_dtype)  # Historial de posiciones visitadas
         self.valid_steps = 0  # Pasos válidos dados (dentro del grid)
         self.invalid_steps = 0  # Pasos inválidos (intentos de salirse)
-        self.invalid_attempts = []  # Lista de intentos inválidos para visualizar
+        self.rejections = RejectionLog()  # Intentos inválidos agregados (memoria acotada)
+        self.record_history = True  # False: no guarda el camino en memoria
+        self.neighbours = None  # NeighbourTable: resuelve los rechazos de una vez (muestreo sin rechazo)
         
     def get_random_move(self):
         """
@@ -27,14 +36,9 @@ class Particle:
         Returns:
             Tupla (dx, dy) con el movimiento aleatorio
         """
-        moves = [
-            (self.step_size, 0),   # Derecha
-            (-self.step_size, 0),  # Izquierda
-            (0, self.step_size),   # Abajo
-            (0, -self.step_size)   # Arriba
-        ]
+        dx, dy = MOVE_DIRECTIONS[self.moves.next_code()]
         
-        return random.choice(moves)
+        return (dx * self.step_size, dy * self.step_size)
     
     def is_valid_position(self, x, y, grid_width, grid_height):
         """
@@ -53,63 +57,89 @@ class Particle:
         - Si el movimiento está dentro del grid: es VÁLIDO y se ejecuta
         - Si el movimiento sale del grid: es INVÁLIDO y NO se ejecuta (no cuenta)
         
+        Con self.neighbours (muestreo sin rechazo), un intento inválido no
+        termina la llamada: los intentos inválidos que le siguen y el
+        movimiento aceptado se sortean de una vez (ver resolve_rejection) y
+        se registran por rachas de igual dirección.
+        
         Returns:
             dict con información del movimiento: {
                 'success': bool,
                 'attempted_position': (x, y),
-                'current_position': (x, y)
+                'current_position': (x, y),
+                'direction': int,  # Código de dirección (índice en MOVE_DIRECTIONS)
+                'rejected': int,   # Intentos inválidos resueltos antes de moverse (solo si success)
+                'rejected_runs': tuple  # Rachas (dirección, intentos) de esos intentos
             }
         """
         # Generar movimiento aleatorio
-        dx, dy = self.get_random_move()
-        new_x = self.x + dx
-        new_y = self.y + dy
+        direction = self.moves.next_code()
+        dx, dy = MOVE_DIRECTIONS[direction]
+        new_x = self.x + dx * self.step_size
+        new_y = self.y + dy * self.step_size
+        rejected = 0
+        rejected_runs = ()
+        
+        if self.neighbours is not None and not self.is_valid_position(new_x, new_y, grid_width, grid_height):
+            # Muestreo sin rechazo: la racha de intentos inválidos se resuelve analíticamente
+            direction, rejected_runs = resolve_rejection(self.neighbours, self.x, self.y,
+                                                         direction, self.moves)
+            for rejected_direction, count in rejected_runs:
+                self.rejections.record(self.x, self.y, rejected_direction, self.step_size,
+                                       self.valid_steps, count)
+                rejected += count
+            self.invalid_steps += rejected
+            dx, dy = MOVE_DIRECTIONS[direction]
+            new_x = self.x + dx * self.step_size
+            new_y = self.y + dy * self.step_size
         
         # Verificar si el movimiento es válido (dentro del grid)
         if self.is_valid_position(new_x, new_y, grid_width, grid_height):
             # Movimiento VÁLIDO: actualizar posición
             self.x = new_x
             self.y = new_y
-            self.path.append((self.x, self.y))
+            if self.record_history:
+                self.path.append(self.x, self.y)
             self.valid_steps += 1
             return {
                 'success': True,
                 'attempted_position': (new_x, new_y),
-                'current_position': (self.x, self.y)
+                'current_position': (self.x, self.y),
+                'direction': direction,
+                'rejected': rejected,
+                'rejected_runs': rejected_runs
             }
         else:
             # Movimiento INVÁLIDO: no se mueve, guardar intento para visualizar
+            self.rejections.record(self.x, self.y, direction, self.step_size, self.valid_steps)
             self.invalid_steps += 1
-            self.invalid_attempts.append({
-                'from': (self.x, self.y),
-                'to': (new_x, new_y)
-            })
             return {
                 'success': False,
                 'attempted_position': (new_x, new_y),
-                'current_position': (self.x, self.y)
+                'current_position': (self.x, self.y),
+                'direction': direction
             }
     
     def reset(self, x, y):
         """Reinicia la partícula a una posición inicial"""
         self.x = x
         self.y = y
-        self.path = [(x, y)]
+        self.path.reset(x, y)
         self.valid_steps = 0
         self.invalid_steps = 0
-        self.invalid_attempts = []
+        self.rejections.reset()
     
     def get_position(self):
         """Retorna la posición actual"""
         return (self.x, self.y)
     
     def get_path(self):
-        """Retorna el camino completo recorrido"""
-        return self.path.copy()
+        """Retorna el camino completo recorrido (vista Nx2 de solo lectura, sin copia)"""
+        return self.path.view()
     
     def get_invalid_attempts(self):
-        """Retorna la lista de intentos inválidos"""
-        return self.invalid_attempts.copy()
+        """Retorna los intentos inválidos más recientes (ver RejectionLog.recent)"""
+        return self.rejections.recent()
     
     def get_stats(self):
         """Retorna estadísticas de la partícula"""
@@ -0,0 +1,118 @@
+import time
+import functools
+
+class Profiler:
+    """Instrumentación opcional de los métodos críticos (tiempos por fase y contadores)"""
+    
+    def __init__(self):
+        """
+        Inicializa el profiler vacío
+        
+        No agrega ningún costo mientras no se instrumente nada: instrument()
+        reemplaza el método solo en la instancia dada y remove() lo devuelve
+        a la versión original de la clase.
+        """
+        self._wrapped = []  # (objeto, nombre del método) instrumentados
+        self.reset()
+    
+    def reset(self):
+        """Borra los tiempos y contadores acumulados"""
+        self.phases = {}    # fase -> [llamadas, segundos totales, segundos máximo, segundos último]
+        self.counters = {}  # nombre -> valor acumulado
+        self._started = time.perf_counter()
+        self._last_sample = (self._started, 0)
+    
+    @property
+    def enabled(self):
+        """True si hay métodos instrumentados"""
+        return bool(self._wrapped)
+    
+    def instrument(self, obj, method, phase=None, after=None):
+        """
+        Mide cada llamada a obj.method como la fase `phase`
+        
+        Args:
+            obj: Instancia a instrumentar
+            method: Nombre del método
+            phase: Nombre de la fase (None = nombre del método)
+            after: Función opcional after(result) llamada tras cada llamada
+                   (para actualizar contadores)
+        """
+        original = getattr(obj, method)
+        phase = phase or method
+        record = self.record
+        
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = original(*args, **kwargs)
+            record(phase, time.perf_counter() - started)
+            if after is not None:
+                after(result)
+            return result
+        
+        setattr(obj, method, wrapper)
+        self._wrapped.append((obj, method))
+    
+    def remove(self):
+        """Quita toda la instrumentación (los métodos vuelven a ser los de la clase)"""
+        for obj, method in reversed(self._wrapped):
+            try:
+                delattr(obj, method)
+            except AttributeError:
+                pass
+        self._wrapped = []
+    
+    def record(self, phase, seconds):
+        """Acumula una medición de la fase"""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = [0, 0.0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[3] = seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+    
+    def add(self, counter, n=1):
+        """Suma n al contador"""
+        self.counters[counter] = self.counters.get(counter, 0) + n
+    
+    def get_stats(self):
+        """
+        Retorna los tiempos y contadores como un dict plano (apto para CSV)
+        
+        Por cada fase: '<fase>_calls', '<fase>_ms_total', '<fase>_ms_mean',
+        '<fase>_ms_max' y '<fase>_ms_last'; además cada contador por su nombre.
+        'steps_per_second' se calcula con el contador 'measured_steps' desde la
+        llamada anterior a get_stats() (o desde reset()).
+        """
+        stats = {}
+        for phase, (calls, total, peak, last) in sorted(self.phases.items()):
+            stats[f'{phase}_calls'] = calls
+            stats[f'{phase}_ms_total'] = total * 1000
+            stats[f'{phase}_ms_mean'] = total * 1000 / calls if calls else 0.0
+            stats[f'{phase}_ms_max'] = peak * 1000
+            stats[f'{phase}_ms_last'] = last * 1000
+        stats.update(self.counters)
+        
+        now = time.perf_counter()
+        steps = self.counters.get('measured_steps', 0)
+        last_time, last_steps = self._last_sample
+        elapsed = now - last_time
+        stats['steps_per_second'] = (steps - last_steps) / elapsed if elapsed > 0 else 0.0
+        stats['elapsed_seconds'] = now - self._started
+        self._last_sample = (now, steps)
+        return stats
+    
+    def instrument_simulator(self, simulator):
+        """Instrumenta step() y run_batch() de un Simulator contando los pasos válidos"""
+        def count_step(result):
+            if result['moved']:
+                self.add('measured_steps')
+        
+        def count_batch(result):
+            self.add('measured_steps', result['batch_valid_steps'])
+        
+        self.instrument(simulator, 'step', after=count_step)
+        self.instrument(simulator, 'run_batch', after=count_batch)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import sys
+import numpy as np
+from models.moves import MOVE_DIRECTIONS
+
+# Intentos inválidos recientes que se guardan completos
+RECENT_CAPACITY = 256
+
+class RejectionLog:
+    """Intentos inválidos agregados por celda y dirección, más un buffer circular de los recientes"""
+    
+    def __init__(self, capacity=RECENT_CAPACITY):
+        """
+        Inicializa el registro
+        
+        Solo las celdas a menos de un paso del borde pueden producir intentos
+        inválidos, así que el conteo agregado y el buffer tienen tamaño acotado
+        sin importar cuántos pasos dure la corrida.
+        
+        Args:
+            capacity: Intentos recientes que se guardan completos
+        """
+        self.capacity = capacity
+        self.reset()
+    
+    def reset(self):
+        """Borra todos los intentos registrados"""
+        self.counts = {}  # (x, y, dirección, tamaño del paso) -> intentos
+        self.total = 0
+        self._rows = 0  # Filas escritas en el buffer de recientes
+        # Filas (x, y, dirección, tamaño del paso, paso válido) en orden circular
+        self._recent = np.zeros((self.capacity, 5), dtype=np.int64)
+    
+    def __len__(self):
+        return self.total
+    
+    def record(self, x, y, direction, step_size, step, count=1):
+        """
+        Registra intentos inválidos en O(1)
+        
+        Args:
+            x: Posición en x desde la que se intentó
+            y: Posición en y desde la que se intentó
+            direction: Código de dirección (índice en MOVE_DIRECTIONS)
+            step_size: Tamaño del paso del intento
+            step: Pasos válidos dados al momento del intento
+            count: Intentos seguidos desde la misma celda (el buffer de
+                   recientes guarda una sola fila para todos)
+        """
+        key = (x, y, direction, step_size)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self._recent[self._rows % self.capacity] = key + (step,)
+        self._rows += 1
+        self.total += count
+    
+    def get_state(self):
+        """
+        Retorna el registro como arreglos (para snapshots)
+        
+        Returns:
+            dict con 'keys' (filas x, y, dirección, tamaño del paso),
+            'counts' (intentos de cada fila), 'recent' (buffer circular),
+            'rows' (filas escritas en el buffer) y 'total'
+        """
+        keys = np.array(list(self.counts), dtype=np.int64).reshape(-1, 4)
+        return {
+            'keys': keys,
+            'counts': np.array(list(self.counts.values()), dtype=np.int64),
+            'recent': self._recent.copy(),
+            'rows': self._rows,
+            'total': self.total
+        }
+    
+    def set_state(self, state):
+        """Reemplaza el registro por el de un get_state() (con la misma capacidad)"""
+        recent = np.asarray(state['recent'], dtype=np.int64)
+        if recent.shape != (self.capacity, 5):
+            raise ValueError("El buffer de intentos recientes tiene otra capacidad")
+        keys = np.asarray(state['keys'], dtype=np.int64).tolist()
+        self.counts = dict(zip(map(tuple, keys), np.asarray(state['counts']).tolist()))
+        self._recent = recent.copy()
+        self._rows = state['rows']
+        self.total = state['total']
+    
+    def recent(self):
+        """
+        Retorna los intentos recientes, del más antiguo al más nuevo
+        
+        Returns:
+            Lista de dicts {'from': (x, y), 'to': (x, y), 'step': int}
+        """
+        n = min(self._rows, self.capacity)
+        start = self._rows - n
+        rows = [self._recent[i % self.capacity] for i in range(start, self._rows)]
+        attempts = []
+        for x, y, direction, step_size, step in rows:
+            dx, dy = MOVE_DIRECTIONS[direction]
+            attempts.append({
+                'from': (int(x), int(y)),
+                'to': (int(x + dx * step_size), int(y + dy * step_size)),
+                'step': int(step)
+            })
+        return attempts
+    
+    def markers(self):
+        """
+        Retorna un marcador por celda y dirección con su número de intentos
+        
+        Returns:
+            Lista de tuplas ((x, y), (x_destino, y_destino), intentos)
+        """
+        markers = []
+        for (x, y, direction, step_size), count in self.counts.items():
+            dx, dy = MOVE_DIRECTIONS[direction]
+            markers.append(((x, y), (x + dx * step_size, y + dy * step_size), count))
+        return markers
+    
+    @property
+    def nbytes(self):
+        """Memoria aproximada del registro en bytes"""
+        per_entry = sys.getsizeof((0, 0, 0, 0)) + sys.getsizeof(0)
+        return sys.getsizeof(self.counts) + per_entry * len(self.counts) + self._recent.nbytes
\ No newline at end of file
@@ -0,0 +1,137 @@
+from bisect import bisect_right
+import numpy as np
+from models.moves import MoveSource
+from models.batch import direction_tables, scan_segment, MIN_WINDOW, MAX_WINDOW
+from models.sampler import NeighbourTable, resolve_rejection
+
+class ReplayIndex:
+    """Índice de checkpoints para reconstruir el estado de la caminata en cualquier paso"""
+    
+    def __init__(self, interval=10000, rejection_free=False, seed=None):
+        """
+        Inicializa el índice
+        
+        Cada checkpoint guarda solo (pasos válidos, pasos inválidos, x, y,
+        tamaño del paso, estado del flujo de movimientos) y se toma cada `interval` pasos
+        válidos, así que buscar un paso cuesta a lo sumo `interval` pasos
+        re-simulados y la memoria crece un checkpoint por intervalo.
+        
+        Args:
+            interval: Pasos válidos entre checkpoints
+            rejection_free: Re-simular con muestreo sin rechazo (el mismo
+                            modo que la corrida, ver Simulator)
+            seed: Semilla del flujo de movimientos de la corrida
+        """
+        self.interval = interval
+        self.rejection_free = rejection_free
+        self.checkpoints = []  # Ordenados por pasos válidos
+        self._steps = []       # Pasos válidos de cada checkpoint (para bisect)
+        self._moves = MoveSource(seed)  # Flujo auxiliar para re-simular sin tocar la corrida
+    
+    def reset(self):
+        """Borra todos los checkpoints"""
+        self.checkpoints = []
+        self._steps = []
+    
+    def __len__(self):
+        return len(self.checkpoints)
+    
+    def get_state(self):
+        """Retorna los checkpoints como arreglo (n, 6) de enteros (para snapshots)"""
+        return np.array(self.checkpoints, dtype=np.int64).reshape(-1, 6)
+    
+    def set_state(self, checkpoints):
+        """Reemplaza los checkpoints por los de un get_state()"""
+        self.checkpoints = [tuple(row) for row in np.asarray(checkpoints, dtype=np.int64).tolist()]
+        self._steps = [row[0] for row in self.checkpoints]
+    
+    def next_boundary(self, valid_steps):
+        """Retorna el próximo paso válido en que corresponde un checkpoint"""
+        return (valid_steps // self.interval + 1) * self.interval
+    
+    def record(self, valid_steps, invalid_steps, x, y, step_size, move_state, force=False):
+        """
+        Agrega un checkpoint si valid_steps es múltiplo del intervalo
+        
+        Args:
+            valid_steps: Pasos válidos dados
+            invalid_steps: Intentos inválidos acumulados
+            x: Posición en x
+            y: Posición en y
+            step_size: Tamaño del paso vigente desde este punto
+            move_state: Estado del flujo (MoveSource.get_state())
+            force: Guardar aunque no sea múltiplo (p. ej. al cambiar el tamaño
+                   del paso a mitad de corrida)
+        """
+        if not force and valid_steps % self.interval != 0:
+            return
+        checkpoint = (valid_steps, invalid_steps, x, y, step_size, move_state)
+        if self._steps and self._steps[-1] == valid_steps:
+            if not force:
+                return
+            self.checkpoints[-1] = checkpoint
+        else:
+            self.checkpoints.append(checkpoint)
+            self._steps.append(valid_steps)
+    
+    def seek(self, step, grid_width, grid_height):
+        """
+        Reconstruye el estado justo después del paso válido `step`
+        
+        Parte del checkpoint anterior más cercano y re-simula los pasos que
+        faltan con el mismo motor vectorizado que Simulator.run_batch().
+        
+        Args:
+            step: Paso válido buscado (debe estar cubierto por los checkpoints)
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+        
+        Returns:
+            dict con:
+            {
+                'valid_steps': int,
+                'invalid_steps': int,
+                'position': (x, y)
+            }
+        """
+        if not self.checkpoints:
+            raise ValueError("No hay checkpoints registrados")
+        index = max(bisect_right(self._steps, step) - 1, 0)
+        valid, invalid, x, y, step_size, move_state = self.checkpoints[index]
+        moves = self._moves
+        moves.set_state(move_state)
+        dx_table, dy_table = direction_tables(step_size)
+        neighbours = NeighbourTable(grid_width, grid_height, step_size) if self.rejection_free else None
+        
+        remaining = step - valid
+        window = MAX_WINDOW
+        while remaining > 0:
+            block = moves.take_block()
+            codes = block[:min(window, remaining)]
+            xs, ys, j = scan_segment(x, y, codes, dx_table, dy_table, grid_width, grid_height)
+            used = min(j, remaining)
+            if used > 0:
+                x, y = int(xs[used - 1]), int(ys[used - 1])
+                remaining -= used
+            if remaining > 0 and j < len(codes):
+                # El intento inválido que cortó la racha también consume un código
+                used += 1
+                window = max(MIN_WINDOW, window // 2)
+                moves.unread(len(block) - used)
+                if neighbours is None:
+                    invalid += 1
+                else:
+                    code, runs = resolve_rejection(neighbours, x, y, int(codes[j]), moves)
+                    invalid += sum(count for _, count in runs)
+                    x += int(dx_table[code])
+                    y += int(dy_table[code])
+                    remaining -= 1
+            else:
+                window = min(MAX_WINDOW, window * 2)
+                moves.unread(len(block) - used)
+        
+        return {
+            'valid_steps': step,
+            'invalid_steps': invalid,
+            'position': (x, y)
+        }
\ No newline at end of file
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from models.simulator import Simulator
+
+# Réplicas que procesa cada tarea enviada al pool
+SHARD_SIZE = 64
+
+
+def _run_shard(grid_width, grid_height, step_size, max_steps, seeds, stop_condition=None,
+               sampler='exact'):
+    """
+    Ejecuta un grupo de réplicas dentro de un proceso del pool
+    
+    Returns:
+        Lista de tuplas (valid_steps, invalid_steps, x, y, stop_step) en el
+        mismo orden que las semillas recibidas (stop_step es None si no
+        ocurrió el evento de término)
+    """
+    results = []
+    for seed in seeds:
+        simulator = Simulator(grid_width, grid_height, step_size, seed=seed, observables=(),
+                              sampler=sampler)
+        simulator.set_max_steps(max_steps)
+        if stop_condition is not None:
+            simulator.add_stop_condition(*stop_condition)
+        simulator.run_batch()
+        x, y = simulator.particle.get_position()
+        results.append((simulator.particle.valid_steps,
+                        simulator.particle.invalid_steps, x, y, simulator.stop_step))
+    return results
+
+
+def merge_stats(runs, grid_width, grid_height, max_steps, stop_condition=None):
+    """
+    Combina los resultados por réplica en estadísticas del ensamble
+    
+    Las réplicas se recorren siempre en su orden original, así que el
+    resultado no depende de cómo se repartieron entre procesos.
+    
+    Args:
+        runs: Lista de tuplas (valid_steps, invalid_steps, x, y, stop_step) por réplica
+        grid_width: Ancho del grid
+        grid_height: Alto del grid
+        max_steps: Pasos válidos objetivo de cada réplica
+        stop_condition: Condición de término usada, si hubo (ver run_ensemble)
+    
+    Returns:
+        dict con las estadísticas agregadas
+    """
+    start_x = grid_width // 2
+    start_y = grid_height // 2
+    n_runs = len(runs)
+    
+    valid = sum(r[0] for r in runs)
+    invalid = sum(r[1] for r in runs)
+    invalid_sq = sum(r[1] * r[1] for r in runs)
+    displacement_sq = sum((r[2] - start_x) ** 2 + (r[3] - start_y) ** 2 for r in runs)
+    total = valid + invalid
+    
+    mean_invalid = invalid / n_runs if n_runs else 0.0
+    var_invalid = invalid_sq / n_runs - mean_invalid ** 2 if n_runs else 0.0
+    
+    stats = {
+        'valid_steps': valid,
+        'invalid_steps': invalid,
+        'total_attempts': total,
+        'max_steps': max_steps,
+        'n_runs': n_runs,
+        'mean_invalid_steps': mean_invalid,
+        'std_invalid_steps': max(var_invalid, 0.0) ** 0.5,
+        'efficiency': valid / total if total > 0 else 0.0,
+        'mean_squared_displacement': displacement_sq / n_runs if n_runs else 0.0
+    }
+    
+    if stop_condition is not None:
+        # Tiempos del evento (cobertura o primer paso) de las réplicas que lo alcanzaron
+        times = [r[4] for r in runs if r[4] is not None]
+        mean_time = sum(times) / len(times) if times else None
+        stats['stop_condition'] = stop_condition[0]
+        stats['events'] = len(times)
+        stats['mean_stop_step'] = mean_time
+        stats['std_stop_step'] = (max(sum(t * t for t in times) / len(times) - mean_time ** 2, 0.0) ** 0.5
+                                  if times else None)
+    return stats
+
+
+def run_ensemble(grid_width, grid_height, n_runs, max_steps, step_size=1,
+                 seed=None, workers=None, stop_condition=None, sampler='exact'):
+    """
+    Ejecuta n_runs simulaciones SWR independientes repartidas en un pool de procesos
+    
+    De una sola semilla maestra se deriva (SeedSequence.spawn) un flujo
+    aleatorio independiente por réplica. Como cada réplica tiene su propio
+    flujo, el resultado es idéntico bit a bit con cualquier número de procesos.
+    
+    Args:
+        grid_width: Ancho del grid
+        grid_height: Alto del grid
+        n_runs: Número de réplicas
+        max_steps: Pasos válidos objetivo de cada réplica
+        step_size: Tamaño del paso
+        seed: Semilla maestra (None usa entropía del sistema)
+        workers: Procesos del pool (None = todos los núcleos, 1 = sin pool)
+        stop_condition: Tupla (nombre, *args) para Simulator.add_stop_condition;
+                        cada réplica termina en el evento (o en max_steps)
+        sampler: Modo de muestreo de cada réplica (ver Simulator)
+    
+    Returns:
+        dict de merge_stats() más 'seed' (entropía de la semilla maestra,
+        para poder repetir la corrida)
+    """
+    master = np.random.SeedSequence(seed)
+    seeds = master.spawn(n_runs)
+    shards = [seeds[i:i + SHARD_SIZE] for i in range(0, n_runs, SHARD_SIZE)]
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    if workers <= 1 or len(shards) <= 1:
+        shard_results = [_run_shard(grid_width, grid_height, step_size, max_steps, s,
+                                    stop_condition, sampler)
+                         for s in shards]
+    else:
+        n = len(shards)
+        with ProcessPoolExecutor(max_workers=min(workers, n)) as executor:
+            # map() devuelve los resultados en el orden de los grupos
+            shard_results = list(executor.map(_run_shard,
+                                              [grid_width] * n, [grid_height] * n,
+                                              [step_size] * n, [max_steps] * n,
+                                              shards, [stop_condition] * n, [sampler] * n))
+    
+    runs = [run for shard in shard_results for run in shard]
+    stats = merge_stats(runs, grid_width, grid_height, max_steps, stop_condition)
+    stats['seed'] = master.entropy
+    return stats
\ No newline at end of file
@@ -0,0 +1,113 @@
+import math
+import numpy as np
+from models.moves import MOVE_DIRECTIONS
+
+# Modos de muestreo de Simulator
+SAMPLERS = ('exact', 'rejection_free')
+
+# Bit de cada código de dirección en la máscara de movimientos válidos
+_BITS = [1 << code for code in range(len(MOVE_DIRECTIONS))]
+
+# Códigos válidos para cada máscara posible de 4 bits
+VALID_CODES = tuple(tuple(code for code, bit in enumerate(_BITS) if mask & bit)
+                    for mask in range(1 << len(MOVE_DIRECTIONS)))
+
+# Máscara con las 4 direcciones
+_ALL_MASK = (1 << len(MOVE_DIRECTIONS)) - 1
+
+# Bits de la palabra de resolve_rejection usados para la dirección aceptada (los
+# bajos); el resto (los altos) da el uniforme de la geométrica
+_DIRECTION_BITS = 24
+_DIRECTION_MASK = (1 << _DIRECTION_BITS) - 1
+_GEOMETRIC_SCALE = 2.0 ** -(64 - _DIRECTION_BITS)
+
+# log(1 - k/4) para k movimientos válidos (k = 4 no se rechaza nunca)
+_LOG_REJECT = tuple(math.log1p(-k / len(MOVE_DIRECTIONS)) if k < len(MOVE_DIRECTIONS) else -math.inf
+                    for k in range(len(MOVE_DIRECTIONS) + 1))
+
+class NeighbourTable:
+    """Movimientos válidos de cada celda, precalculados por eje"""
+    
+    def __init__(self, grid_width, grid_height, step_size):
+        """
+        Arma las máscaras de movimientos válidos
+        
+        Derecha/izquierda solo dependen de x y abajo/arriba solo de y, así que
+        basta una máscara por columna y otra por fila (memoria O(ancho + alto)).
+        
+        Args:
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+            step_size: Tamaño del paso
+        """
+        self.step_size = step_size
+        mask_x = np.zeros(grid_width, dtype=np.uint8)
+        mask_y = np.zeros(grid_height, dtype=np.uint8)
+        for code, (dx, dy) in enumerate(MOVE_DIRECTIONS):
+            if dx:
+                x = np.arange(grid_width) + dx * step_size
+                mask_x[(x >= 0) & (x < grid_width)] |= _BITS[code]
+            else:
+                y = np.arange(grid_height) + dy * step_size
+                mask_y[(y >= 0) & (y < grid_height)] |= _BITS[code]
+        self.mask_x = mask_x.tolist()
+        self.mask_y = mask_y.tolist()
+    
+    def valid_codes(self, x, y):
+        """Retorna los códigos de los movimientos válidos desde (x, y)"""
+        return VALID_CODES[self.mask_x[x] | self.mask_y[y]]
+
+
+def resolve_rejection(table, x, y, code, moves):
+    """
+    Resuelve de una vez los intentos inválidos que siguen a uno ya sorteado
+    
+    Con k movimientos válidos de 4, cada intento se acepta con probabilidad
+    p = k/4: los intentos inválidos adicionales siguen una distribución
+    geométrica de parámetro p y el movimiento aceptado es uniforme entre los
+    k válidos. Ambos salen de una sola palabra de 64 bits del flujo (los 40
+    bits altos para la geométrica y los 24 bajos para la dirección), así que
+    valid_steps e invalid_steps tienen la misma distribución que el muestreo
+    exacto. La dirección de cada intento inválido adicional es uniforme entre
+    las inválidas; solo se sortea (un código por intento) cuando hay más de
+    una posible.
+    
+    Args:
+        table: NeighbourTable del grid y el tamaño de paso vigentes
+        x: Posición en x desde la que se intentó
+        y: Posición en y desde la que se intentó
+        code: Código del intento inválido ya sorteado
+        moves: MoveSource del que se sortea
+    
+    Returns:
+        Tupla (código del movimiento aceptado, rachas) donde rachas es una
+        tupla de (dirección, intentos inválidos consecutivos en esa dirección),
+        en orden e incluyendo el intento ya sorteado
+    """
+    mask = table.mask_x[x] | table.mask_y[y]
+    valid = VALID_CODES[mask]
+    if not valid:
+        raise ValueError(f"No hay movimientos válidos desde ({x}, {y}) con paso {table.step_size}")
+    k = len(valid)
+    word = moves.next_word()
+    uniform = ((word >> _DIRECTION_BITS) + 0.5) * _GEOMETRIC_SCALE
+    extra = int(math.log(uniform) / _LOG_REJECT[k])
+    accepted = valid[((word & _DIRECTION_MASK) * k) >> _DIRECTION_BITS]
+    
+    invalid = VALID_CODES[~mask & _ALL_MASK]
+    if extra == 0 or len(invalid) == 1:
+        return accepted, ((code, 1 + extra),)
+    runs = [[code, 1]]
+    for _ in range(extra):
+        if len(invalid) == 2:
+            direction = invalid[moves.next_code() & 1]
+        else:
+            index = moves.next_code()
+            while index == 3:
+                index = moves.next_code()
+            direction = invalid[index]
+        if direction == runs[-1][0]:
+            runs[-1][1] += 1
+        else:
+            runs.append([direction, 1])
+    return accepted, tuple((direction, count) for direction, count in runs)
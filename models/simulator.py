@@ -1,9 +1,29 @@
+import numpy as np
 from models.particle import Particle
+from models.moves import MoveSource, SNAPSHOT_VERSION as MOVES_SNAPSHOT_VERSION
+from models.batch import direction_tables, scan_segment, MIN_WINDOW, MAX_WINDOW
+from models.replay import ReplayIndex
+from models.trajectory import Trajectory
+from models.occupancy import OccupancyGrid
+from models.stream import TrajectoryWriter
+from models.observables import OBSERVABLES, DEFAULT_OBSERVABLES
+from models.conditions import STOP_CONDITIONS
+from models.sampler import SAMPLERS, NeighbourTable, resolve_rejection
+from models.events import EventBus
+from models.snapshot import write_snapshot, read_snapshot, DEFAULT_LEVEL
+
+# Posiciones que run_batch acumula antes de volcarlas al historial/disco
+STAGE_SIZE = 65536
+
+# Versión del motor: cambiarla cuando una misma semilla deje de producir la
+# misma corrida (invalida los resultados guardados en ResultCache)
+ENGINE_VERSION = 2
 
 class Simulator:
     """Clase que maneja la simulación de la caminata aleatoria con reemplazo (SWR)"""
     
-    def __init__(self, grid_width, grid_height, step_size=1):
+    def __init__(self, grid_width, grid_height, step_size=1, seed=None, checkpoint_interval=10000,
+                 observables=DEFAULT_OBSERVABLES, sampler='exact'):
         """
         Inicializa el simulador
         
@@ -11,31 +31,194 @@ class Simulator:
             grid_width: Ancho del grid
             grid_height: Alto del grid
             step_size: Tamaño del paso
+            seed: Semilla (int o np.random.SeedSequence) para reproducir la
+                  corrida; None usa entropía del sistema
+            checkpoint_interval: Pasos válidos entre checkpoints de repetición
+                                 (ver state_at)
+            observables: Observables a calcular en línea (nombres de
+                         OBSERVABLES o instancias de Observable)
+            sampler: 'exact' sortea un código por intento; 'rejection_free'
+                     resuelve cada racha de intentos inválidos con un solo
+                     sorteo (misma distribución de pasos válidos e inválidos,
+                     otra corrida para la misma semilla)
         """
+        if sampler not in SAMPLERS:
+            raise ValueError(f"Muestreo desconocido: {sampler}")
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.step_size = step_size
         
+        # Un solo flujo de movimientos derivado de la semilla: step() y
+        # run_batch() lo consumen igual, así que la corrida no depende del modo
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed = seed
+        self.moves = MoveSource(seed)
+        
         # Iniciar partícula en el centro
         start_x = grid_width // 2
         start_y = grid_height // 2
-        self.particle = Particle(start_x, start_y, step_size)
+        path_dtype = Trajectory.dtype_for_grid(grid_width, grid_height)
+        self.particle = Particle(start_x, start_y, step_size, moves=self.moves,
+                                 path_dtype=path_dtype)
+        self.sampler = sampler
+        self._update_neighbours()
+        
+        # Conteo de visitas por celda (la posición inicial es la visita del paso 0)
+        self.occupancy = OccupancyGrid(grid_width, grid_height)
+        self.occupancy.record(start_x, start_y, 0)
+        
+        # Checkpoints para reconstruir cualquier paso ya simulado
+        self.replay = ReplayIndex(checkpoint_interval, rejection_free=sampler == 'rejection_free',
+                                  seed=seed)
+        self._record_checkpoint()
         
         self.max_steps = 0
         self.is_running = False
         self.is_finished = False
+        self.writer = None  # TrajectoryWriter activo (ver stream_to)
+        
+        # Notificaciones 'step' (resultado de step()), 'progress' (resultado
+        # de run_batch()) y 'reset' para quien siga la corrida
+        self.events = EventBus()
+        
+        # Eventos que terminan la corrida antes de max_steps (ver add_stop_condition)
+        self.stop_conditions = []
+        self.stop_reason = None  # Nombre de la condición que terminó la corrida
+        self.stop_step = None    # Paso válido en que ocurrió
+        
+        # Cantidades físicas acumuladas en línea (ver track)
+        self.observables = {}
+        for observable in observables:
+            self.track(observable)
         
     def set_max_steps(self, max_steps):
         """Establece el número máximo de pasos VÁLIDOS"""
         self.max_steps = max_steps
         
+    def track(self, observable):
+        """
+        Agrega un observable a calcular en línea
+        
+        Si la corrida ya empezó, el observable toma la posición actual como
+        paso 0.
+        
+        Args:
+            observable: Nombre en OBSERVABLES o instancia de Observable
+        
+        Returns:
+            La instancia registrada
+        """
+        if isinstance(observable, str):
+            if observable not in OBSERVABLES:
+                raise ValueError(f"Observable desconocido: {observable}")
+            observable = OBSERVABLES[observable]()
+        observable.reset(self)
+        self.observables[observable.name] = observable
+        return observable
+    
+    def untrack(self, name):
+        """Deja de calcular el observable con ese nombre"""
+        self.observables.pop(name, None)
+    
+    def add_stop_condition(self, condition, *args):
+        """
+        Agrega un evento que termina la corrida en el paso exacto en que ocurre
+        
+        max_steps sigue siendo el límite si el evento no llega a ocurrir.
+        
+        Args:
+            condition: Nombre en STOP_CONDITIONS ('cover', 'boundary',
+                       'target') o instancia de StopCondition
+            *args: Argumentos del constructor si se pasa un nombre
+                   (p. ej. fracción para 'cover' o x, y para 'target')
+        
+        Returns:
+            La instancia registrada
+        """
+        if isinstance(condition, str):
+            if condition not in STOP_CONDITIONS:
+                raise ValueError(f"Condición de término desconocida: {condition}")
+            condition = STOP_CONDITIONS[condition](*args)
+        condition.reset(self)
+        self.stop_conditions.append(condition)
+        
+        # El evento puede cumplirse ya en la posición actual
+        x, y = self.particle.get_position()
+        if condition.scan(np.array([x]), np.array([y])) >= 0:
+            self._stop(condition, self.particle.valid_steps)
+        return condition
+    
+    def clear_stop_conditions(self):
+        """Quita todas las condiciones de término"""
+        self.stop_conditions = []
+    
+    def _stop(self, condition, step):
+        """Termina la corrida por una condición cumplida en el paso dado"""
+        self.stop_reason = condition.name
+        self.stop_step = step
+        self.is_finished = True
+    
+    def _scan_stop_conditions(self, xs, ys):
+        """
+        Busca el primer evento de término en un tramo y registra lo aceptado
+        
+        Returns:
+            Tupla (índice del evento en el tramo o -1, condición o None)
+        """
+        first, hit = -1, None
+        for condition in self.stop_conditions:
+            index = condition.scan(xs, ys)
+            if index >= 0 and (first < 0 or index < first):
+                first, hit = index, condition
+        accepted = len(xs) if first < 0 else first + 1
+        for condition in self.stop_conditions:
+            condition.commit(xs[:accepted], ys[:accepted])
+        return first, hit
+    
+    def set_step_size(self, step_size):
+        """
+        Cambia el tamaño del paso (también a mitad de corrida)
+        
+        No se permite con una trayectoria abierta con stream_to(): la cabecera
+        de los archivos guarda un único tamaño de paso.
+        
+        Raises:
+            ValueError: Si hay una trayectoria abierta y el tamaño cambia
+        """
+        if self.writer is not None and step_size != self.step_size:
+            raise ValueError("No se puede cambiar el tamaño del paso con una trayectoria abierta "
+                             "(cerrarla antes con close_stream())")
+        self.step_size = step_size
+        self.particle.step_size = step_size
+        self._update_neighbours()
+        # Los pasos siguientes se re-simulan con el nuevo tamaño
+        self._record_checkpoint(force=True)
+        
+    def _update_neighbours(self):
+        """Arma la tabla de movimientos válidos del muestreo sin rechazo para el paso vigente"""
+        if self.sampler == 'rejection_free':
+            self.particle.neighbours = NeighbourTable(self.grid_width, self.grid_height, self.step_size)
+        
     def reset(self):
         """Reinicia la simulación"""
         start_x = self.grid_width // 2
         start_y = self.grid_height // 2
+        self.close_stream()
         self.particle.reset(start_x, start_y)
+        self.occupancy.reset()
+        self.occupancy.record(start_x, start_y, 0)
+        self.replay.reset()
+        self._record_checkpoint()
+        for observable in self.observables.values():
+            observable.reset(self)
         self.is_running = False
         self.is_finished = False
+        self.stop_reason = None
+        self.stop_step = None
+        for condition in self.stop_conditions:
+            condition.reset(self)
+        self.events.publish('reset')
         
     def step(self):
         """
@@ -75,11 +258,30 @@ class Simulator:
         
         stats = self.particle.get_stats()
         
+        x, y = move_result['current_position']
+        if move_result['success']:
+            self.occupancy.record(x, y, stats['valid_steps'])
+            if self.writer is not None:
+                self.writer.write_position(x, y)
+            for observable in self.observables.values():
+                observable.update(x, y)
+            self._record_checkpoint()
+            if self.stop_conditions:
+                index, condition = self._scan_stop_conditions(np.array([x]), np.array([y]))
+                if index >= 0:
+                    self._stop(condition, stats['valid_steps'])
+        if self.writer is not None:
+            if not move_result['success']:
+                self.writer.write_invalid(stats['valid_steps'], move_result['direction'])
+            else:
+                for direction, count in move_result['rejected_runs']:
+                    self.writer.write_invalid(stats['valid_steps'] - 1, direction, count)
+        
         # Verificar si alcanzó el máximo de pasos VÁLIDOS
         if stats['valid_steps'] >= self.max_steps:
             self.is_finished = True
         
-        return {
+        result = {
             'moved': move_result['success'],
             'position': move_result['current_position'],
             'attempted_position': move_result['attempted_position'],
@@ -87,19 +289,399 @@ class Simulator:
             'invalid_steps': stats['invalid_steps'],
             'finished': self.is_finished
         }
+        self.events.publish('step', result)
+        return result
+    
+    def run_batch(self, n_valid_steps=None):
+        """
+        Ejecuta muchos pasos SWR de una vez con el motor vectorizado de NumPy
+        
+        Mantiene exactamente la semántica de step(): solo cuentan los pasos
+        válidos, los intentos de salirse se registran como inválidos y la
+        simulación termina al alcanzar max_steps o, si hay condiciones de
+        término, exactamente en el paso en que ocurre el evento.
+        
+        Args:
+            n_valid_steps: Pasos válidos a dar (None = hasta max_steps)
+        
+        Returns:
+            dict con el resultado del lote:
+            {
+                'moved': bool,              # Si la partícula se movió
+                'position': (x, y),         # Posición actual
+                'valid_steps': int,         # Pasos válidos acumulados
+                'invalid_steps': int,       # Intentos inválidos acumulados
+                'batch_valid_steps': int,   # Pasos válidos de este lote
+                'batch_invalid_steps': int, # Intentos inválidos de este lote
+                'finished': bool            # Si alcanzó el objetivo
+            }
+        """
+        particle = self.particle
+        target = self.max_steps - particle.valid_steps
+        if n_valid_steps is not None:
+            target = min(target, n_valid_steps)
+        
+        filled = 0
+        n_invalid = 0
+        
+        if target > 0 and not self.is_finished:
+            if particle.record_history:
+                particle.path.reserve(target)
+            
+            # Se avanza por tramos que terminan en cada frontera de checkpoint
+            while filled < target and not self.is_finished:
+                boundary = self.replay.next_boundary(particle.valid_steps)
+                n = min(target - filled, boundary - particle.valid_steps)
+                valid, invalid = self._advance(n)
+                particle.valid_steps += valid
+                particle.invalid_steps += invalid
+                filled += valid
+                n_invalid += invalid
+                self._record_checkpoint()
+        
+        if particle.valid_steps >= self.max_steps:
+            self.is_finished = True
+        
+        result = {
+            'moved': filled > 0,
+            'position': particle.get_position(),
+            'valid_steps': particle.valid_steps,
+            'invalid_steps': particle.invalid_steps,
+            'batch_valid_steps': filled,
+            'batch_invalid_steps': n_invalid,
+            'finished': self.is_finished
+        }
+        self.events.publish('progress', result)
+        return result
+    
+    def _advance(self, target):
+        """
+        Da exactamente `target` pasos válidos con el motor vectorizado
+        
+        Actualiza la posición de la partícula y vuelca historial, visitas e
+        intentos inválidos; los contadores los actualiza quien llama.
+        
+        Returns:
+            Tupla (pasos válidos, intentos inválidos) de este tramo; si ocurre
+            un evento de término el tramo se corta en ese paso
+        """
+        particle = self.particle
+        neighbours = particle.neighbours
+        dx_table, dy_table = direction_tables(self.step_size)
+        
+        # Las posiciones se acumulan en un bloque preasignado y se vuelcan juntas
+        stage_x = np.empty(min(target, STAGE_SIZE), dtype=np.int64)
+        stage_y = np.empty(min(target, STAGE_SIZE), dtype=np.int64)
+        staged = 0
+        first_step = particle.valid_steps + 1
+        x, y = particle.x, particle.y
+        filled = 0
+        n_invalid = 0
+        window = MAX_WINDOW
+        stop = None
+        
+        while filled < target and stop is None:
+            block = self.moves.take_block()
+            codes = block[:min(window, target - filled)]
+            xs, ys, j = scan_segment(x, y, codes, dx_table, dy_table,
+                                     self.grid_width, self.grid_height)
+            if self.stop_conditions and j > 0:
+                index, condition = self._scan_stop_conditions(xs, ys)
+                if index >= 0:
+                    # El tramo termina en el paso del evento; el resto no se consume
+                    j = index + 1
+                    codes = codes[:j]
+                    stop = (condition, particle.valid_steps + filled + j)
+            used = j
+            resolved = None
+            if j < len(codes):
+                # Racha cortada por un intento que sale del grid
+                bx, by = (int(xs[j - 1]), int(ys[j - 1])) if j > 0 else (x, y)
+                step = particle.valid_steps + filled + j
+                code = int(codes[j])
+                used += 1
+                window = max(MIN_WINDOW, window // 2)
+                self.moves.unread(len(block) - used)
+                if neighbours is None:
+                    self._record_invalid(bx, by, code, step)
+                    n_invalid += 1
+                else:
+                    # Muestreo sin rechazo: los intentos inválidos restantes y el
+                    # movimiento aceptado salen de un solo sorteo
+                    accepted, runs = resolve_rejection(neighbours, bx, by, code, self.moves)
+                    for direction, count in runs:
+                        self._record_invalid(bx, by, direction, step, count)
+                        n_invalid += count
+                    resolved = (bx + int(dx_table[accepted]), by + int(dy_table[accepted]))
+                    if self.stop_conditions:
+                        index, condition = self._scan_stop_conditions(np.array(resolved[:1]),
+                                                                      np.array(resolved[1:]))
+                        if index >= 0:
+                            stop = (condition, step + 1)
+            else:
+                window = min(MAX_WINDOW, window * 2)
+                self.moves.unread(len(block) - used)
+            
+            done = 0
+            while done < j:
+                n = min(j - done, len(stage_x) - staged)
+                stage_x[staged:staged + n] = xs[done:done + n]
+                stage_y[staged:staged + n] = ys[done:done + n]
+                staged += n
+                done += n
+                if staged == len(stage_x):
+                    self._commit_positions(stage_x, stage_y, first_step)
+                    first_step += staged
+                    staged = 0
+            if j > 0:
+                x, y = int(xs[j - 1]), int(ys[j - 1])
+                filled += j
+            if resolved is not None:
+                # Movimiento aceptado tras la racha de intentos inválidos
+                x, y = resolved
+                stage_x[staged], stage_y[staged] = x, y
+                staged += 1
+                filled += 1
+                if staged == len(stage_x):
+                    self._commit_positions(stage_x, stage_y, first_step)
+                    first_step += staged
+                    staged = 0
+        
+        self._commit_positions(stage_x[:staged], stage_y[:staged], first_step)
+        particle.x, particle.y = x, y
+        if stop is not None:
+            self._stop(*stop)
+        return filled, n_invalid
+    
+    def _record_checkpoint(self, force=False):
+        """Guarda un checkpoint si el paso actual es frontera del intervalo (o si se fuerza)"""
+        particle = self.particle
+        self.replay.record(particle.valid_steps, particle.invalid_steps, particle.x, particle.y,
+                           self.step_size, self.moves.get_state(), force)
+    
+    def _commit_positions(self, xs, ys, first_step):
+        """Vuelca un bloque de posiciones válidas en el historial, las visitas y el writer"""
+        if len(xs) == 0:
+            return
+        if self.particle.record_history:
+            self.particle.path.extend(xs, ys)
+        self.occupancy.record_batch(xs, ys, first_step)
+        if self.writer is not None:
+            self.writer.write_positions(xs, ys)
+        for observable in self.observables.values():
+            observable.update_batch(xs, ys)
+    
+    def _record_invalid(self, x, y, direction, step, count=1):
+        """Registra count intentos inválidos desde (x, y) en la dirección dada"""
+        self.particle.rejections.record(x, y, direction, self.step_size, step, count)
+        if self.writer is not None:
+            self.writer.write_invalid(step, direction, count)
+    
+    def stream_to(self, path, keep_history=False, chunk_size=65536):
+        """
+        Escribe la trayectoria en disco por bloques mientras corre la simulación
+        
+        Debe llamarse antes del primer paso, y mientras esté abierta no se
+        puede cambiar el tamaño del paso (ver set_step_size). Sin historial
+        en memoria (keep_history=False) la memoria usada no crece con los
+        pasos; la trayectoria se puede leer después con TrajectoryReader.
+        
+        Args:
+            path: Ruta base de los archivos ('.pos' y '.inv')
+            keep_history: Si también se guarda el camino en memoria
+            chunk_size: Posiciones por bloque antes de volcar a disco
+        
+        Returns:
+            El TrajectoryWriter creado (cerrarlo con close_stream())
+        """
+        if self.particle.valid_steps or self.particle.invalid_steps:
+            raise ValueError("stream_to() debe llamarse antes del primer paso")
+        self.close_stream()
+        self.writer = TrajectoryWriter(path, self.grid_width, self.grid_height, self.step_size,
+                                       self.particle.get_position(), chunk_size)
+        self.particle.record_history = keep_history
+        return self.writer
+    
+    def close_stream(self):
+        """Cierra el archivo de trayectoria (si hay uno) y vuelve a guardar historial en memoria"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.particle.record_history = True
+    
+    def snapshot(self, path, include_path=True, level=DEFAULT_LEVEL):
+        """
+        Guarda el estado completo de la corrida en un archivo binario compacto
+        
+        Incluye la configuración, la posición y los contadores, el estado
+        del flujo de movimientos (semilla y códigos consumidos), las visitas
+        por celda, los intentos inválidos agregados, los checkpoints, los
+        observables y las condiciones de término, así que restore() sigue
+        la corrida exactamente como si no se hubiera interrumpido. Si la
+        trayectoria se está escribiendo en disco (stream_to), se vuelca y
+        se anota hasta dónde llega.
+        
+        Args:
+            path: Archivo de salida (se reemplaza de forma atómica)
+            include_path: Guardar también el camino en memoria (sin él, la
+                          corrida restaurada no guarda historial)
+            level: Nivel de compresión de zlib (0-9)
+        
+        Returns:
+            Bytes escritos
+        
+        Raises:
+            ValueError: Si hay observables o condiciones que no están
+                        registrados por nombre (no se podrían recrear)
+        """
+        observables = []
+        for name, observable in self.observables.items():
+            if OBSERVABLES.get(name) is not type(observable):
+                raise ValueError(f"El observable {name} no se puede guardar en un snapshot")
+            observables.append({'name': name, 'state': observable.get_state()})
+        conditions = []
+        for condition in self.stop_conditions:
+            if STOP_CONDITIONS.get(condition.name) is not type(condition):
+                raise ValueError(f"La condición {condition.name} no se puede guardar en un snapshot")
+            conditions.append({'name': condition.name, 'args': condition.args(),
+                               'state': condition.get_state()})
+        
+        particle = self.particle
+        stream = None
+        if self.writer is not None:
+            n_positions, n_invalid = self.writer.tell()
+            stream = {'path': self.writer.path, 'positions': n_positions, 'invalid': n_invalid,
+                      'chunk_size': self.writer.chunk_size}
+        state = {
+            'engine_version': ENGINE_VERSION,
+            'config': {
+                'grid_width': self.grid_width,
+                'grid_height': self.grid_height,
+                'step_size': self.step_size,
+                'checkpoint_interval': self.replay.interval,
+                'sampler': self.sampler,
+                'max_steps': self.max_steps
+            },
+            'moves': self.moves.snapshot(),
+            'particle': {
+                'x': int(particle.x),
+                'y': int(particle.y),
+                'valid_steps': particle.valid_steps,
+                'invalid_steps': particle.invalid_steps
+            },
+            'path': particle.path.get_state() if include_path and particle.record_history else None,
+            'occupancy': self.occupancy.get_state(),
+            'rejections': particle.rejections.get_state(),
+            'checkpoints': self.replay.get_state(),
+            'observables': observables,
+            'stop_conditions': conditions,
+            'is_finished': self.is_finished,
+            'stop_reason': self.stop_reason,
+            'stop_step': self.stop_step,
+            'stream': stream
+        }
+        return write_snapshot(path, state, level)
+    
+    @classmethod
+    def restore(cls, path):
+        """
+        Crea un simulador que continúa la corrida guardada con snapshot()
+        
+        Si la trayectoria se estaba escribiendo en disco, se reabre y se
+        recorta al punto del snapshot para seguir escribiéndola.
+        
+        Raises:
+            ValueError: Si el snapshot es de otro formato o de otra versión del motor
+        """
+        state = read_snapshot(path)
+        if state.get('engine_version') != ENGINE_VERSION:
+            raise ValueError(f"El snapshot es de otra versión del motor ({state.get('engine_version')}); "
+                             "la corrida no seguiría igual")
+        moves = state['moves']
+        if moves.get('version') != MOVES_SNAPSHOT_VERSION or moves.get('bit_generator') != 'PCG64':
+            raise ValueError("Snapshot de flujo de movimientos no compatible")
+        config = state['config']
+        seed = np.random.SeedSequence(moves['entropy'], spawn_key=tuple(moves['spawn_key']))
+        simulator = cls(config['grid_width'], config['grid_height'], config['step_size'], seed=seed,
+                        checkpoint_interval=config['checkpoint_interval'], observables=(),
+                        sampler=config['sampler'])
+        simulator.max_steps = config['max_steps']
+        simulator.moves.set_state(moves['consumed'])
+        
+        particle = simulator.particle
+        particle.x = state['particle']['x']
+        particle.y = state['particle']['y']
+        particle.valid_steps = state['particle']['valid_steps']
+        particle.invalid_steps = state['particle']['invalid_steps']
+        if state['path'] is not None:
+            particle.path.set_state(state['path'])
+        else:
+            particle.record_history = False
+        particle.rejections.set_state(state['rejections'])
+        simulator.occupancy.set_state(state['occupancy'])
+        simulator.replay.set_state(state['checkpoints'])
+        
+        # Los acumuladores se recrean por nombre y recuperan su estado
+        for entry in state['observables']:
+            simulator.track(entry['name']).set_state(entry['state'])
+        for entry in state['stop_conditions']:
+            condition = STOP_CONDITIONS[entry['name']](*entry['args'])
+            condition.reset(simulator)
+            condition.set_state(entry['state'])
+            simulator.stop_conditions.append(condition)
+        simulator.is_finished = state['is_finished']
+        simulator.stop_reason = state['stop_reason']
+        simulator.stop_step = state['stop_step']
+        
+        stream = state['stream']
+        if stream is not None:
+            simulator.writer = TrajectoryWriter.reopen(stream['path'], stream['positions'],
+                                                       stream['invalid'], stream['chunk_size'])
+        return simulator
+    
+    def state_at(self, step):
+        """
+        Reconstruye el estado de la caminata justo después del paso válido `step`
+        
+        Re-simula a lo sumo checkpoint_interval pasos desde el checkpoint
+        anterior, así que no depende del largo de la corrida ni del historial.
+        
+        Args:
+            step: Paso válido buscado (se acota a los pasos ya dados)
+        
+        Returns:
+            dict con 'valid_steps', 'invalid_steps' y 'position'
+        """
+        step = max(0, min(step, self.particle.valid_steps))
+        return self.replay.seek(step, self.grid_width, self.grid_height)
     
     def get_path(self):
-        """Retorna el camino completo de la partícula"""
+        """Retorna el camino completo de la partícula (vista sin copia)"""
         return self.particle.get_path()
     
+    def memory_usage(self):
+        """Retorna la memoria usada por el historial, en bytes (intentos inválidos: estimación)"""
+        return {
+            'path_bytes': self.particle.path.nbytes,
+            'invalid_bytes': self.particle.rejections.nbytes,
+            'occupancy_bytes': self.occupancy.nbytes,
+            'checkpoints': len(self.replay)
+        }
+    
     def get_stats(self):
         """Retorna estadísticas de la simulación"""
         particle_stats = self.particle.get_stats()
-        return {
+        stats = {
             'valid_steps': particle_stats['valid_steps'],
             'invalid_steps': particle_stats['invalid_steps'],
             'total_attempts': particle_stats['total_attempts'],
             'max_steps': self.max_steps,
             'is_finished': self.is_finished,
-            'path_length': len(self.particle.path)
-        }
\ No newline at end of file
+            'path_length': len(self.particle.path),
+            'distinct_cells': self.occupancy.distinct_cells,
+            'stop_reason': self.stop_reason,
+            'stop_step': self.stop_step
+        }
+        for observable in self.observables.values():
+            stats.update(observable.value())
+        return stats
\ No newline at end of file
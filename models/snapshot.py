@@ -0,0 +1,161 @@
+import json
+import os
+import struct
+import zlib
+import numpy as np
+
+SNAPSHOT_MAGIC = b'SWRSNAP\0'
+FORMAT_VERSION = 1
+
+# Cabecera: magic, versión del formato, bytes comprimidos de los metadatos y número de arreglos
+HEADER_FORMAT = '<8sIQI'
+
+# Cada arreglo: nombre, tipo guardado, tipo original, filas, columnas (0 = 1-D), bits por valor
+# (0 = sin empaquetar), mínimo restado antes de empaquetar y bytes comprimidos
+SECTION_FORMAT = '<32s8s8sQQBqQ'
+
+# Nivel de compresión de zlib por defecto
+DEFAULT_LEVEL = 6
+
+# Bits por valor con que se prueba empaquetar los arreglos enteros de rango chico
+PACK_BITS = (1, 2, 4)
+
+# Marca en los metadatos del lugar de un arreglo guardado aparte
+_ARRAY_KEY = '__array__'
+
+
+def _split_arrays(value, arrays):
+    """Reemplaza los arreglos de NumPy de value por referencias y los agrega a arrays"""
+    if isinstance(value, np.ndarray):
+        name = f'a{len(arrays)}'
+        arrays[name] = value
+        return {_ARRAY_KEY: name}
+    if isinstance(value, dict):
+        return {key: _split_arrays(item, arrays) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_split_arrays(item, arrays) for item in value]
+    return value
+
+
+def _join_arrays(value, arrays):
+    """Inverso de _split_arrays: vuelve a poner cada arreglo en su lugar"""
+    if isinstance(value, dict):
+        if _ARRAY_KEY in value:
+            return arrays[value[_ARRAY_KEY]]
+        return {key: _join_arrays(item, arrays) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_join_arrays(item, arrays) for item in value]
+    return value
+
+
+def _compact(array):
+    """
+    Reduce un arreglo entero al mínimo de bytes antes de comprimirlo
+    
+    Si todos los valores caben en 1, 2 o 4 bits (restando el mínimo, como
+    los desplazamientos de una trayectoria) se empaquetan varios por byte;
+    si no, se usa el tipo entero más chico que los representa.
+    
+    Returns:
+        Tupla (arreglo guardado, bits por valor o 0, mínimo restado)
+    """
+    if array.dtype.kind not in 'iu' or array.size == 0:
+        return array, 0, 0
+    low, high = int(array.min()), int(array.max())
+    span = high - low
+    for bits in PACK_BITS:
+        if span < 1 << bits:
+            per_byte = 8 // bits
+            values = np.zeros(-(-array.size // per_byte) * per_byte, dtype=np.uint8)
+            values[:array.size] = (array.ravel() - low).astype(np.uint8)
+            values = values.reshape(-1, per_byte) << (np.arange(per_byte, dtype=np.uint8) * bits)
+            return np.bitwise_or.reduce(values, axis=1), bits, low
+    dtype = np.result_type(np.min_scalar_type(low), np.min_scalar_type(high))
+    return array.astype(dtype.newbyteorder('<'), copy=False), 0, 0
+
+
+def _expand(packed, bits, low, size):
+    """Inverso del empaquetado de _compact: retorna los size valores (int64)"""
+    per_byte = 8 // bits
+    shifts = np.arange(per_byte, dtype=np.uint8) * bits
+    values = (packed[:, None] >> shifts) & ((1 << bits) - 1)
+    return values.ravel()[:size].astype(np.int64) + low
+
+
+def write_snapshot(path, state, level=DEFAULT_LEVEL):
+    """
+    Escribe un estado en el formato binario de snapshots
+    
+    Los valores simples van como JSON y cada arreglo de NumPy (de 1 o 2
+    dimensiones) como bloque binario aparte, reducido con _compact() y
+    comprimido con zlib. El archivo se escribe con otro
+    nombre y se renombra al final, así que una caída a mitad de la
+    escritura deja el snapshot anterior intacto.
+    
+    Args:
+        path: Archivo de salida
+        state: dict con valores serializables a JSON y arreglos de NumPy
+        level: Nivel de compresión de zlib (0-9)
+    
+    Returns:
+        Bytes escritos
+    """
+    arrays = {}
+    meta = zlib.compress(json.dumps(_split_arrays(state, arrays), separators=(',', ':')).encode(), level)
+    temp = path + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, SNAPSHOT_MAGIC, FORMAT_VERSION, len(meta), len(arrays)))
+        f.write(meta)
+        for name, array in arrays.items():
+            if array.ndim not in (1, 2):
+                raise ValueError(f"Solo se guardan arreglos de 1 o 2 dimensiones ({name}: {array.shape})")
+            stored, bits, low = _compact(np.ascontiguousarray(array))
+            data = zlib.compress(stored.tobytes(), level)
+            rows, cols = (array.shape[0], 0) if array.ndim == 1 else array.shape
+            f.write(struct.pack(SECTION_FORMAT, name.encode(), stored.dtype.str.encode(),
+                                array.dtype.str.encode(), rows, cols, bits, low, len(data)))
+            f.write(data)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    return size
+
+
+def read_snapshot(path):
+    """
+    Lee un snapshot escrito con write_snapshot()
+    
+    Returns:
+        El dict de estado, con los arreglos de NumPy en su lugar
+    
+    Raises:
+        ValueError: Si el archivo no es un snapshot, es de otra versión o está dañado
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    header_size = struct.calcsize(HEADER_FORMAT)
+    section_size = struct.calcsize(SECTION_FORMAT)
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("El archivo no es un snapshot SWR")
+    try:
+        _, version, meta_size, n_arrays = struct.unpack_from(HEADER_FORMAT, data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versión de snapshot no soportada: {version}")
+        offset = header_size + meta_size
+        state = json.loads(zlib.decompress(data[header_size:offset]))
+        arrays = {}
+        for _ in range(n_arrays):
+            name, stored, original, rows, cols, bits, low, size = struct.unpack_from(SECTION_FORMAT, data,
+                                                                                     offset)
+            offset += section_size
+            array = np.frombuffer(zlib.decompress(data[offset:offset + size]),
+                                  dtype=np.dtype(stored.rstrip(b'\0').decode()))
+            offset += size
+            shape = (rows,) if cols == 0 else (rows, cols)
+            if bits:
+                array = _expand(array, bits, low, rows * max(cols, 1))
+            arrays[name.rstrip(b'\0').decode()] = array.reshape(shape).astype(original.rstrip(b'\0').decode())
+    except (struct.error, zlib.error) as error:
+        raise ValueError(f"Snapshot incompleto o dañado: {error}")
+    return _join_arrays(state, arrays)
\ No newline at end of file
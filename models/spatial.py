@@ -0,0 +1,119 @@
+import numpy as np
+
+# Lado en celdas de cada tesela del índice
+TILE_SIZE = 64
+
+# Tipo de los índices guardados: 4 bytes por paso (caminos de hasta 2**32 posiciones)
+INDEX_DTYPE = np.uint32
+
+# Capacidad mínima de una tesela y crecimiento relativo al agrandarla
+MIN_TILE_CAPACITY = 64
+GROWTH = 0.25
+
+class PathTileIndex:
+    """Índice espacial del camino: pasos agrupados por tesela de TILE_SIZE x TILE_SIZE celdas"""
+    
+    def __init__(self, grid_width, grid_height, tile_size=TILE_SIZE):
+        """
+        Inicializa el índice vacío
+        
+        Cada tesela guarda en orden creciente los índices de las posiciones
+        del camino que caen en ella, así que consultar un rectángulo cuesta
+        proporcional a los pasos de las teselas que toca y no al camino entero.
+        Los índices son de 4 bytes y cada tesela crece un 25 %, así que el
+        índice ocupa unos 5 bytes por paso.
+        
+        Args:
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+            tile_size: Lado de cada tesela en celdas
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.tile_size = tile_size
+        self.tiles_x = -(-grid_width // tile_size)
+        self.tiles_y = -(-grid_height // tile_size)
+        self.reset()
+    
+    def reset(self):
+        """Borra el índice"""
+        self._steps = {}  # tesela -> arreglo INDEX_DTYPE de índices (con holgura para crecer)
+        self._sizes = {}  # tesela -> cantidad de índices válidos
+        self.indexed = 0  # Posiciones del camino ya indexadas
+    
+    def update(self, path):
+        """
+        Indexa las posiciones de path que aún no estaban en el índice
+        
+        Args:
+            path: Arreglo (n, 2) con el camino completo
+        """
+        n = len(path)
+        if n < self.indexed:
+            # El camino se reinició: se indexa desde cero
+            self.reset()
+        if n == self.indexed:
+            return
+        if n > np.iinfo(INDEX_DTYPE).max:
+            raise ValueError(f"El índice espacial admite hasta {np.iinfo(INDEX_DTYPE).max} posiciones")
+        xs = np.asarray(path[self.indexed:n, 0], dtype=np.int64)
+        ys = np.asarray(path[self.indexed:n, 1], dtype=np.int64)
+        tiles = (xs // self.tile_size) * self.tiles_y + ys // self.tile_size
+        # Orden estable: dentro de cada tesela los pasos quedan crecientes
+        order = np.argsort(tiles, kind='stable')
+        sorted_tiles = tiles[order]
+        bounds = np.flatnonzero(np.diff(sorted_tiles)) + 1
+        starts = np.concatenate(([0], bounds))
+        chunks = np.split((order + self.indexed).astype(INDEX_DTYPE), bounds)
+        for tile, chunk in zip(sorted_tiles[starts].tolist(), chunks):
+            self._append(tile, chunk)
+        self.indexed = n
+    
+    def _append(self, tile, chunk):
+        """Agrega índices al final de una tesela agrandándola (un GROWTH más) si hace falta"""
+        steps = self._steps.get(tile)
+        size = self._sizes.get(tile, 0)
+        needed = size + len(chunk)
+        if steps is None or needed > len(steps):
+            capacity = max(needed + int(needed * GROWTH), MIN_TILE_CAPACITY)
+            grown = np.empty(capacity, dtype=INDEX_DTYPE)
+            if steps is not None:
+                grown[:size] = steps[:size]
+            steps = grown
+            self._steps[tile] = steps
+        steps[size:needed] = chunk
+        self._sizes[tile] = needed
+    
+    def query(self, x0, y0, x1, y1):
+        """
+        Retorna los índices del camino en las teselas que tocan [x0, x1) x [y0, y1)
+        
+        El resultado es un superconjunto de las posiciones dentro del
+        rectángulo; quien dibuja recorta con el rectángulo exacto.
+        
+        Returns:
+            Arreglo ordenado (int64) de índices del camino
+        """
+        tx0 = max(x0, 0) // self.tile_size
+        ty0 = max(y0, 0) // self.tile_size
+        tx1 = min(-(-x1 // self.tile_size), self.tiles_x)
+        ty1 = min(-(-y1 // self.tile_size), self.tiles_y)
+        if (tx1 - tx0) * (ty1 - ty0) > len(self._sizes):
+            # Rectángulo amplio: conviene recorrer solo las teselas ocupadas
+            tiles = [tile for tile in self._sizes
+                     if tx0 <= tile // self.tiles_y < tx1 and ty0 <= tile % self.tiles_y < ty1]
+        else:
+            tiles = [tx * self.tiles_y + ty
+                     for tx in range(tx0, tx1) for ty in range(ty0, ty1)
+                     if tx * self.tiles_y + ty in self._sizes]
+        parts = [self._steps[tile][:self._sizes[tile]] for tile in tiles]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        if len(parts) == 1:
+            return parts[0].astype(np.int64)
+        return np.sort(np.concatenate(parts)).astype(np.int64)
+    
+    @property
+    def nbytes(self):
+        """Memoria del índice en bytes"""
+        return sum(steps.nbytes for steps in self._steps.values())
\ No newline at end of file
@@ -0,0 +1,255 @@
+import struct
+import numpy as np
+from models.particle import MOVE_DIRECTIONS
+
+FORMAT_VERSION = 1
+
+# Cabecera común de ambos archivos (64 bytes)
+HEADER_FORMAT = '<8sIIIIiiI'
+HEADER_SIZE = 64
+POSITIONS_MAGIC = b'SWRTPOS\0'
+INVALID_MAGIC = b'SWRTINV\0'
+
+# Un intento inválido: paso válido en que ocurrió (índice en positions) y dirección
+INVALID_DTYPE = np.dtype([('step', '<i8'), ('direction', 'u1')])
+
+
+def _pack_header(magic, grid_width, grid_height, step_size, start, itemsize):
+    header = struct.pack(HEADER_FORMAT, magic, FORMAT_VERSION, grid_width, grid_height,
+                         step_size, start[0], start[1], itemsize)
+    return header.ljust(HEADER_SIZE, b'\0')
+
+
+def _unpack_header(data, magic):
+    fields = struct.unpack(HEADER_FORMAT, data[:struct.calcsize(HEADER_FORMAT)])
+    if fields[0] != magic:
+        raise ValueError("El archivo no es una trayectoria SWR")
+    if fields[1] != FORMAT_VERSION:
+        raise ValueError(f"Versión de trayectoria no soportada: {fields[1]}")
+    return fields
+
+
+class TrajectoryWriter:
+    """Escribe la trayectoria en disco por bloques mientras corre la simulación"""
+
+    def __init__(self, path, grid_width, grid_height, step_size, start, chunk_size=65536):
+        """
+        Crea los archivos de salida
+
+        Se escriben dos archivos: path + '.pos' con las posiciones válidas
+        (una fila x, y por paso) y path + '.inv' con los intentos inválidos.
+        La memoria usada es siempre la de un bloque, sin importar los pasos.
+
+        Args:
+            path: Ruta base de los archivos
+            grid_width: Ancho del grid
+            grid_height: Alto del grid
+            step_size: Tamaño del paso
+            start: Posición inicial (x, y); se escribe como paso 0
+            chunk_size: Posiciones por bloque antes de volcar a disco
+        """
+        self.path = path
+        self.dtype = np.int16 if max(grid_width, grid_height) <= np.iinfo(np.int16).max else np.int32
+        itemsize = np.dtype(self.dtype).itemsize
+
+        self._positions_file = open(path + '.pos', 'wb')
+        self._positions_file.write(_pack_header(POSITIONS_MAGIC, grid_width, grid_height,
+                                                step_size, start, itemsize))
+        self._invalid_file = open(path + '.inv', 'wb')
+        self._invalid_file.write(_pack_header(INVALID_MAGIC, grid_width, grid_height,
+                                              step_size, start, INVALID_DTYPE.itemsize))
+
+        self._allocate(chunk_size)
+        self.write_position(start[0], start[1])
+
+    @classmethod
+    def reopen(cls, path, n_positions, n_invalid, chunk_size=65536):
+        """
+        Reabre una trayectoria para seguir escribiéndola desde un punto conocido
+
+        Los archivos se recortan a n_positions posiciones y n_invalid
+        intentos inválidos (lo que había al tomar el snapshot con tell()),
+        así que se descarta lo escrito después, p. ej. antes de una caída.
+
+        Args:
+            path: Ruta base usada al escribir
+            n_positions: Posiciones a conservar
+            n_invalid: Intentos inválidos a conservar
+            chunk_size: Posiciones por bloque antes de volcar a disco
+
+        Raises:
+            ValueError: Si los archivos tienen menos registros que los pedidos
+        """
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer._positions_file = open(path + '.pos', 'r+b')
+        fields = _unpack_header(writer._positions_file.read(HEADER_SIZE), POSITIONS_MAGIC)
+        writer.dtype = np.int16 if fields[7] == 2 else np.int32
+        writer._invalid_file = open(path + '.inv', 'r+b')
+        _unpack_header(writer._invalid_file.read(HEADER_SIZE), INVALID_MAGIC)
+        for f, n, itemsize in ((writer._positions_file, n_positions, 2 * fields[7]),
+                               (writer._invalid_file, n_invalid, INVALID_DTYPE.itemsize)):
+            size = HEADER_SIZE + n * itemsize
+            if f.seek(0, 2) < size:
+                writer._positions_file.close()
+                writer._invalid_file.close()
+                raise ValueError(f"La trayectoria {path} está incompleta")
+            f.truncate(size)
+            f.seek(size)
+        writer._allocate(chunk_size)
+        return writer
+
+    def _allocate(self, chunk_size):
+        self.chunk_size = chunk_size
+        self._positions = np.empty((chunk_size, 2), dtype=self.dtype)
+        self._n_positions = 0
+        self._invalid = np.empty(chunk_size, dtype=INVALID_DTYPE)
+        self._n_invalid = 0
+
+    def write_position(self, x, y):
+        """Agrega una posición válida"""
+        if self._n_positions == len(self._positions):
+            self._flush_positions()
+        self._positions[self._n_positions, 0] = x
+        self._positions[self._n_positions, 1] = y
+        self._n_positions += 1
+
+    def write_positions(self, xs, ys):
+        """Agrega un bloque de posiciones válidas"""
+        done = 0
+        while done < len(xs):
+            if self._n_positions == len(self._positions):
+                self._flush_positions()
+            n = min(len(xs) - done, len(self._positions) - self._n_positions)
+            self._positions[self._n_positions:self._n_positions + n, 0] = xs[done:done + n]
+            self._positions[self._n_positions:self._n_positions + n, 1] = ys[done:done + n]
+            self._n_positions += n
+            done += n
+
+    def write_invalid(self, step, direction, count=1):
+        """
+        Agrega intentos inválidos
+
+        Args:
+            step: Pasos válidos dados al momento del intento (la partícula
+                  estaba en la posición de ese índice)
+            direction: Código de dirección (índice en MOVE_DIRECTIONS)
+            count: Intentos iguales a agregar
+        """
+        if self._n_invalid + count > len(self._invalid):
+            self._flush_invalid()
+            if count > len(self._invalid):
+                # Una racha más larga que el bloque va directo al archivo
+                block = np.empty(count, dtype=INVALID_DTYPE)
+                block['step'] = step
+                block['direction'] = direction
+                block.tofile(self._invalid_file)
+                return
+        end = self._n_invalid + count
+        self._invalid['step'][self._n_invalid:end] = step
+        self._invalid['direction'][self._n_invalid:end] = direction
+        self._n_invalid = end
+
+    def _flush_positions(self):
+        self._positions[:self._n_positions].tofile(self._positions_file)
+        self._n_positions = 0
+
+    def _flush_invalid(self):
+        self._invalid[:self._n_invalid].tofile(self._invalid_file)
+        self._n_invalid = 0
+
+    def flush(self):
+        """Vuelca a disco los bloques pendientes"""
+        self._flush_positions()
+        self._flush_invalid()
+        self._positions_file.flush()
+        self._invalid_file.flush()
+
+    def tell(self):
+        """
+        Vuelca lo pendiente y retorna cuántos registros hay en disco
+
+        Returns:
+            Tupla (posiciones, intentos inválidos) escritos
+        """
+        self.flush()
+        n_positions = (self._positions_file.tell() - HEADER_SIZE) // self._positions.itemsize // 2
+        n_invalid = (self._invalid_file.tell() - HEADER_SIZE) // INVALID_DTYPE.itemsize
+        return n_positions, n_invalid
+
+    def close(self):
+        """Vuelca lo pendiente y cierra los archivos"""
+        if self._positions_file.closed:
+            return
+        self.flush()
+        self._positions_file.close()
+        self._invalid_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TrajectoryReader:
+    """Lee una trayectoria escrita por TrajectoryWriter mediante memory-mapping"""
+
+    def __init__(self, path):
+        """
+        Abre la trayectoria sin cargarla en memoria
+
+        Args:
+            path: Ruta base usada al escribir (sin '.pos' / '.inv')
+        """
+        with open(path + '.pos', 'rb') as f:
+            fields = _unpack_header(f.read(HEADER_SIZE), POSITIONS_MAGIC)
+        _, _, self.grid_width, self.grid_height, self.step_size, start_x, start_y, itemsize = fields
+        self.start = (start_x, start_y)
+        dtype = np.int16 if itemsize == 2 else np.int32
+
+        with open(path + '.inv', 'rb') as f:
+            _unpack_header(f.read(HEADER_SIZE), INVALID_MAGIC)
+
+        self.positions = self._map(path + '.pos', np.dtype((dtype, 2)))
+        self.invalid = self._map(path + '.inv', INVALID_DTYPE)
+
+    @staticmethod
+    def _map(filename, dtype):
+        """Mapea los registros del archivo (arreglo vacío si no hay ninguno)"""
+        with open(filename, 'rb') as f:
+            f.seek(0, 2)
+            n = (f.tell() - HEADER_SIZE) // dtype.itemsize
+        if n == 0:
+            return np.empty((0,) + dtype.shape, dtype=dtype.base)
+        return np.memmap(filename, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(n,))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        return self.positions[index]
+
+    @property
+    def valid_steps(self):
+        """Pasos válidos registrados"""
+        return len(self.positions) - 1
+
+    @property
+    def invalid_steps(self):
+        """Intentos inválidos registrados"""
+        return len(self.invalid)
+
+    def invalid_between(self, start, stop):
+        """
+        Retorna los intentos inválidos ocurridos entre los pasos válidos [start, stop)
+
+        Returns:
+            Tupla (steps, from_xy, to_xy) de arreglos; from_xy y to_xy son N x 2
+        """
+        steps = self.invalid['step']
+        lo, hi = np.searchsorted(steps, [start, stop])
+        records = self.invalid[lo:hi]
+        origin = np.asarray(self.positions[records['step']], dtype=np.int64)
+        directions = np.array(MOVE_DIRECTIONS, dtype=np.int64) * self.step_size
+        return records['step'], origin, origin + directions[records['direction']]
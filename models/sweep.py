@@ -0,0 +1,140 @@
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from models.runner import SHARD_SIZE, _run_shard, merge_stats
+from models.simulator import ENGINE_VERSION
+from models.cache import make_key
+
+# Parámetros que se pueden barrer (mismos nombres que en run_ensemble)
+SWEEP_AXES = ('grid_width', 'grid_height', 'step_size', 'max_steps')
+
+
+def expand_grid(base, axes):
+    """
+    Expande un grid de parámetros en la lista de puntos a simular
+    
+    Args:
+        base: dict con los valores fijos (grid_width, grid_height, step_size,
+              max_steps, sampler y stop_condition)
+        axes: dict eje -> lista de valores; cada punto es una combinación
+    
+    Returns:
+        Lista de dicts de parámetros, en el orden del producto de los ejes
+    """
+    unknown = [axis for axis in axes if axis not in SWEEP_AXES]
+    if unknown:
+        raise ValueError(f"Ejes de barrido desconocidos: {', '.join(unknown)}")
+    names = list(axes)
+    points = []
+    for values in itertools.product(*(axes[name] for name in names)):
+        point = dict(base)
+        point.update(zip(names, values))
+        if point.get('stop_condition') is not None:
+            # Lista para que la clave sea la misma antes y después de pasar por JSON
+            point['stop_condition'] = list(point['stop_condition'])
+        points.append(point)
+    return points
+
+
+def replica_seed(master, replica):
+    """
+    Retorna la semilla de la réplica replica de la semilla maestra
+    
+    Es el mismo hijo que da SeedSequence(master).spawn(n)[replica] para
+    cualquier n > replica (como en run_ensemble), sin crear los anteriores.
+    """
+    return np.random.SeedSequence(master.entropy, spawn_key=master.spawn_key + (replica,),
+                                  pool_size=master.pool_size)
+
+
+def _run_job(point, seeds):
+    """Ejecuta las réplicas de un punto para las semillas dadas (tarea del pool)"""
+    stop_condition = point.get('stop_condition')
+    return _run_shard(point['grid_width'], point['grid_height'], point['step_size'],
+                      point['max_steps'], seeds,
+                      tuple(stop_condition) if stop_condition is not None else None,
+                      point.get('sampler', 'exact'))
+
+
+def run_sweep(points, seed, replicas, cache=None, workers=None):
+    """
+    Simula cada punto con cada réplica, reusando los resultados de la caché
+    
+    Las réplicas se derivan de la semilla maestra igual que en
+    run_ensemble (SeedSequence(seed).spawn), así que un barrido de un solo
+    punto da exactamente lo mismo que run_ensemble con la misma semilla.
+    Cada réplica se identifica por (parámetros, semilla maestra, índice de
+    réplica, ENGINE_VERSION): repetir un barrido con un eje cambiado solo
+    simula los puntos nuevos, y agregar réplicas solo simula las que
+    faltan. Las réplicas faltantes se agrupan en tareas de a lo sumo
+    SHARD_SIZE y se reparten en un pool de procesos, las más costosas
+    primero; cada tarea se guarda en la caché apenas termina.
+    
+    Args:
+        points: Lista de dicts de parámetros (ver expand_grid)
+        seed: Semilla maestra (int o SeedSequence; None usa entropía del
+              sistema); la réplica i usa el mismo flujo en todos los puntos
+        replicas: Número de réplicas por punto
+        cache: ResultCache opcional
+        workers: Procesos del pool (None = todos los núcleos, 1 = sin pool)
+    
+    Returns:
+        Lista con un dict por punto: sus parámetros, las estadísticas de
+        merge_stats(), 'seed' (entropía de la semilla maestra) y cuántas
+        réplicas salieron de la caché ('cached') o se simularon ('computed')
+    """
+    master = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    runs = []  # Por punto, resultado de cada réplica (None = falta simular)
+    jobs = []  # (punto, índices de réplicas)
+    for p, point in enumerate(points):
+        keys = [make_key(point, master.entropy, i, ENGINE_VERSION) for i in range(replicas)]
+        found = cache.get_many(keys) if cache is not None else {}
+        point_runs = []
+        missing = []
+        for i, key in enumerate(keys):
+            result = found.get(key)
+            point_runs.append(tuple(result) if result is not None else None)
+            if result is None:
+                missing.append(i)
+        runs.append(point_runs)
+        jobs.extend((p, missing[i:i + SHARD_SIZE]) for i in range(0, len(missing), SHARD_SIZE))
+    computed = [0] * len(points)
+    
+    def store(job, results):
+        p, indices = job
+        point = points[p]
+        for i, result in zip(indices, results):
+            runs[p][i] = result
+        computed[p] += len(indices)
+        if cache is not None:
+            cache.put_many((make_key(point, master.entropy, i, ENGINE_VERSION), list(result))
+                           for i, result in zip(indices, results))
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            store(job, _run_job(points[job[0]], [replica_seed(master, i) for i in job[1]]))
+    else:
+        # Las tareas más largas primero para no dejar una sola al final
+        jobs.sort(key=lambda job: points[job[0]]['max_steps'] * len(job[1]), reverse=True)
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            futures = {executor.submit(_run_job, points[job[0]], [replica_seed(master, i) for i in job[1]]): job
+                       for job in jobs}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+    
+    rows = []
+    for p, point in enumerate(points):
+        stop_condition = point.get('stop_condition')
+        stats = merge_stats(runs[p], point['grid_width'], point['grid_height'], point['max_steps'],
+                            stop_condition)
+        row = {name: value for name, value in point.items() if name != 'stop_condition'}
+        row.update(stats)
+        row['seed'] = master.entropy
+        row['cached'] = replicas - computed[p]
+        row['computed'] = computed[p]
+        rows.append(row)
+    return rows
\ No newline at end of file
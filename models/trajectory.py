@@ -0,0 +1,112 @@
+import numpy as np
+
+class Trajectory:
+    """Historial compacto de posiciones: un único arreglo contiguo de N x 2 enteros"""
+    
+    def __init__(self, x, y, dtype=np.int32, capacity=1024):
+        """
+        Inicializa la trayectoria con la posición inicial
+        
+        Args:
+            x: Posición inicial en x
+            y: Posición inicial en y
+            dtype: Tipo entero de las coordenadas (ver dtype_for_grid)
+            capacity: Capacidad inicial en posiciones
+        """
+        self.dtype = np.dtype(dtype)
+        self._data = np.empty((max(capacity, 1), 2), dtype=self.dtype)
+        self._length = 0
+        self.append(x, y)
+    
+    @staticmethod
+    def dtype_for_grid(grid_width, grid_height):
+        """Retorna el entero más pequeño que representa cualquier celda del grid"""
+        if max(grid_width, grid_height) <= np.iinfo(np.int16).max:
+            return np.int16
+        return np.int32
+    
+    def __len__(self):
+        return self._length
+    
+    def __getitem__(self, index):
+        return self.view()[index]
+    
+    def __iter__(self):
+        return iter(self.view())
+    
+    def reserve(self, n):
+        """Asegura espacio para n posiciones más sin volver a reservar memoria"""
+        needed = self._length + n
+        if needed <= len(self._data):
+            return
+        capacity = max(needed, len(self._data) * 2)
+        data = np.empty((capacity, 2), dtype=self.dtype)
+        data[:self._length] = self._data[:self._length]
+        self._data = data
+    
+    def append(self, x, y):
+        """Agrega una posición (O(1) amortizado)"""
+        if self._length == len(self._data):
+            self.reserve(1)
+        data = self._data
+        data[self._length, 0] = x
+        data[self._length, 1] = y
+        self._length += 1
+    
+    def extend(self, xs, ys):
+        """Agrega un bloque de posiciones desde arreglos de x e y"""
+        n = len(xs)
+        self.reserve(n)
+        self._data[self._length:self._length + n, 0] = xs
+        self._data[self._length:self._length + n, 1] = ys
+        self._length += n
+    
+    def reset(self, x, y):
+        """Vacía la trayectoria dejando solo la posición inicial"""
+        if len(self._data) > 1024:
+            self._data = np.empty((1024, 2), dtype=self.dtype)
+        self._length = 0
+        self.append(x, y)
+    
+    def get_state(self):
+        """
+        Retorna el camino como diferencias entre posiciones consecutivas (para snapshots)
+        
+        Las diferencias valen 0 o ±tamaño del paso, así que ocupan unos
+        pocos bits cada una y se comprimen mucho mejor que las posiciones.
+        
+        Returns:
+            dict con 'start' ([x, y]) y 'deltas' (arreglo (n - 1, 2))
+        """
+        view = self.view()
+        return {'start': [int(view[0, 0]), int(view[0, 1])], 'deltas': np.diff(view, axis=0)}
+    
+    def set_state(self, state):
+        """Reemplaza el camino por el de un get_state()"""
+        deltas = np.asarray(state['deltas']).reshape(-1, 2)
+        data = np.empty((len(deltas) + 1, 2), dtype=self.dtype)
+        data[0] = state['start']
+        np.cumsum(deltas, axis=0, out=data[1:])
+        data[1:] += data[0]
+        self._data = data
+        self._length = len(data)
+    
+    def view(self):
+        """
+        Retorna una vista de solo lectura (sin copia) de las posiciones
+        
+        La vista refleja el estado en el momento de pedirla: si la trayectoria
+        crece y se reubica, las vistas anteriores conservan los datos viejos.
+        """
+        view = self._data[:self._length]
+        view.flags.writeable = False
+        return view
+    
+    def last(self):
+        """Retorna la última posición como tupla (x, y)"""
+        return (int(self._data[self._length - 1, 0]), int(self._data[self._length - 1, 1]))
+    
+    @property
+    def nbytes(self):
+        """Memoria reservada por la trayectoria en bytes"""
+        return self._data.nbytes
\ No newline at end of file
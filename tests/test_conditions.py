@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from models.simulator import Simulator
+
+
+def run_until(condition, seed, attach_after=None, grid=8):
+    """Corre hasta la condición; con attach_after la agrega después de esos pasos válidos"""
+    simulator = Simulator(grid, grid, seed=seed, observables=())
+    simulator.set_max_steps(100000)
+    if attach_after is not None:
+        simulator.run_batch(attach_after)
+    simulator.add_stop_condition(*condition)
+    simulator.run_batch()
+    return simulator
+
+
+@pytest.mark.parametrize('condition', [('cover',), ('cover', 0.5), ('boundary',), ('target', 1, 6)])
+@pytest.mark.parametrize('seed', range(20))
+def test_condition_added_mid_run_matches_from_start(condition, seed):
+    """Agregar la condición a mitad de corrida da el mismo paso de término que desde el inicio"""
+    full = run_until(condition, seed)
+    attach_after = min(40, full.stop_step)
+    late = run_until(condition, seed, attach_after)
+    assert late.stop_reason == full.stop_reason
+    assert late.stop_step == full.stop_step
+    assert np.array_equal(late.get_path(), full.get_path())
+
+
+def test_cover_time_step_and_batch_agree():
+    """step() y run_batch() terminan en el mismo paso de cobertura"""
+    batch = run_until(('cover',), seed=3)
+    single = Simulator(8, 8, seed=3, observables=())
+    single.set_max_steps(100000)
+    single.add_stop_condition('cover')
+    while not single.is_finished:
+        single.step()
+    assert single.stop_step == batch.stop_step
+    assert single.occupancy.distinct_cells == 64
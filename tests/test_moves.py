@@ -0,0 +1,34 @@
+import numpy as np
+from models.moves import MoveSource
+
+
+def test_move_source_words_match_codes():
+    """next_word() consume CODES_PER_WORD códigos y los arma con el primero en los bits bajos"""
+    words = MoveSource(3, block_size=64)
+    codes = MoveSource(3, block_size=64)
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        for _ in range(int(rng.integers(0, 40))):
+            assert words.next_code() == codes.next_code()
+        expected = 0
+        for i in range(32):
+            expected |= codes.next_code() << (2 * i)
+        assert words.next_word() == expected
+        assert words.get_state() == codes.get_state()
+
+
+def test_move_source_state_round_trip():
+    """set_state() y from_snapshot() continúan el flujo desde el mismo código"""
+    moves = MoveSource(9)
+    for _ in range(12345):
+        moves.next_code()
+    state = moves.get_state()
+    expected = [moves.next_code() for _ in range(5000)]
+    
+    resumed = MoveSource(9)
+    resumed.set_state(state)
+    assert [resumed.next_code() for _ in range(5000)] == expected
+    
+    moves.set_state(state)
+    copy = MoveSource.from_snapshot(moves.snapshot())
+    assert [copy.next_code() for _ in range(5000)] == expected
\ No newline at end of file
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from models.simulator import Simulator
+
+
+def make_simulator(sampler, grid=6, step_size=1, seed=11, max_steps=3000):
+    """Simulador sin observables para comparar modos de avance"""
+    simulator = Simulator(grid, grid, step_size, seed=seed, observables=(), sampler=sampler)
+    simulator.set_max_steps(max_steps)
+    return simulator
+
+
+def run_steps(simulator):
+    """Avanza paso a paso hasta terminar"""
+    while not simulator.is_finished:
+        simulator.step()
+    return simulator
+
+
+def assert_same_run(a, b):
+    """Mismo camino, mismos contadores y mismos intentos inválidos registrados"""
+    assert np.array_equal(a.get_path(), b.get_path())
+    assert a.particle.valid_steps == b.particle.valid_steps
+    assert a.particle.invalid_steps == b.particle.invalid_steps
+    assert a.particle.rejections.counts == b.particle.rejections.counts
+    assert a.moves.get_state() == b.moves.get_state()
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+@pytest.mark.parametrize('grid, step_size', [(4, 1), (6, 2), (9, 4), (30, 1)])
+def test_step_and_batch_agree(sampler, grid, step_size):
+    """step() y run_batch() dan la misma corrida con la misma semilla"""
+    single = run_steps(make_simulator(sampler, grid, step_size))
+    batch = make_simulator(sampler, grid, step_size)
+    batch.run_batch()
+    assert_same_run(single, batch)
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+def test_interleaved_step_and_batch_agree(sampler):
+    """Alternar step() y run_batch(n) no cambia la corrida"""
+    single = run_steps(make_simulator(sampler))
+    mixed = make_simulator(sampler)
+    while not mixed.is_finished:
+        mixed.run_batch(137)
+        for _ in range(29):
+            if not mixed.is_finished:
+                mixed.step()
+    assert_same_run(single, mixed)
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+def test_state_at_matches_path(sampler):
+    """state_at() reconstruye la posición y los intentos inválidos de cualquier paso"""
+    simulator = make_simulator(sampler, grid=7, step_size=2, max_steps=25000)
+    simulator.run_batch()
+    path = simulator.get_path()
+    for step in (0, 1, 999, 10000, 10001, 24999, 25000):
+        state = simulator.state_at(step)
+        assert state['valid_steps'] == step
+        assert tuple(state['position']) == tuple(int(v) for v in path[step])
+    assert simulator.state_at(25000)['invalid_steps'] == simulator.particle.invalid_steps
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+def test_state_at_across_step_size_change(sampler):
+    """state_at() re-simula cada tramo con el tamaño de paso que tuvo"""
+    simulator = make_simulator(sampler, grid=12, max_steps=6000)
+    simulator.run_batch(2500)
+    simulator.set_step_size(3)
+    simulator.run_batch()
+    path = simulator.get_path()
+    for step in (2499, 2500, 2501, 4000, 6000):
+        assert tuple(simulator.state_at(step)['position']) == tuple(int(v) for v in path[step])
+
+
+def test_rejection_free_keeps_exact_distribution():
+    """Con muestreo sin rechazo los intentos inválidos medios son los del muestreo exacto"""
+    def mean_invalid(sampler):
+        runs = []
+        for seed in range(20):
+            simulator = make_simulator(sampler, grid=5, step_size=2, seed=seed, max_steps=5000)
+            simulator.run_batch()
+            runs.append(simulator.particle.invalid_steps)
+        return np.mean(runs)
+    
+    exact = mean_invalid('exact')
+    assert abs(mean_invalid('rejection_free') - exact) < 0.05 * exact
+
+
+def test_rejection_free_records_every_invalid_direction():
+    """Las rachas resueltas de una vez reparten sus intentos entre las direcciones inválidas"""
+    simulator = make_simulator('rejection_free', grid=5, step_size=2, max_steps=20000)
+    simulator.run_batch()
+    counts = simulator.particle.rejections.counts
+    # Desde una esquina hay dos direcciones inválidas y ambas aparecen
+    corner = {direction for (x, y, direction, _) in counts if (x, y) == (0, 0)}
+    assert len(corner) == 2
+    assert sum(counts.values()) == simulator.particle.invalid_steps
\ No newline at end of file
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from models.simulator import Simulator
+from models.stream import TrajectoryReader
+
+
+def make_simulator(sampler, condition=None):
+    """Simulador con todos los observables y, opcionalmente, una condición de término"""
+    simulator = Simulator(9, 9, 2, seed=21, sampler=sampler)
+    simulator.set_max_steps(30000)
+    if condition is not None:
+        simulator.add_stop_condition(*condition)
+    return simulator
+
+
+def assert_same_state(a, b):
+    """Misma corrida, mismas estadísticas y mismo flujo de movimientos"""
+    assert np.array_equal(a.get_path(), b.get_path())
+    assert a.get_stats() == b.get_stats()
+    assert a.particle.rejections.counts == b.particle.rejections.counts
+    assert a.moves.get_state() == b.moves.get_state()
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+@pytest.mark.parametrize('condition', [None, ('cover', 0.9), ('target', 0, 8)])
+def test_snapshot_restore_continues_run(tmp_path, sampler, condition):
+    """restore() sigue la corrida exactamente como si no se hubiera interrumpido"""
+    # Referencia con los mismos lotes (los observables suman por lote)
+    full = make_simulator(sampler, condition)
+    full.run_batch(700)
+    full.run_batch()
+    
+    partial = make_simulator(sampler, condition)
+    partial.run_batch(700)
+    path = str(tmp_path / 'run.snap')
+    partial.snapshot(path)
+    restored = Simulator.restore(path)
+    assert_same_state(restored, partial)
+    restored.run_batch()
+    assert_same_state(restored, full)
+    assert restored.stop_reason == full.stop_reason
+    assert restored.stop_step == full.stop_step
+
+
+def test_snapshot_restore_reopens_stream(tmp_path):
+    """Con la trayectoria en disco, la corrida restaurada la completa igual que sin cortar"""
+    full = make_simulator('exact')
+    full.stream_to(str(tmp_path / 'full'))
+    full.run_batch()
+    full.close_stream()
+    
+    partial = make_simulator('exact')
+    partial.stream_to(str(tmp_path / 'cut'))
+    partial.run_batch(12000)
+    partial.snapshot(str(tmp_path / 'cut.snap'))
+    # Lo escrito después del snapshot se descarta al restaurar
+    partial.run_batch(500)
+    partial.close_stream()
+    
+    restored = Simulator.restore(str(tmp_path / 'cut.snap'))
+    restored.run_batch()
+    restored.close_stream()
+    expected = TrajectoryReader(str(tmp_path / 'full'))
+    resumed = TrajectoryReader(str(tmp_path / 'cut'))
+    assert np.array_equal(np.asarray(resumed.positions), np.asarray(expected.positions))
+    assert np.array_equal(np.asarray(resumed.invalid), np.asarray(expected.invalid))
+
+
+def test_damaged_snapshot_is_rejected(tmp_path):
+    """Un snapshot cortado no se restaura a medias"""
+    simulator = make_simulator('exact')
+    simulator.run_batch(1000)
+    path = tmp_path / 'run.snap'
+    simulator.snapshot(str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        Simulator.restore(str(path))
\ No newline at end of file
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from models.simulator import Simulator
+from models.stream import TrajectoryReader
+
+
+def streamed_run(tmp_path, sampler, batch):
+    """Corre escribiendo la trayectoria en disco y guardando también el camino en memoria"""
+    simulator = Simulator(6, 6, 2, seed=5, observables=(), sampler=sampler)
+    simulator.set_max_steps(20000)
+    base = str(tmp_path / 'walk')
+    simulator.stream_to(base, keep_history=True, chunk_size=1000)
+    if batch:
+        simulator.run_batch()
+    else:
+        while not simulator.is_finished:
+            simulator.step()
+    simulator.close_stream()
+    return simulator, base
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+@pytest.mark.parametrize('batch', [False, True])
+def test_stream_round_trip(tmp_path, sampler, batch):
+    """Lo que lee TrajectoryReader es el camino y los intentos inválidos de la corrida"""
+    simulator, base = streamed_run(tmp_path, sampler, batch)
+    reader = TrajectoryReader(base)
+    assert (reader.grid_width, reader.grid_height, reader.step_size) == (6, 6, 2)
+    assert np.array_equal(np.asarray(reader.positions), simulator.get_path())
+    assert reader.valid_steps == simulator.particle.valid_steps
+    assert reader.invalid_steps == simulator.particle.invalid_steps
+    
+    # Cada intento inválido sale del grid desde la posición de su paso
+    steps, origin, target = reader.invalid_between(0, reader.valid_steps + 1)
+    assert np.all(np.diff(steps) >= 0)
+    assert np.array_equal(origin, simulator.get_path()[steps])
+    outside = (target[:, 0] < 0) | (target[:, 0] >= 6) | (target[:, 1] < 0) | (target[:, 1] >= 6)
+    assert outside.all()
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+def test_stream_step_and_batch_write_same_files(tmp_path, sampler):
+    """step() y run_batch() escriben los mismos archivos"""
+    (tmp_path / 'step').mkdir()
+    (tmp_path / 'batch').mkdir()
+    _, single = streamed_run(tmp_path / 'step', sampler, False)
+    _, batch = streamed_run(tmp_path / 'batch', sampler, True)
+    for suffix in ('.pos', '.inv'):
+        with open(single + suffix, 'rb') as a, open(batch + suffix, 'rb') as b:
+            assert a.read() == b.read()
+
+
+def test_set_step_size_refused_while_streaming(tmp_path):
+    """La cabecera guarda un solo tamaño de paso: no se puede cambiar con el flujo abierto"""
+    simulator = Simulator(10, 10, seed=1)
+    simulator.stream_to(str(tmp_path / 'walk'))
+    simulator.set_step_size(1)
+    with pytest.raises(ValueError):
+        simulator.set_step_size(2)
+    simulator.close_stream()
+    simulator.set_step_size(2)
+    assert simulator.step_size == 2
\ No newline at end of file
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from models.cache import ResultCache
+from models.runner import run_ensemble
+from models.sweep import expand_grid, replica_seed, run_sweep
+
+# Parámetros base de los barridos de prueba
+BASE = {'grid_width': 6, 'grid_height': 6, 'step_size': 1, 'max_steps': 300}
+
+
+def test_replica_seed_matches_spawn():
+    """replica_seed() da el mismo hijo que SeedSequence.spawn, sin crear los anteriores"""
+    master = np.random.SeedSequence(1234)
+    children = np.random.SeedSequence(1234).spawn(10)
+    for i in (0, 3, 9):
+        assert replica_seed(master, i).generate_state(4).tolist() == children[i].generate_state(4).tolist()
+
+
+@pytest.mark.parametrize('sampler', ['exact', 'rejection_free'])
+def test_single_point_sweep_matches_run_ensemble(sampler):
+    """Un barrido de un solo punto da lo mismo que run_ensemble con la misma semilla"""
+    point = dict(BASE, sampler=sampler)
+    row, = run_sweep([point], seed=7, replicas=12, workers=1)
+    stats = run_ensemble(6, 6, 12, 300, seed=7, workers=1, sampler=sampler)
+    for name, value in stats.items():
+        assert row[name] == value
+
+
+def test_sweep_points_share_replica_seeds():
+    """La réplica i usa el mismo flujo en todos los puntos: con los mismos parámetros, el mismo resultado"""
+    points = expand_grid(BASE, {'max_steps': [300, 300]})
+    first, second = run_sweep(points, seed=3, replicas=5, workers=1)
+    assert first == second
+
+
+def test_cache_hits_only_compute_missing_replicas(tmp_path):
+    """Repetir o ampliar un barrido solo simula lo que no está en la caché"""
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    points = expand_grid(BASE, {'step_size': [1, 2]})
+    rows = run_sweep(points, seed=5, replicas=6, cache=cache, workers=1)
+    assert [row['computed'] for row in rows] == [6, 6]
+    
+    again = run_sweep(points, seed=5, replicas=6, cache=cache, workers=1)
+    assert [row['cached'] for row in again] == [6, 6]
+    assert [row['computed'] for row in again] == [0, 0]
+    for row, cached in zip(rows, again):
+        assert {k: v for k, v in row.items() if k not in ('cached', 'computed')} == \
+               {k: v for k, v in cached.items() if k not in ('cached', 'computed')}
+    
+    # Más réplicas y un punto nuevo: solo se simulan las réplicas faltantes
+    points = expand_grid(BASE, {'step_size': [1, 2, 3]})
+    more = run_sweep(points, seed=5, replicas=8, cache=cache, workers=1)
+    assert [row['cached'] for row in more] == [6, 6, 0]
+    assert [row['computed'] for row in more] == [2, 2, 8]
+    uncached = run_sweep(points, seed=5, replicas=8, workers=1)
+    for row, fresh in zip(more, uncached):
+        assert row['mean_invalid_steps'] == fresh['mean_invalid_steps']
+    
+    # Otra semilla maestra no reusa nada
+    other = run_sweep(points[:1], seed=6, replicas=6, cache=cache, workers=1)
+    assert other[0]['computed'] == 6
+    cache.close()
\ No newline at end of file